@@ -0,0 +1,103 @@
+import heapq
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import F
+from django.utils import timezone
+
+from .models import EmployeeWorkload
+
+OPEN_STATUSES = ("pending", "proceed")
+
+STRATEGY_ORDERING = {
+    # Fewest open clients first; ties go to whoever waited longest
+    "least_loaded": ("open_clients", F("last_assigned_at").asc(nulls_first=True), "employee_id"),
+    # Strict rotation by last assignment time
+    "round_robin": (F("last_assigned_at").asc(nulls_first=True), "employee_id"),
+}
+
+
+def get_strategy():
+    strategy = getattr(settings, "CLIENT_ASSIGNMENT_STRATEGY", "least_loaded")
+    if strategy not in STRATEGY_ORDERING:
+        raise ValueError(f"Unknown CLIENT_ASSIGNMENT_STRATEGY: {strategy}")
+    return strategy
+
+
+def pick_employee(strategy=None):
+    """
+    Locks and returns the next employee for a direct client, or None when there are none.
+
+    Must run inside transaction.atomic() together with the client save, so the
+    row lock is held until the new client is committed. Concurrent callers skip
+    the locked row where the database supports SKIP LOCKED and get the next one;
+    when every row is locked they wait for one rather than leave the client
+    unassigned.
+    """
+    ordering = STRATEGY_ORDERING[strategy or get_strategy()]
+    features = connection.features
+    # Only the workload rows; the joined employee rows stay unlocked
+    lock_kwargs = {"of": ("self",)} if features.has_select_for_update_of else {}
+    candidates = (
+        EmployeeWorkload.objects.filter(employee__role="employee", employee__is_active=True)
+        .select_related("employee")
+        .order_by(*ordering)
+    )
+
+    workload = None
+    if features.has_select_for_update_skip_locked:
+        workload = candidates.select_for_update(skip_locked=True, **lock_kwargs).first()
+    if workload is None:
+        workload = candidates.select_for_update(**lock_kwargs).first()
+    if workload is None:
+        return None
+
+    EmployeeWorkload.objects.filter(pk=workload.pk).update(last_assigned_at=timezone.now())
+    return workload.employee
+
+
+def pick_employees(count, strategy=None):
+    """
+    Bulk version of pick_employee(): returns `count` employee ids in assignment order.
+
+    Locks every active employee's workload row, then plays the strategy forward in
+    memory, counting each pick as one more open client. Must run inside
+    transaction.atomic(); callers still record the new clients' open counts.
+    """
+    strategy = strategy or get_strategy()
+    workloads = list(
+        EmployeeWorkload.objects.select_for_update()
+        .filter(employee__role="employee", employee__is_active=True)
+        .order_by(*STRATEGY_ORDERING[strategy])
+        .values_list("employee_id", "open_clients")
+    )
+    if not workloads or count <= 0:
+        return []
+
+    if strategy == "round_robin":
+        picks = [workloads[n % len(workloads)][0] for n in range(count)]
+    else:
+        # (open clients, turn): ties go to whoever waited longest, as in the DB ordering
+        heap = [(open_clients, turn, employee_id) for turn, (employee_id, open_clients) in enumerate(workloads)]
+        heapq.heapify(heap)
+        picks = []
+        for turn in range(len(heap), len(heap) + count):
+            open_clients, _, employee_id = heapq.heappop(heap)
+            picks.append(employee_id)
+            heapq.heappush(heap, (open_clients + 1, turn, employee_id))
+
+    EmployeeWorkload.objects.filter(employee_id__in=set(picks)).update(last_assigned_at=timezone.now())
+    return picks
+
+
+def open_employee(employee_id, approval_status):
+    """Returns the employee whose open load a client counts towards, if any."""
+    return employee_id if employee_id and approval_status in OPEN_STATUSES else None
+
+
+def adjust_workload(employee_id, delta):
+    """Moves an employee's open-client counter with a single F() update."""
+    row = EmployeeWorkload.objects.filter(employee_id=employee_id)
+    if not row.update(open_clients=F("open_clients") + delta):
+        EmployeeWorkload.objects.get_or_create(employee_id=employee_id)
+        row.update(open_clients=F("open_clients") + delta)
@@ -0,0 +1,21 @@
+from django.urls import URLPattern
+
+from .async_views import (
+    AsyncClientDocumentDerivativeView, AsyncClientDocumentsView, AsyncEmployeePerformanceView,
+    AsyncManagerPerformanceView,
+)
+from .urls import urlpatterns as sync_urlpatterns
+
+# URL name -> async view replacing the sync one under ASGI (see myproject/asgi.py)
+ASYNC_VIEWS = {
+    "employee-performance": AsyncEmployeePerformanceView,
+    "manager-employee-performance": AsyncManagerPerformanceView,
+    "client-documents": AsyncClientDocumentsView,
+    "client-document-derivative": AsyncClientDocumentDerivativeView,
+}
+
+urlpatterns = [
+    URLPattern(pattern.pattern, ASYNC_VIEWS[pattern.name].as_view(), pattern.default_args, pattern.name)
+    if pattern.name in ASYNC_VIEWS else pattern
+    for pattern in sync_urlpatterns
+]
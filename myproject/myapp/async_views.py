@@ -0,0 +1,178 @@
+import asyncio
+from datetime import date
+
+from asgiref.sync import sync_to_async
+from django.http import JsonResponse
+from django.views import View
+from rest_framework import exceptions
+from rest_framework.utils.encoders import JSONEncoder
+
+from .authentication import ClaimsJWTAuthentication
+from .caching import cached_dashboard
+from .documents import DOCUMENT_FIELDS, can_view_client_documents
+from .media import serve_file
+from .models import EmployeeClientDetails, User
+from .performance import (
+    approved_counts, employee_dashboard, employee_dashboard_reads, performance_rows, recent_months,
+    targets_by_employee,
+)
+from .profiling import query_budget
+from .serializers import EmployeeClientDetailsSerializer, UserSerializer
+from .thumbnails import DERIVATIVE_SIZES, derivative_cache_control, derivative_format, ensure_derivative
+
+
+async def alist(queryset):
+    return [row async for row in queryset]
+
+
+class AsyncAPIView(View):
+    """
+    Async counterpart of a read-only DRF APIView, for endpoints served under ASGI
+    (DRF views are sync-only): ClaimsJWTAuthentication, an optional role check,
+    and DRF's JSON encoding and error bodies. Responses keep their payload on
+    `.data` like DRF responses, so @cached_dashboard works on both.
+    """
+    authentication_class = ClaimsJWTAuthentication
+    roles = None  # e.g. ("manager",); None allows any authenticated user
+    permission_message = "You do not have permission to perform this action."
+
+    async def dispatch(self, request, *args, **kwargs):
+        try:
+            await self.authenticate(request)
+            handler = getattr(self, request.method.lower(), None)
+            if request.method.lower() not in self.http_method_names or handler is None:
+                raise exceptions.MethodNotAllowed(request.method)
+            return await handler(request, *args, **kwargs)
+        except exceptions.APIException as exc:
+            return self.handle_exception(request, exc)
+
+    async def authenticate(self, request):
+        authenticator = self.authentication_class()
+        # Token validation and the cached user-state lookup are sync (cache/DB)
+        result = await sync_to_async(authenticator.authenticate)(request)
+        if result is None:
+            raise exceptions.NotAuthenticated()
+        request.user, request.auth = result
+        if self.roles and request.user.role not in self.roles:
+            raise exceptions.PermissionDenied(self.permission_message)
+
+    def handle_exception(self, request, exc):
+        data = exc.detail if isinstance(exc.detail, (list, dict)) else {"detail": exc.detail}
+        response = self.respond(data, status=exc.status_code)
+        if isinstance(exc, (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)):
+            response["WWW-Authenticate"] = self.authentication_class().authenticate_header(request)
+        return response
+
+    def respond(self, data, status=200):
+        response = JsonResponse(
+            data, status=status, safe=False, encoder=JSONEncoder,
+            json_dumps_params={"ensure_ascii": False, "separators": (",", ":")},  # As DRF's JSONRenderer
+        )
+        response.data = data
+        return response
+
+
+# ✅ Dashboards: independent reads issued together with asyncio.gather. Django
+# still runs async ORM calls on the request's DB thread, so the win is the event
+# loop serving other pollers meanwhile; the reads overlap once the backend allows.
+
+@query_budget(6)  # Five reads plus the user-state lookup on a cache miss
+@cached_dashboard(scope="user")
+class AsyncEmployeePerformanceView(AsyncAPIView):
+    """Async EmployeePerformanceView: the user, target, history, attendance and rollup reads are gathered."""
+
+    async def get(self, request, *args, **kwargs):
+        today = date.today()
+        reads = employee_dashboard_reads(request.user.id, today)
+        employee, current_target, past_targets, attendance, approved_clients = await asyncio.gather(
+            User.objects.filter(pk=request.user.pk).afirst(),  # Token users defer most fields
+            reads["current_target"].afirst(),
+            alist(reads["past_targets"]),
+            alist(reads["attendance"]),
+            reads["approved_clients"].afirst(),
+        )
+        return self.respond(employee_dashboard(
+            UserSerializer(employee).data, today,
+            current_target=current_target, past_targets=past_targets,
+            attendance=attendance, approved_clients=approved_clients,
+        ))
+
+
+@query_budget(4)
+@cached_dashboard(scope="role")
+class AsyncManagerPerformanceView(AsyncAPIView):
+    """Async ManagerPerformanceView: employees, targets and approved counts are gathered."""
+    roles = ("manager",)
+    permission_message = "Only managers can view performance data."
+
+    async def get(self, request, *args, **kwargs):
+        months = recent_months(date.today())
+        employee_id = request.GET.get("employee_id")
+        if not employee_id:
+            employees, targets, counts = await asyncio.gather(
+                alist(User.objects.filter(role="employee").only("id", "username")),
+                sync_to_async(targets_by_employee)(months),
+                sync_to_async(approved_counts)(months),
+            )
+            return self.respond([
+                {
+                    "employee_id": employee.id,
+                    "employee": employee.username,
+                    "performance": performance_rows(targets.get(employee.id, []), counts),
+                }
+                for employee in employees
+            ])
+
+        if not employee_id.isdigit():
+            raise exceptions.NotFound("Employee not found.")
+        employee_id = int(employee_id)
+        employee, targets, counts = await asyncio.gather(
+            User.objects.filter(id=employee_id, role="employee").only("id", "username").afirst(),
+            sync_to_async(targets_by_employee)(months, employee_ids=[employee_id]),
+            sync_to_async(approved_counts)(months, employee_ids=[employee_id]),
+        )
+        if employee is None:
+            raise exceptions.NotFound("Employee not found.")
+        return self.respond({
+            "employee_id": employee.id,
+            "employee": employee.username,
+            "performance": performance_rows(targets.get(employee.id, []), counts),
+        })
+
+
+# ✅ Documents
+
+@query_budget(2)
+class AsyncClientDocumentsView(AsyncAPIView):
+    """Async GetClientDocumentsView."""
+
+    async def get(self, request, client_id):
+        details = await EmployeeClientDetails.objects.filter(client_id=client_id).afirst()
+        if details is None:
+            return self.respond({"error": "No documents found"}, status=404)
+        return self.respond(EmployeeClientDetailsSerializer(details).data)
+
+
+@query_budget(2)
+class AsyncClientDocumentDerivativeView(AsyncAPIView):
+    """Async ClientDocumentDerivativeView: resizing and file IO run in worker threads, off the event loop."""
+
+    async def get(self, request, client_id, field_name, size):
+        if field_name not in DOCUMENT_FIELDS or size not in DERIVATIVE_SIZES:
+            raise exceptions.NotFound("Unknown document or size.")
+
+        details = await EmployeeClientDetails.objects.select_related("client").filter(client_id=client_id).afirst()
+        if details is None:
+            raise exceptions.NotFound("No documents found")
+        if not can_view_client_documents(request.user, details.client):
+            raise exceptions.PermissionDenied("You cannot view this client's documents.")
+
+        document = getattr(details, field_name)
+        if not document:
+            raise exceptions.NotFound("Document not uploaded.")
+
+        name = await sync_to_async(ensure_derivative, thread_sensitive=False)(document, size)
+        _, _, content_type = derivative_format()
+        return await sync_to_async(serve_file, thread_sensitive=False)(
+            request, name, content_type=content_type, cache_control=derivative_cache_control(request, document.name),
+        )
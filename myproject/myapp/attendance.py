@@ -0,0 +1,88 @@
+import re
+from datetime import datetime, time
+
+from django.conf import settings
+from django.db.models import FilteredRelation, Q
+
+from .models import Attendance, User
+
+
+def cutoff_time():
+    """Time of day after which attendance counts as Absent (ATTENDANCE_CUTOFF, "HH:MM")."""
+    return time.fromisoformat(getattr(settings, "ATTENDANCE_CUTOFF", "11:00"))
+
+
+def is_past_cutoff(moment=None):
+    return (moment or datetime.now()).time() > cutoff_time()
+
+
+def close_day(day):
+    """
+    Materializes an Absent record for every active employee without one on `day`,
+    with a single bulk INSERT. Records created concurrently (a late post, a second
+    run) are skipped by the (user, date) unique constraint. Returns the number of
+    employees that were missing.
+    """
+    missing = (
+        User.objects.filter(role="employee", is_active=True)
+        .exclude(attendance__date=day)
+        .values_list("pk", flat=True)
+    )
+    absences = [Attendance(user_id=user_id, date=day, status="Absent") for user_id in missing]
+    Attendance.objects.bulk_create(absences, ignore_conflicts=True)
+    return len(absences)
+
+
+DAY_CODES = {"Present": "P", "Absent": "A"}
+NO_RECORD = "-"
+
+
+def day_string(records, date_from, date_to):
+    """Encodes (date, status) records as one character per day of the range: P, A or -."""
+    days = [NO_RECORD] * ((date_to - date_from).days + 1)
+    for day, status in records:
+        days[(day - date_from).days] = DAY_CODES.get(status, NO_RECORD)
+    return "".join(days)
+
+
+def longest_run(days, code):
+    """Length of the longest run of `code` in a day string."""
+    return max((len(run) for run in re.findall(f"{code}+", days)), default=0)
+
+
+def attendance_summary(date_from, date_to, employee_ids=None):
+    """
+    Per-employee attendance over [date_from, date_to] in one query: employees
+    LEFT JOINed to their records in the range, in (user, date) index order.
+    Each employee's day string is built from the rows; the Present/Absent counts
+    are its P/A counts, as the (user, date) constraint allows one record per day.
+    """
+    employees = User.objects.filter(role="employee")
+    if employee_ids is not None:
+        employees = employees.filter(pk__in=employee_ids)
+    rows = employees.annotate(
+        record=FilteredRelation("attendance", condition=Q(attendance__date__gte=date_from, attendance__date__lte=date_to)),
+    ).order_by("pk", "record__date").values_list("pk", "username", "record__date", "record__status")
+
+    by_employee = {}
+    for user_id, username, day, status in rows:
+        records = by_employee.setdefault((user_id, username), [])
+        if day is not None:
+            records.append((day, status))
+
+    summary = []
+    for (user_id, username), records in by_employee.items():
+        days = day_string(records, date_from, date_to)
+        trailing = len(days) - len(days.rstrip("P"))
+        summary.append({
+            "employee_id": user_id,
+            "employee": username,
+            "present": days.count("P"),
+            "absent": days.count("A"),
+            "no_record": days.count(NO_RECORD),
+            "days": days,
+            "current_present_streak": trailing,
+            "longest_present_streak": longest_run(days, "P"),
+            "longest_absent_streak": longest_run(days, "A"),
+        })
+    return summary
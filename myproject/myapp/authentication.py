@@ -0,0 +1,77 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from .models import User
+
+# Claims embedded at login and used to rebuild request.user without a query
+USER_CLAIMS = ("username", "email", "role", "is_active")
+PASSWORD_CLAIM = "pwd"
+
+
+def add_user_claims(token, user):
+    """Embeds the claims ClaimsJWTAuthentication needs. Access tokens inherit them from the refresh token."""
+    for claim in USER_CLAIMS:
+        token[claim] = getattr(user, claim)
+    token[PASSWORD_CLAIM] = get_md5_hash_password(user.password)
+    return token
+
+
+def _state_key(user_id):
+    return f"auth:user-state:{user_id}"
+
+
+def get_user_state(user_id):
+    """
+    Returns (is_active, role, password_hash) for a user, cached for AUTH_USER_STATE_TTL
+    seconds so deactivation, role changes and password resets still revoke tokens.
+    """
+    key = _state_key(user_id)
+    state = cache.get(key)
+    if state is None:
+        row = User.objects.filter(pk=user_id).values_list("is_active", "role", "password").first()
+        state = (row[0], row[1], get_md5_hash_password(row[2])) if row else False
+        cache.set(key, state, getattr(settings, "AUTH_USER_STATE_TTL", 60))
+    return state or None
+
+
+def forget_user_state(user_id):
+    cache.delete(_state_key(user_id))
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication that builds request.user from the token claims instead of
+    loading the User row. Fields not carried in the token (phone_number, dob, ...)
+    are deferred and load on first access. Tokens issued before the claims were
+    added fall back to the regular database lookup.
+    """
+
+    def get_user(self, validated_token):
+        if any(claim not in validated_token for claim in USER_CLAIMS + (PASSWORD_CLAIM,)):
+            return super().get_user(validated_token)
+
+        try:
+            user_id = User._meta.pk.to_python(validated_token[api_settings.USER_ID_CLAIM])
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        state = get_user_state(user_id)
+        if state is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+
+        is_active, role, password_hash = state
+        if not is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        if role != validated_token["role"] or password_hash != validated_token[PASSWORD_CLAIM]:
+            raise AuthenticationFailed(_("The user's token has been revoked."), code="token_revoked")
+
+        claims = {api_settings.USER_ID_FIELD: user_id, **{claim: validated_token[claim] for claim in USER_CLAIMS}}
+        # from_db() expects loaded values in model field order; everything else is deferred
+        field_names = [field.attname for field in User._meta.concrete_fields if field.attname in claims]
+        return User.from_db(DEFAULT_DB_ALIAS, field_names, [claims[name] for name in field_names])
@@ -0,0 +1,101 @@
+import functools
+import hashlib
+from datetime import date
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponseNotModified
+from django.utils.http import parse_etags
+from rest_framework.response import Response
+
+VERSION_KEY = "dashboard:version"
+
+
+def dashboard_cache():
+    return caches[getattr(settings, "DASHBOARD_CACHE_ALIAS", "default")]
+
+
+def dashboard_version():
+    cache = dashboard_cache()
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        cache.add(VERSION_KEY, 1, None)
+        version = cache.get(VERSION_KEY, 1)
+    return version
+
+
+def bump_dashboard_version(**kwargs):
+    """Signal receiver: invalidates every cached dashboard at once by moving to a new key version."""
+    cache = dashboard_cache()
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:  # Not set yet (or evicted)
+        cache.add(VERSION_KEY, 1, None)
+        cache.incr(VERSION_KEY)
+
+
+def dashboard_key(view_class, request, scope):
+    """Returns the versioned cache key and ETag of a dashboard request."""
+    owner = request.user.pk if scope == "user" else request.user.role
+    raw_key = ":".join([
+        view_class.__name__, str(owner), request.user.role, date.today().isoformat(),
+        request.get_full_path(),
+    ])
+    key = f"dashboard:{dashboard_version()}:{hashlib.md5(raw_key.encode()).hexdigest()}"
+    return key, f'"{hashlib.md5(key.encode()).hexdigest()}"'
+
+
+def cached_dashboard(scope="user"):
+    """
+    Class decorator caching a view's successful GET responses under versioned keys.
+
+    `scope="user"` caches per user, `scope="role"` shares one entry between users
+    of the same role. Keys also include the query string and today's date (the
+    dashboards are month-relative). Responses carry an ETag derived from the key,
+    so a client holding the current version gets a 304 without any DB or cache read.
+    Async views (async_views.py) get an async wrapper rendering through `view.respond()`.
+    """
+    def decorator(view_class):
+        get = view_class.get
+        def finish(response, etag):
+            response["ETag"] = etag
+            response["Cache-Control"] = "private, no-cache"
+            return response
+
+        @functools.wraps(get)
+        def cached_get(self, request, *args, **kwargs):
+            key, etag = dashboard_key(view_class, request, scope)
+            if etag in parse_etags(request.headers.get("If-None-Match", "")):
+                return finish(HttpResponseNotModified(), etag)
+
+            cache = dashboard_cache()
+            data = cache.get(key)
+            if data is not None:
+                return finish(Response(data), etag)
+            response = get(self, request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+            cache.set(key, response.data, getattr(settings, "DASHBOARD_CACHE_TIMEOUT", 300))
+            return finish(response, etag)
+
+        @functools.wraps(get)
+        async def cached_aget(self, request, *args, **kwargs):
+            key, etag = await sync_to_async(dashboard_key)(view_class, request, scope)
+            if etag in parse_etags(request.headers.get("If-None-Match", "")):
+                return finish(HttpResponseNotModified(), etag)
+
+            cache = dashboard_cache()
+            data = await cache.aget(key)
+            if data is not None:
+                return finish(self.respond(data), etag)
+            response = await get(self, request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+            await cache.aset(key, response.data, getattr(settings, "DASHBOARD_CACHE_TIMEOUT", 300))
+            return finish(response, etag)
+
+        view_class.get = cached_aget if iscoroutinefunction(get) else cached_get
+        return view_class
+    return decorator
@@ -0,0 +1,81 @@
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.checks import Warning, register
+
+from .db_backends import POOLED_ENGINES
+
+RESPONSE_MIDDLEWARE = ("django.middleware.common.CommonMiddleware", "django.middleware.csrf.CsrfViewMiddleware")
+COMPRESSION_MIDDLEWARE = ("django.middleware.gzip.GZipMiddleware", "myapp.compression.CompressionMiddleware")
+
+
+def _in_memory(database):
+    name = str(database.get("NAME", ""))
+    return name == ":memory:" or "mode=memory" in name
+
+
+def database_warnings(databases):
+    warnings = []
+    for alias, database in databases.items():
+        if (database.get("CONN_MAX_AGE", 0) == 0 and database["ENGINE"] not in POOLED_ENGINES.values()
+                and not _in_memory(database)):
+            warnings.append(Warning(
+                f"Database '{alias}' opens a new connection for every request.",
+                hint="Set DB_CONN_MAX_AGE above 0, or DB_POOL=1 for the pooled backend.", id="myapp.W002",
+            ))
+    return warnings
+
+
+@register("performance")
+def check_performance_settings(app_configs, **kwargs):
+    """Warns at startup (runserver, migrate, check) about settings that slow every request down."""
+    warnings = []
+    if settings.DEBUG:
+        warnings.append(Warning(
+            "DEBUG is on: every SQL query is kept in connection.queries for the whole request.",
+            hint="Run with DJANGO_ENV=prod outside local development.", id="myapp.W001",
+        ))
+
+    warnings.extend(database_warnings(settings.DATABASES))
+
+    for template in settings.TEMPLATES:
+        loaders = template.get("OPTIONS", {}).get("loaders")
+        if template["BACKEND"] == "django.template.backends.django.DjangoTemplates" and loaders and not any(
+            (loader[0] if isinstance(loader, (list, tuple)) else loader) == "django.template.loaders.cached.Loader"
+            for loader in loaders
+        ):
+            warnings.append(Warning(
+                "Template loaders are configured without django.template.loaders.cached.Loader, "
+                "so templates are recompiled on every render.", id="myapp.W003",
+            ))
+
+    for alias in ("default", settings.DASHBOARD_CACHE_ALIAS):
+        if isinstance(caches[alias], DummyCache):
+            warnings.append(Warning(
+                f"Cache '{alias}' is a DummyCache: auth state and dashboards are rebuilt on every request.",
+                id="myapp.W004",
+            ))
+
+    middleware = list(settings.MIDDLEWARE)
+    cors = "corsheaders.middleware.CorsMiddleware"
+    if cors in middleware and any(
+        name in middleware and middleware.index(name) < middleware.index(cors) for name in RESPONSE_MIDDLEWARE
+    ):
+        warnings.append(Warning(
+            "CorsMiddleware comes after middleware that can answer requests itself, so preflight "
+            "requests do extra work and those responses lack CORS headers.",
+            hint="Place it directly below SecurityMiddleware.", id="myapp.W005",
+        ))
+
+    if not settings.DEBUG and settings.MEDIA_ACCEL is None:
+        warnings.append(Warning(
+            "Protected media is streamed through Python workers.",
+            hint="Set MEDIA_ACCEL to 'nginx' or 'apache' so the proxy sends the files.", id="myapp.W006",
+        ))
+    if not settings.DEBUG and not any(name in middleware for name in COMPRESSION_MIDDLEWARE):
+        warnings.append(Warning(
+            "Responses are sent uncompressed.",
+            hint="Use the prod profile (CompressionMiddleware), or silence this if the proxy compresses.",
+            id="myapp.W007",
+        ))
+    return warnings
@@ -0,0 +1,17 @@
+from django.middleware.gzip import GZipMiddleware
+
+COMPRESSIBLE_TYPES = ("text/", "application/json", "application/javascript", "application/xml", "image/svg+xml")
+
+
+class CompressionMiddleware(GZipMiddleware):
+    """
+    GZipMiddleware for text-like responses only (JSON, CSV exports, HTML).
+    Document images and XLSX exports are compressed formats already, so
+    gzipping them would only cost CPU.
+    """
+
+    def process_response(self, request, response):
+        content_type = response.get("Content-Type", "").split(";")[0].strip().lower()
+        if not content_type.startswith(COMPRESSIBLE_TYPES):
+            return response
+        return super().process_response(request, response)
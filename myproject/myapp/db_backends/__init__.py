@@ -0,0 +1,11 @@
+"""
+Database backends that keep connections in a process-wide pool
+(myapp.db_backends.pool) instead of opening one per request or pinning one to
+each thread. Django only ships pooling for PostgreSQL; these wrap the stock
+MySQL and SQLite backends. Enable with DB_POOL=1 (see settings.DATABASES).
+"""
+
+POOLED_ENGINES = {
+    "django.db.backends.mysql": "myapp.db_backends.mysql",
+    "django.db.backends.sqlite3": "myapp.db_backends.sqlite3",
+}
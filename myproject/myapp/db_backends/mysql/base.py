@@ -0,0 +1,11 @@
+from django.db.backends.mysql import base
+
+from ..pool import PooledDatabaseWrapperMixin
+
+
+class DatabaseWrapper(PooledDatabaseWrapperMixin, base.DatabaseWrapper):
+    """django.db.backends.mysql with pooled connections."""
+
+    def validate_pooled(self, connection):
+        connection.ping()  # Raises once the server has dropped the connection
+        return True
@@ -0,0 +1,184 @@
+import threading
+from collections import Counter
+from time import monotonic
+
+from django.db import DatabaseError
+
+POOL_DEFAULTS = {
+    "MAX_SIZE": 10,  # Open connections per process and database
+    "TIMEOUT": 10,  # Seconds to wait for a free connection once MAX_SIZE are out
+    "RECYCLE": 3600,  # Reopen connections older than this (MySQL's wait_timeout is 8h); None keeps them
+}
+
+
+class PoolTimeout(DatabaseError):
+    pass
+
+
+class ConnectionPool:
+    """
+    Thread-safe LIFO pool of raw DB-API connections. `connect()` opens a new
+    one; `validate(connection)`, if given, is called before handing out an idle
+    connection and a False result (or an exception) replaces it.
+    """
+
+    def __init__(self, connect, max_size=10, timeout=10, recycle=None, validate=None):
+        self.connect = connect
+        self.max_size = max_size
+        self.timeout = timeout
+        self.recycle = recycle
+        self.validate = validate
+        self.idle = []  # Most recently returned last, so hot connections are reused first
+        self.opened_at = {}  # id(connection) -> monotonic()
+        self.size = 0  # Idle plus checked out
+        self.available = threading.Condition()
+        self.stats = Counter()
+
+    def acquire(self):
+        deadline = monotonic() + self.timeout
+        while True:
+            with self.available:
+                if self.idle:
+                    connection = self.idle.pop()
+                elif self.size < self.max_size:
+                    self.size += 1
+                    connection = None
+                else:
+                    remaining = deadline - monotonic()
+                    if remaining <= 0:
+                        self.stats["timeouts"] += 1
+                        raise PoolTimeout(
+                            f"No database connection became free within {self.timeout}s "
+                            f"(pool of {self.max_size})."
+                        )
+                    self.available.wait(remaining)
+                    continue
+
+            if connection is None:
+                return self._open()
+            if self._expired(connection) or not self._healthy(connection):
+                self.discard(connection)
+                continue
+            with self.available:
+                self.stats["reused"] += 1
+            return connection
+
+    def release(self, connection):
+        """Returns a checked-out connection, rolled back so no transaction leaks to the next borrower."""
+        try:
+            connection.rollback()
+        except Exception:
+            self.discard(connection)
+            return
+        with self.available:
+            self.idle.append(connection)
+            self.available.notify()
+
+    def discard(self, connection):
+        """Closes a checked-out (or just popped) connection and frees its slot."""
+        try:
+            connection.close()
+        except Exception:
+            pass
+        with self.available:
+            self.opened_at.pop(id(connection), None)
+            self.size -= 1
+            self.stats["discarded"] += 1
+            self.available.notify()
+
+    def close_idle(self):
+        with self.available:
+            idle, self.idle = self.idle, []
+        for connection in idle:
+            self.discard(connection)
+
+    def _open(self):
+        try:
+            connection = self.connect()
+        except Exception:
+            with self.available:
+                self.size -= 1
+                self.available.notify()
+            raise
+        with self.available:
+            self.opened_at[id(connection)] = monotonic()
+            self.stats["opened"] += 1
+        return connection
+
+    def _expired(self, connection):
+        return self.recycle is not None and monotonic() - self.opened_at.get(id(connection), 0) > self.recycle
+
+    def _healthy(self, connection):
+        if self.validate is None:
+            return True
+        try:
+            return bool(self.validate(connection))
+        except Exception:
+            return False
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(key, connect, **options):
+    """The process-wide pool for `key`, created with `connect` and `options` on first use."""
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = _pools[key] = ConnectionPool(connect, **options)
+        return pool
+
+
+def close_pools():
+    """Closes every idle pooled connection, e.g. between benchmark runs or tests."""
+    with _pools_lock:
+        pools = list(_pools.values())
+    for pool in pools:
+        pool.close_idle()
+
+
+def pool_stats():
+    """Opened/reused/discarded/timeouts counts summed over every pool in the process."""
+    with _pools_lock:
+        pools = list(_pools.values())
+    return sum((pool.stats for pool in pools), Counter())
+
+
+class PooledDatabaseWrapperMixin:
+    """
+    Mixed into a Django DatabaseWrapper: connect() borrows from the pool and
+    close() gives the connection back. With CONN_MAX_AGE=0 that happens at the
+    end of every request, so a few connections serve any number of threads.
+    The pool is sized by the POOL entry of the DATABASES alias (POOL_DEFAULTS).
+    CONN_HEALTH_CHECKS makes the pool ping idle connections before reuse.
+    """
+
+    def get_pool(self):
+        options = {**POOL_DEFAULTS, **(self.settings_dict.get("POOL") or {})}
+        return get_pool(
+            (self.alias, self.vendor, self.settings_dict["NAME"], self.settings_dict.get("HOST")),
+            lambda: super(PooledDatabaseWrapperMixin, self).get_new_connection(self.get_connection_params()),
+            max_size=options["MAX_SIZE"],
+            timeout=options["TIMEOUT"],
+            recycle=options["RECYCLE"],
+            validate=self.validate_pooled if self.settings_dict["CONN_HEALTH_CHECKS"] else None,
+        )
+
+    def pooling_enabled(self):
+        return True
+
+    def get_new_connection(self, conn_params):
+        if not self.pooling_enabled():
+            return super().get_new_connection(conn_params)
+        return self.get_pool().acquire()
+
+    def _close(self):
+        if self.connection is not None and self.pooling_enabled():
+            with self.wrap_database_errors:
+                self.get_pool().release(self.connection)
+        else:
+            super()._close()
+
+    def validate_pooled(self, connection):
+        return True
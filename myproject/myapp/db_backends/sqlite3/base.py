@@ -0,0 +1,18 @@
+from django.db.backends.sqlite3 import base
+
+from ..pool import PooledDatabaseWrapperMixin
+
+
+class DatabaseWrapper(PooledDatabaseWrapperMixin, base.DatabaseWrapper):
+    """
+    django.db.backends.sqlite3 with pooled connections, for dev servers on a
+    database file. In-memory databases live and die with their one connection,
+    so they are never pooled.
+    """
+
+    def pooling_enabled(self):
+        return not self.is_in_memory_db()
+
+    def validate_pooled(self, connection):
+        connection.execute("SELECT 1")
+        return True
@@ -0,0 +1,112 @@
+import logging
+import os
+import shutil
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import connections, transaction
+from PIL import Image, ImageOps
+
+from .models import EmployeeClientDetails
+
+logger = logging.getLogger(__name__)
+
+DOCUMENT_FIELDS = ("aadhaar_front", "aadhaar_back", "cibil_report", "pan_card", "gas_bill")
+
+_executor = None
+
+
+def can_view_client_documents(user, client):
+    """Managers see every client's documents; employees only those of their assigned clients."""
+    return user.role == "manager" or client.assigned_employee_id == user.pk
+
+
+def get_executor():
+    """Process-wide worker pool, created on first use."""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=getattr(settings, "DOCUMENT_WORKERS", 2), thread_name_prefix="documents"
+        )
+    return _executor
+
+
+def staging_root():
+    return getattr(settings, "DOCUMENT_STAGING_ROOT", os.path.join(settings.MEDIA_ROOT, "staging"))
+
+
+def stage_uploads(client_id, files):
+    """
+    Streams uploaded files chunk by chunk into a private staging folder.
+    Returns the staging folder and a list of (field_name, staged_path, original_name).
+    """
+    batch_dir = os.path.join(staging_root(), f"client_{client_id}", uuid.uuid4().hex)
+    os.makedirs(batch_dir, exist_ok=True)
+
+    staged = []
+    for field_name, upload in files.items():
+        path = os.path.join(batch_dir, field_name)
+        with open(path, "wb") as destination:
+            for chunk in upload.chunks():
+                destination.write(chunk)
+        staged.append((field_name, path, os.path.basename(upload.name)))
+    return batch_dir, staged
+
+
+def finalize_image(path):
+    """Validates an image, applies its EXIF rotation, strips metadata and recompresses it as JPEG."""
+    with Image.open(path) as image:
+        image.verify()  # Rejects truncated or non-image files
+
+    max_dimension = getattr(settings, "DOCUMENT_MAX_DIMENSION", 2000)
+    with Image.open(path) as image:
+        image = ImageOps.exif_transpose(image)
+        if image.mode not in ("RGB", "L"):
+            image = image.convert("RGB")
+        image.thumbnail((max_dimension, max_dimension))
+
+        output = BytesIO()
+        # Saving without exif= drops the original metadata (GPS, device, ...)
+        image.save(output, "JPEG", quality=getattr(settings, "DOCUMENT_JPEG_QUALITY", 85), optimize=True)
+    return ContentFile(output.getvalue())
+
+
+def process_uploads(details_id, batch_dir, staged):
+    """Moves staged files into documents/client_<id>/ and records the outcome on the details row."""
+    details = EmployeeClientDetails.objects.select_related("client").get(pk=details_id)
+    EmployeeClientDetails.objects.filter(pk=details_id).update(processing_status="processing")
+    try:
+        for field_name, path, original_name in staged:
+            name = f"{os.path.splitext(original_name)[0]}.jpg"
+            getattr(details, field_name).save(name, finalize_image(path), save=False)
+        details.processing_status = "ready"
+        details.processing_error = ""
+        details.save(update_fields=[field for field, _, _ in staged] + ["processing_status", "processing_error", "updated_at"])
+    except Exception as exc:
+        logger.exception("Document processing failed for EmployeeClientDetails %s", details_id)
+        EmployeeClientDetails.objects.filter(pk=details_id).update(
+            processing_status="failed", processing_error=str(exc)[:500]
+        )
+    finally:
+        shutil.rmtree(batch_dir, ignore_errors=True)
+
+
+def _run_in_worker(details_id, batch_dir, staged):
+    try:
+        process_uploads(details_id, batch_dir, staged)
+    finally:
+        connections.close_all()  # Worker threads must not leak DB connections
+
+
+def enqueue_uploads(details_id, batch_dir, staged):
+    """
+    Hands staged files to the background pool once the request's transaction commits.
+    With DOCUMENT_PIPELINE_EAGER (tests) they are processed inline instead.
+    """
+    if getattr(settings, "DOCUMENT_PIPELINE_EAGER", False):
+        process_uploads(details_id, batch_dir, staged)
+        return
+    transaction.on_commit(lambda: get_executor().submit(_run_in_worker, details_id, batch_dir, staged))
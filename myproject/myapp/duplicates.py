@@ -0,0 +1,94 @@
+import re
+from collections import defaultdict
+
+from .models import PhoneIndex
+
+CLIENT_PHONE_FIELDS = ("contact_number", "alternative_number", "reference_number_1", "reference_number_2")
+DETAILS_PHONE_FIELDS = ("reference_number_1", "reference_number_2")
+DETAILS_PREFIX = "details_"
+MIN_DIGITS = 7  # Shorter values ("0", "NA") would match half the table
+NATIONAL_DIGITS = 10
+NON_DIGITS = re.compile(r"\D")
+
+
+def normalize_phone(value):
+    """
+    Digits only, without a country or trunk prefix: "+91 98765-43210",
+    "098765 43210" and "9876543210" all become "9876543210". None for junk.
+    """
+    digits = NON_DIGITS.sub("", value or "")
+    if len(digits) > NATIONAL_DIGITS:
+        digits = digits[-NATIONAL_DIGITS:]
+    return digits if len(digits) >= MIN_DIGITS else None
+
+
+def _entries(client_id, obj, fields, prefix=""):
+    for field in fields:
+        number = normalize_phone(getattr(obj, field))
+        if number:
+            yield PhoneIndex(client_id=client_id, source=prefix + field, number=number)
+
+
+def _replace(client_ids, sources, rows, new):
+    if not new:
+        PhoneIndex.objects.filter(client_id__in=client_ids, source__in=sources).delete()
+    PhoneIndex.objects.bulk_create(rows, batch_size=1000)
+
+
+def index_client_phones(clients, new=False):
+    """
+    (Re)indexes the numbers on saved clients; bulk_create paths call this,
+    signals do the rest. `new=True` skips clearing rows that cannot exist yet.
+    """
+    clients = [client for client in clients if client.pk is not None]
+    if clients:
+        _replace(
+            [client.pk for client in clients], CLIENT_PHONE_FIELDS,
+            [row for client in clients for row in _entries(client.pk, client, CLIENT_PHONE_FIELDS)], new,
+        )
+
+
+def index_details_phones(details, new=False):
+    """Same for EmployeeClientDetails reference numbers, indexed under their client."""
+    details = list(details)
+    if details:
+        _replace(
+            [item.client_id for item in details], [DETAILS_PREFIX + field for field in DETAILS_PHONE_FIELDS],
+            [row for item in details for row in _entries(item.client_id, item, DETAILS_PHONE_FIELDS, DETAILS_PREFIX)], new,
+        )
+
+
+def unindex_details_phones(client_ids):
+    """Drops the EmployeeClientDetails numbers indexed under these clients (details deleted)."""
+    PhoneIndex.objects.filter(
+        client_id__in=client_ids, source__in=[DETAILS_PREFIX + field for field in DETAILS_PHONE_FIELDS],
+    ).delete()
+
+
+def find_duplicates(data, exclude_client=None):
+    """
+    Clients sharing any phone number with the submitted `data` (a dict with the
+    Client phone fields), in one query on the number index. Returns
+    [{"client": id, "matches": [{"field": submitted field, "existing_field": source}]}],
+    clients with the most matches first.
+    """
+    submitted = defaultdict(list)
+    for field in CLIENT_PHONE_FIELDS:
+        number = normalize_phone(data.get(field))
+        if number:
+            submitted[number].append(field)
+    if not submitted:
+        return []
+
+    rows = PhoneIndex.objects.filter(number__in=submitted)
+    if exclude_client is not None:
+        rows = rows.exclude(client_id=exclude_client)
+
+    matches = defaultdict(list)
+    for client_id, source, number in rows.values_list("client_id", "source", "number"):
+        for field in submitted[number]:
+            matches[client_id].append({"field": field, "existing_field": source})
+    return [
+        {"client": client_id, "matches": found}
+        for client_id, found in sorted(matches.items(), key=lambda item: (-len(item[1]), item[0]))
+    ]
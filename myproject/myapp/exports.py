@@ -0,0 +1,246 @@
+import csv
+import re
+import zipfile
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from xml.sax.saxutils import escape
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import Attendance, Client, MonthlyTarget
+from .performance import completion
+
+CONTENT_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+# XML 1.0 forbids most control characters; spreadsheet apps refuse files containing them
+INVALID_XML_CHARS = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+
+def chunk_size():
+    return getattr(settings, "EXPORT_CHUNK_SIZE", 2000)
+
+
+def iterate_rows(queryset, size=None):
+    """
+    Yields the rows of a values_list() queryset whose first column is the pk,
+    one keyset-paginated query (`pk > last ORDER BY pk LIMIT n`) per chunk.
+    Unlike QuerySet.iterator(), this keeps memory constant on MySQL too, where
+    the driver buffers a whole result set client-side.
+    """
+    size = size or chunk_size()
+    queryset = queryset.order_by("pk")
+    last_pk = None
+    while True:
+        page = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+        rows = list(page[:size])
+        yield from rows
+        if len(rows) < size:
+            return
+        last_pk = rows[-1][0]
+
+
+# ✅ Datasets: each returns (header, rows) for the given filters
+
+def client_rows(employee=None, status=None, date_from=None, date_to=None):
+    queryset = Client.objects.all()
+    if employee:
+        queryset = queryset.filter(assigned_employee_id=employee)
+    if status:
+        queryset = queryset.filter(approval_status=status)
+    tz = timezone.get_current_timezone()
+    if date_from:
+        queryset = queryset.filter(created_at__gte=datetime.combine(date_from, datetime.min.time(), tz))
+    if date_to:
+        queryset = queryset.filter(created_at__lt=datetime.combine(date_to + timedelta(days=1), datetime.min.time(), tz))
+
+    header = ["id", "name", "contact_number", "gmail", "client_type", "approval_status",
+              "assigned_employee_id", "assigned_employee", "expected_loan_amount", "created_at"]
+    rows = queryset.values_list(
+        "id", "name", "contact_number", "gmail", "client_type", "approval_status",
+        "assigned_employee_id", "assigned_employee__username", "expected_loan_amount", "created_at",
+    )
+    return header, iterate_rows(rows)
+
+
+def target_rows(employee=None, status=None, date_from=None, date_to=None):
+    """Monthly targets with their approved counts; the date range selects whole months."""
+    queryset = MonthlyTarget.objects.all()
+    if employee:
+        queryset = queryset.filter(user_id=employee)
+    if date_from:
+        queryset = queryset.filter(Q(year__gt=date_from.year) | Q(year=date_from.year, month__gte=date_from.month))
+    if date_to:
+        queryset = queryset.filter(Q(year__lt=date_to.year) | Q(year=date_to.year, month__lte=date_to.month))
+
+    header = ["id", "employee_id", "employee", "year", "month", "target_clients", "approved_clients", "completion"]
+    rows = queryset.values_list(
+        "id", "user_id", "user__username", "year", "month", "target_clients", "approved_clients"
+    )
+    return header, (row + (completion(row[6], row[5]),) for row in iterate_rows(rows))
+
+
+def attendance_rows(employee=None, status=None, date_from=None, date_to=None):
+    queryset = Attendance.objects.all()
+    if employee:
+        queryset = queryset.filter(user_id=employee)
+    if status:
+        queryset = queryset.filter(status=status)
+    if date_from:
+        queryset = queryset.filter(date__gte=date_from)
+    if date_to:
+        queryset = queryset.filter(date__lte=date_to)
+
+    header = ["id", "employee_id", "employee", "date", "status"]
+    return header, iterate_rows(queryset.values_list("id", "user_id", "user__username", "date", "status"))
+
+
+DATASETS = {
+    "clients": client_rows,
+    "targets": target_rows,
+    "attendance": attendance_rows,
+}
+
+
+def cell_text(value):
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        return timezone.localtime(value).strftime("%Y-%m-%d %H:%M:%S")
+    if isinstance(value, date):
+        return value.isoformat()
+    return str(value)
+
+
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def csv_cell(value):
+    """
+    cell_text() for CSV. Text starting like a formula (names and offices come from
+    the public apply form) is prefixed with ' so spreadsheets show it instead of running it.
+    """
+    text = cell_text(value)
+    if isinstance(value, str) and text.startswith(FORMULA_PREFIXES):
+        return "'" + text
+    return text
+
+
+# ✅ Writers: generators yielding encoded chunks
+
+class _Echo:
+    """File-like object whose write() returns what it was given (for csv.writer)."""
+
+    def write(self, value):
+        return value
+
+
+def stream_csv(header, rows):
+    writer = csv.writer(_Echo())
+    yield "\ufeff".encode()  # BOM so Excel detects UTF-8
+    yield writer.writerow(header).encode()
+    buffer = []
+    for row in rows:
+        buffer.append(writer.writerow([csv_cell(value) for value in row]))
+        if len(buffer) >= 500:
+            yield "".join(buffer).encode()
+            buffer = []
+    if buffer:
+        yield "".join(buffer).encode()
+
+
+class _StreamBuffer:
+    """Unseekable sink for zipfile; written bytes are drained by stream_xlsx."""
+
+    def __init__(self):
+        self.chunks = []
+        self.position = 0
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.position
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b"".join(self.chunks)
+        self.chunks = []
+        return data
+
+
+XLSX_PARTS = {
+    "[Content_Types].xml": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/worksheets/sheet1.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        '</Types>'
+    ),
+    "_rels/.rels": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="xl/workbook.xml"/>'
+        '</Relationships>'
+    ),
+    "xl/_rels/workbook.xml.rels": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" Target="worksheets/sheet1.xml"/>'
+        '</Relationships>'
+    ),
+}
+
+
+def _xlsx_cell(value):
+    if isinstance(value, (int, float, Decimal)) and not isinstance(value, bool):
+        return f"<c><v>{value}</v></c>"
+    text = INVALID_XML_CHARS.sub("", cell_text(value))
+    return f'<c t="inlineStr"><is><t xml:space="preserve">{escape(text)}</t></is></c>'
+
+
+def stream_xlsx(header, rows, sheet_name="Export"):
+    """
+    Writes a single-sheet workbook with inline strings, so rows can be emitted as
+    they are read: the zip is written to an unseekable buffer (entries use data
+    descriptors) and drained after every few hundred rows.
+    """
+    sink = _StreamBuffer()
+    with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for name, content in XLSX_PARTS.items():
+            archive.writestr(name, content)
+        archive.writestr("xl/workbook.xml", (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+            'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+            f'<sheets><sheet name="{escape(sheet_name)}" sheetId="1" r:id="rId1"/></sheets></workbook>'
+        ))
+        yield sink.drain()
+
+        with archive.open("xl/worksheets/sheet1.xml", "w", force_zip64=True) as sheet:
+            sheet.write(
+                b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                b'<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+            )
+            sheet.write(("<row>" + "".join(_xlsx_cell(value) for value in header) + "</row>").encode())
+            for number, row in enumerate(rows, start=1):
+                sheet.write(("<row>" + "".join(_xlsx_cell(value) for value in row) + "</row>").encode())
+                if number % 500 == 0:
+                    yield sink.drain()
+            sheet.write(b"</sheetData></worksheet>")
+    yield sink.drain()
+
+
+WRITERS = {
+    "csv": stream_csv,
+    "xlsx": stream_xlsx,
+}
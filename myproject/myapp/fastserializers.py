@@ -0,0 +1,117 @@
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+from rest_framework.relations import PrimaryKeyRelatedField
+from rest_framework.response import Response
+
+# Fields whose to_representation() returns a value from .values() unchanged
+PASSTHROUGH_FIELDS = (serializers.CharField, serializers.IntegerField, serializers.BooleanField)
+
+
+class FastPathUnsupported(Exception):
+    """The serializer uses a field the values() fast path cannot reproduce exactly."""
+
+
+def _converter(field):
+    if isinstance(field, PrimaryKeyRelatedField) and field.pk_field is None:
+        return None  # values() already yields the foreign key id
+    if isinstance(field, PASSTHROUGH_FIELDS):
+        return None
+    if isinstance(field, serializers.ChoiceField) and all(isinstance(key, str) for key in field.choices):
+        return None
+    if isinstance(field, serializers.JSONField) and not field.binary:
+        return None  # values() already decodes the JSON
+    if isinstance(field, (serializers.DateTimeField, serializers.DateField, serializers.TimeField,
+                          serializers.DecimalField, serializers.FloatField, serializers.UUIDField)):
+        return field.to_representation  # Bound once per request, e.g. ISO 8601 'Z' datetimes, quantized decimals
+    raise FastPathUnsupported(f"{type(field).__name__} '{field.field_name}'")
+
+
+def _model_field(model, name):
+    try:
+        return model._meta.get_field(name)
+    except FieldDoesNotExist:
+        raise FastPathUnsupported(f"'{name}' is not a field of {model.__name__}")
+
+
+class ValuesSerializer:
+    """
+    Read-only counterpart of a (possibly field-projected) ModelSerializer instance.
+
+    The serializer's fields are compiled once into a list of values() lookups and
+    per-field converters; rows from `queryset.values(*lookups)` are then turned
+    into dicts with the same keys, order and representations DRF would produce,
+    without model instances or per-row field objects. Raises FastPathUnsupported
+    for method fields, many-relations, non-column sources and custom fields.
+    """
+
+    def __init__(self, serializer):
+        if isinstance(serializer, serializers.ListSerializer):
+            serializer = serializer.child
+        self.lookups = []
+        self.plan = self._compile(serializer, "")
+
+    def _compile(self, serializer, prefix):
+        model = serializer.Meta.model
+        plan = []
+        for field in serializer.fields.values():
+            if field.write_only:
+                continue
+            if field.source == "*" or "." in field.source:
+                raise FastPathUnsupported(f"source '{field.source}' of '{field.field_name}'")
+            model_field = _model_field(model, field.source)
+            lookup = prefix + field.source
+
+            if isinstance(field, serializers.BaseSerializer):
+                if isinstance(field, serializers.ListSerializer) or not model_field.is_relation or model_field.many_to_many:
+                    raise FastPathUnsupported(f"nested many '{field.field_name}'")
+                self.lookups.append(lookup)  # The FK id, None when the relation is empty
+                plan.append((field.field_name, lookup, self._compile(field, lookup + "__")))
+            else:
+                if model_field.many_to_many or model_field.one_to_many:
+                    raise FastPathUnsupported(f"many-relation '{field.field_name}'")
+                self.lookups.append(lookup)
+                plan.append((field.field_name, lookup, _converter(field)))
+        return plan
+
+    def _build(self, plan, row):
+        data = {}
+        for name, lookup, convert in plan:
+            value = row[lookup]
+            if value is None:
+                data[name] = None
+            elif isinstance(convert, list):
+                data[name] = self._build(convert, row)
+            else:
+                data[name] = convert(value) if convert else value
+        return data
+
+    def to_representation(self, rows):
+        return [self._build(self.plan, row) for row in rows]
+
+
+class FastListMixin:
+    """
+    Generic list view mixin: GET pages are read with `.values()` and rendered by
+    a ValuesSerializer compiled from the view's serializer, falling back to the
+    regular DRF path for serializers it cannot reproduce byte for byte.
+    """
+
+    def list(self, request, *args, **kwargs):
+        serializer = self.get_serializer()
+        try:
+            fast = ValuesSerializer(serializer)
+        except FastPathUnsupported:
+            return super().list(request, *args, **kwargs)
+
+        lookups = list(fast.lookups)
+        ordering = getattr(self.paginator, "ordering", None) or ()
+        for field in (ordering,) if isinstance(ordering, str) else ordering:
+            field = field.lstrip("-")
+            if field not in lookups:
+                lookups.append(field)  # Cursor pagination reads its position from the row
+
+        queryset = self.filter_queryset(self.get_queryset()).values(*lookups)
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(fast.to_representation(page))
+        return Response(fast.to_representation(queryset))
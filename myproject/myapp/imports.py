@@ -0,0 +1,218 @@
+import codecs
+import csv
+import io
+import json
+from collections import Counter
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from rest_framework import serializers
+
+from .assignment import adjust_workload, open_employee, pick_employees
+from .caching import bump_dashboard_version
+from .duplicates import index_client_phones
+from .models import Client, User
+from .performance import adjust_rollup, rollup_bucket
+from .search import index_clients
+
+FILE_TYPES = ("csv", "jsonl")
+UNIQUE_FIELDS = ("contact_number", "gmail")
+
+
+class ClientImportSerializer(serializers.ModelSerializer):
+    """
+    Validates one imported row without touching the database: uniqueness and
+    assigned employees are checked per batch by import_clients().
+    """
+    assigned_employee = serializers.IntegerField(required=False, allow_null=True)
+
+    class Meta:
+        model = Client
+        exclude = ["id", "created_at"]
+        extra_kwargs = {
+            "contact_number": {"validators": []},
+            "gmail": {"validators": []},
+        }
+
+
+def batch_size():
+    return getattr(settings, "CLIENT_IMPORT_BATCH_SIZE", 500)
+
+
+def detect_file_type(filename):
+    extension = filename.rsplit(".", 1)[-1].lower() if "." in filename else ""
+    return extension if extension in FILE_TYPES else None
+
+
+def check_encoding(stream, chunk_size=64 * 1024):
+    """
+    Reads a binary stream through once and rewinds it. Returns None when it is
+    UTF-8 text, otherwise (line number, errors) for the first undecodable line,
+    e.g. a spreadsheet exported as cp1252; nothing should be imported from it.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")()  # A BOM is valid UTF-8 too
+    line = 1
+    try:
+        for chunk in iter(lambda: stream.read(chunk_size), b""):
+            pending = decoder.getstate()[0]  # Bytes of a character split across chunks
+            try:
+                line += decoder.decode(chunk).count("\n")
+            except UnicodeDecodeError as exc:
+                line += (pending + chunk)[:exc.start].count(b"\n")
+                return line, {"file": [f"The file is not UTF-8 text (line {line}). Save it as CSV UTF-8 and retry."]}
+        decoder.decode(b"", final=True)
+    except UnicodeDecodeError:
+        return line, {"file": ["The file ends in the middle of a UTF-8 character."]}
+    finally:
+        stream.seek(0)
+    return None
+
+
+def read_rows(stream, file_type):
+    """
+    Yields (row number, dict or None, parse error) from a binary CSV or JSONL
+    stream, one line at a time. CSV row numbers count the header as row 1.
+    """
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    if file_type == "csv":
+        for number, row in enumerate(csv.DictReader(text), start=2):
+            # Empty cells mean "not provided", so optional fields fall back to their defaults
+            yield number, {key: value for key, value in row.items() if key and value not in ("", None)}, None
+        return
+
+    for number, line in enumerate(text, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as exc:
+            yield number, None, f"Invalid JSON: {exc}"
+            continue
+        if isinstance(row, dict):
+            yield number, row, None
+        else:
+            yield number, None, "Each line must be a JSON object."
+
+
+class ImportReport:
+    def __init__(self):
+        self.created = 0
+        self.errors = []
+
+    def add_error(self, row, errors):
+        self.errors.append({"row": row, "errors": errors})
+
+    def as_dict(self):
+        return {"created": self.created, "failed": len(self.errors), "errors": self.errors}
+
+
+def import_clients(rows, assign=True, dry_run=False, size=None):
+    """
+    Imports clients from (row number, data, parse error) tuples, as produced by read_rows().
+
+    Rows are validated and written per batch: one IN query finds existing
+    contact numbers/emails, one checks referenced employees, bulk_create inserts
+    the valid rows and direct clients without an employee are auto-assigned
+    together. Invalid rows are reported and skipped; they never fail the batch.
+    """
+    report = ImportReport()
+    seen = {field: set() for field in UNIQUE_FIELDS}  # Duplicates within the file
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == (size or batch_size()):
+            _import_batch(batch, report, seen, assign, dry_run)
+            batch = []
+    if batch:
+        _import_batch(batch, report, seen, assign, dry_run)
+
+    if report.created and not dry_run:
+        bump_dashboard_version()  # bulk_create skips the model signals
+    return report
+
+
+def _import_batch(batch, report, seen, assign, dry_run):
+    valid = []
+    for number, data, parse_error in batch:
+        if parse_error:
+            report.add_error(number, {"non_field_errors": [parse_error]})
+            continue
+        serializer = ClientImportSerializer(data=data)
+        if serializer.is_valid():
+            valid.append((number, serializer.validated_data))
+        else:
+            report.add_error(number, serializer.errors)
+    if not valid:
+        return
+
+    # One query for unique keys already in the database
+    condition = Q()
+    for field in UNIQUE_FIELDS:
+        condition |= Q(**{f"{field}__in": [data[field] for _, data in valid]})
+    taken = {field: set() for field in UNIQUE_FIELDS}
+    for existing in Client.objects.filter(condition).values(*UNIQUE_FIELDS):
+        for field in UNIQUE_FIELDS:
+            taken[field].add(existing[field])
+
+    requested = {data["assigned_employee"] for _, data in valid if data.get("assigned_employee")}
+    employees = set(
+        User.objects.filter(pk__in=requested, role="employee").values_list("pk", flat=True)
+    ) if requested else set()
+
+    accepted = []
+    for number, data in valid:
+        errors = {}
+        for field in UNIQUE_FIELDS:
+            if data[field] in taken[field]:
+                errors[field] = [f"A client with this {field} already exists."]
+            elif data[field] in seen[field]:
+                errors[field] = [f"Duplicate {field} earlier in the file."]
+        if data.get("assigned_employee") and data["assigned_employee"] not in employees:
+            errors["assigned_employee"] = ["Only employees can be assigned to clients."]
+        if errors:
+            report.add_error(number, errors)
+            continue
+        for field in UNIQUE_FIELDS:
+            seen[field].add(data[field])
+        accepted.append((number, data))
+
+    if dry_run:
+        report.created += len(accepted)
+        return
+
+    try:
+        with transaction.atomic():
+            clients = [
+                Client(**{key: value for key, value in data.items() if key != "assigned_employee"},
+                       assigned_employee_id=data.get("assigned_employee"))
+                for _, data in accepted
+            ]
+            unassigned = [client for client in clients if client.assigned_employee_id is None and client.client_type == "direct"]
+            if assign and unassigned:
+                for client, employee_id in zip(unassigned, pick_employees(len(unassigned))):
+                    client.assigned_employee_id = employee_id
+
+            Client.objects.bulk_create(clients)
+            record_counters(clients)
+            index_clients(clients)  # Also reads back pks bulk_create left unset
+            index_client_phones(clients, new=True)
+    except IntegrityError as exc:
+        # Lost a race with a concurrent insert of the same key; nothing in this batch was written
+        for number, _ in accepted:
+            report.add_error(number, {"non_field_errors": [f"Batch rejected by the database: {exc}"]})
+        return
+    report.created += len(clients)
+
+
+def record_counters(clients):
+    """Applies what the Client post_save signal would have done for bulk-created clients."""
+    workloads = Counter(open_employee(c.assigned_employee_id, c.approval_status) for c in clients)
+    workloads.pop(None, None)
+    for employee_id, delta in workloads.items():
+        adjust_workload(employee_id, delta)
+
+    buckets = Counter(rollup_bucket(c.assigned_employee_id, c.approval_status, c.created_at) for c in clients)
+    buckets.pop(None, None)
+    for bucket, delta in buckets.items():
+        adjust_rollup(bucket, delta)
@@ -0,0 +1,185 @@
+import asyncio
+import contextlib
+import io
+import json
+import logging
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from itertools import cycle
+from time import perf_counter
+
+from django.conf import settings
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.test import override_settings
+from django.test.client import RequestFactory
+from django.test.utils import setup_test_environment, teardown_test_environment
+from django.urls import reverse
+
+from myapp.models import EmployeeClientDetails, User
+from myapp.views import get_tokens_for_user
+from myproject.asgi import AsyncViewsASGIHandler
+
+from .bench_endpoints import percentile
+
+# (name, role, url name, url args): what the dashboards poll
+POLLS = [
+    ("employee performance", "employee", "employee-performance", ()),
+    ("manager performance", "manager", "manager-employee-performance", ()),
+    ("client documents", "employee", "client-documents", ("client",)),
+]
+
+
+def dashboard_requests():
+    """(path, authorization header) pairs: each employee's dashboard polls and a manager poll for each."""
+    employees = list(User.objects.filter(role="employee", clients__extra_details__isnull=False).distinct()[:50])
+    manager = User.objects.filter(role="manager").first()
+    if not employees or manager is None:
+        raise CommandError("Needs employees with documented clients and a manager; run generate_data first.")
+    tokens = {user.pk: f"Bearer {get_tokens_for_user(user)['access']}" for user in employees + [manager]}
+    documented = dict(
+        EmployeeClientDetails.objects.filter(client__assigned_employee__in=employees)
+        .values_list("client__assigned_employee_id", "client_id")
+    )
+    requests = []
+    for employee in employees:
+        values = {"client": documented[employee.pk]}
+        for name, role, url_name, url_args in POLLS:
+            user = manager if role == "manager" else employee
+            requests.append((reverse(url_name, args=[values[arg] for arg in url_args]), tokens[user.pk]))
+    return requests
+
+
+class Command(BaseCommand):
+    help = (
+        "Load-tests the dashboard endpoints in-process through the WSGI handler (sync views, "
+        "one thread per concurrent client) and the ASGI handler (async views, one event loop), "
+        "and compares throughput and latency. Reads existing data: run generate_data first."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--concurrency", type=int, default=32, help="Simultaneous polling clients.")
+        parser.add_argument("--requests", type=int, default=2000, help="Requests per server mode.")
+        parser.add_argument("--uncached", action="store_true", help="Bypass the dashboard cache so every poll hits the DB.")
+        parser.add_argument("--output", default=None, help="Also write the results as JSON.")
+
+    def handle(self, *args, **options):
+        self.requests = dashboard_requests()
+
+        try:
+            setup_test_environment()  # Allows the 'testserver' host
+            owns_environment = True
+        except RuntimeError:  # Already set up, e.g. under the test runner
+            owns_environment = False
+        profiling_logger = logging.getLogger("myapp.profiling")
+        level, profiling_logger.level = profiling_logger.level, logging.ERROR
+        caches = settings.CACHES
+        if options["uncached"]:
+            caches = {**caches, "dashboard": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}}
+        try:
+            with override_settings(CACHES=caches), contextlib.redirect_stdout(io.StringIO()):
+                results = {
+                    "wsgi": self.run_wsgi(options["concurrency"], options["requests"]),
+                    "asgi": asyncio.run(self.run_asgi(options["concurrency"], options["requests"])),
+                }
+        finally:
+            profiling_logger.setLevel(level)
+            if owns_environment:
+                teardown_test_environment()
+
+        for mode, result in results.items():
+            self.stdout.write(
+                f"{mode}: {result['requests_per_second']:8.1f} req/s  p50 {result['p50_ms']:7.2f} ms  "
+                f"p95 {result['p95_ms']:7.2f} ms  errors {result['errors']}  statuses {result['status_codes']}"
+            )
+        ratio = results["asgi"]["requests_per_second"] / results["wsgi"]["requests_per_second"]
+        self.stdout.write(self.style.SUCCESS(f"ASGI/WSGI throughput: {ratio:.2f}x"))
+        if options["output"]:
+            with open(options["output"], "w") as output:
+                json.dump({"options": {key: options[key] for key in ("concurrency", "requests", "uncached")},
+                           "results": results}, output, indent=2)
+
+    def summarize(self, timings, statuses, elapsed):
+        return {
+            "requests": len(timings),
+            "requests_per_second": round(len(timings) / elapsed, 1),
+            "p50_ms": round(percentile(timings, 0.50), 3),
+            "p95_ms": round(percentile(timings, 0.95), 3),
+            "errors": sum(status != 200 for status in statuses),
+            "status_codes": dict(Counter(statuses)),
+        }
+
+    # WSGI: a threaded server, one worker thread per concurrent client
+
+    def run_wsgi(self, concurrency, total):
+        handler = WSGIHandler()
+        factory = RequestFactory()
+        polls = cycle(self.requests)
+        jobs = [next(polls) for _ in range(total)]
+
+        def call(job):
+            path, authorization = job
+            environ = factory.get(path, HTTP_AUTHORIZATION=authorization).environ
+            status = []
+            started = perf_counter()
+            response = handler(environ, lambda code, headers, exc_info=None: status.append(int(code[:3])))
+            b"".join(response)
+            response.close()  # Fires request_finished, like a real server
+            return (perf_counter() - started) * 1000, status[0]
+
+        def worker(chunk):
+            try:
+                return [call(job) for job in chunk]
+            finally:
+                connections.close_all()  # Per-thread connections
+
+        started = perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            results = [row for rows in pool.map(worker, [jobs[n::concurrency] for n in range(concurrency)]) for row in rows]
+        elapsed = perf_counter() - started
+        return self.summarize([row[0] for row in results], [row[1] for row in results], elapsed)
+
+    # ASGI: one event loop, `concurrency` client coroutines
+
+    async def run_asgi(self, concurrency, total):
+        handler = AsyncViewsASGIHandler()
+        polls = cycle(self.requests)
+        jobs = [next(polls) for _ in range(total)]
+        timings, statuses = [], []
+
+        async def call(path, authorization):
+            scope = {
+                "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+                "scheme": "http", "path": path, "raw_path": path.encode(), "query_string": b"", "root_path": "",
+                "headers": [(b"host", b"testserver"), (b"authorization", authorization.encode())],
+                "client": ("127.0.0.1", 50000), "server": ("testserver", 80),
+            }
+            received = False
+
+            async def receive():
+                nonlocal received
+                if received:
+                    await asyncio.Event().wait()  # Never disconnects
+                received = True
+                return {"type": "http.request", "body": b"", "more_body": False}
+
+            status = []
+
+            async def send(message):
+                if message["type"] == "http.response.start":
+                    status.append(message["status"])
+
+            started = perf_counter()
+            await handler(scope, receive, send)
+            timings.append((perf_counter() - started) * 1000)
+            statuses.append(status[0])
+
+        async def client(chunk):
+            for job in chunk:
+                await call(*job)
+
+        started = perf_counter()
+        await asyncio.gather(*(client(jobs[n::concurrency]) for n in range(concurrency)))
+        elapsed = perf_counter() - started
+        return self.summarize(timings, statuses, elapsed)
@@ -0,0 +1,118 @@
+import contextlib
+import io
+import json
+import logging
+import threading
+
+from django.conf import settings
+from django.core.management.base import CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.backends.signals import connection_created
+from django.test import override_settings
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from myapp.db_backends import POOLED_ENGINES
+from myapp.db_backends.pool import close_pools, pool_stats
+
+from . import bench_asgi
+
+# name -> DATABASES overrides; "pooled" swaps in the myapp.db_backends engine
+MODES = {
+    "per-request": {"CONN_MAX_AGE": 0, "CONN_HEALTH_CHECKS": False},
+    "persistent": {"CONN_MAX_AGE": 600, "CONN_HEALTH_CHECKS": True},
+    "pooled": {"CONN_MAX_AGE": 0, "CONN_HEALTH_CHECKS": True, "pooled": True},
+}
+
+
+@contextlib.contextmanager
+def database_mode(alias, pooled=False, **overrides):
+    """Temporarily reconfigures `alias`; threads started inside get wrappers built from the new settings."""
+    settings_dict = connections.settings[alias]
+    saved = dict(settings_dict)
+    base_engines = {pooled_engine: engine for engine, pooled_engine in POOLED_ENGINES.items()}
+    engine = base_engines.get(settings_dict["ENGINE"], settings_dict["ENGINE"])
+    if pooled and engine not in POOLED_ENGINES:
+        raise CommandError(f"No pooled backend for {engine}.")
+
+    def reset():
+        connections[alias].close()
+        with contextlib.suppress(AttributeError):
+            del connections[alias]  # This thread's wrapper, so the next access loads the engine again
+        close_pools()
+
+    reset()
+    settings_dict.update(overrides, ENGINE=POOLED_ENGINES[engine] if pooled else engine)
+    try:
+        yield
+    finally:
+        reset()
+        settings_dict.clear()
+        settings_dict.update(saved)
+
+
+class Command(bench_asgi.Command):
+    help = (
+        "Compares per-request latency of the dashboard endpoints (WSGI, uncached) when every "
+        "request opens its own database connection, with persistent connections "
+        "(CONN_MAX_AGE + CONN_HEALTH_CHECKS) and with the pooled backends. Reads existing "
+        "data: run generate_data first, on a file database rather than :memory:."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--concurrency", type=int, default=4, help="Simultaneous clients (server threads).")
+        parser.add_argument("--requests", type=int, default=1000, help="Requests per mode.")
+        parser.add_argument("--mode", action="append", choices=list(MODES), default=[], help="Run only these modes.")
+        parser.add_argument("--output", default=None, help="Also write the results as JSON.")
+
+    def handle(self, *args, **options):
+        self.requests = bench_asgi.dashboard_requests()
+        modes = options["mode"] or list(MODES)
+
+        opened = []
+        lock = threading.Lock()
+
+        def count_connection(sender, connection, **kwargs):
+            with lock:
+                opened.append(connection.alias)
+
+        try:
+            setup_test_environment()  # Allows the 'testserver' host
+            owns_environment = True
+        except RuntimeError:  # Already set up, e.g. under the test runner
+            owns_environment = False
+        profiling_logger = logging.getLogger("myapp.profiling")
+        level, profiling_logger.level = profiling_logger.level, logging.ERROR
+        caches = {**settings.CACHES, "dashboard": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}}
+        results = {}
+        connection_created.connect(count_connection)
+        try:
+            with override_settings(CACHES=caches), contextlib.redirect_stdout(io.StringIO()):
+                for mode in modes:
+                    with database_mode(DEFAULT_DB_ALIAS, **MODES[mode]):
+                        opened.clear()
+                        before = pool_stats()
+                        results[mode] = self.run_wsgi(options["concurrency"], options["requests"])
+                        # Borrowing from a pool also sends connection_created; count real connects
+                        pooled = pool_stats() - before
+                        results[mode]["connections_opened"] = pooled["opened"] if pooled else len(opened)
+        finally:
+            connection_created.disconnect(count_connection)
+            profiling_logger.setLevel(level)
+            if owns_environment:
+                teardown_test_environment()
+
+        for mode, result in results.items():
+            self.stdout.write(
+                f"{mode:>11}: p50 {result['p50_ms']:7.2f} ms  p95 {result['p95_ms']:7.2f} ms  "
+                f"{result['requests_per_second']:8.1f} req/s  connections opened {result['connections_opened']}  "
+                f"errors {result['errors']}"
+            )
+        if "per-request" in results:
+            baseline = results["per-request"]["p50_ms"]
+            for mode in [mode for mode in results if mode != "per-request"]:
+                gain = baseline - results[mode]["p50_ms"]
+                self.stdout.write(self.style.SUCCESS(f"{mode}: {gain:+.2f} ms per request at p50 vs per-request"))
+        if options["output"]:
+            with open(options["output"], "w") as output:
+                json.dump({"options": {key: options[key] for key in ("concurrency", "requests")},
+                           "vendor": connections[DEFAULT_DB_ALIAS].vendor, "results": results}, output, indent=2)
@@ -0,0 +1,190 @@
+import contextlib
+import io
+import json
+import logging
+import platform
+import subprocess
+import tracemalloc
+from datetime import datetime
+from itertools import count
+from time import perf_counter
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test import Client as HttpClient
+from django.test import override_settings
+from django.test.utils import setup_test_environment, teardown_test_environment
+from django.urls import reverse
+
+from myapp.models import EmployeeClientDetails, User
+from myapp.profiling import RequestProfile
+from myapp.synthetic import generate
+from myapp.views import get_tokens_for_user
+
+# (name, role, method, url name, url args, query params)
+SCENARIOS = [
+    ("clients", "manager", "get", "client-list-create", (), {}),
+    ("clients?fields=summary", "manager", "get", "client-list-create", (), {"fields": "summary"}),
+    ("clients?expand=assigned_employee", "manager", "get", "client-list-create", (), {"expand": "assigned_employee"}),
+    ("clients (employee)", "employee", "get", "client-list-create", (), {}),
+    ("client retrieve", "manager", "get", "client-retrieve", ("client",), {}),
+    ("client documents", "employee", "get", "client-documents", ("client",), {}),
+    ("client apply", None, "post", "client-apply", (), {}),
+    ("attendance", "manager", "get", "attendance-list", (), {}),
+    ("attendance summary", "manager", "get", "attendance-summary", (), {}),
+    ("targets", "manager", "get", "set-target", (), {}),
+    ("employee performance", "employee", "get", "employee-performance", (), {}),
+    ("manager performance", "manager", "get", "manager-employee-performance", (), {}),
+    ("employees", "manager", "get", "manage-employees", (), {}),
+    ("employee clients", "manager", "get", "employee-clients", ("employee",), {}),
+    ("export clients.csv", "manager", "get", "export", ("clients", "csv"), {}),
+]
+
+
+def percentile(samples, fraction):
+    """Nearest-rank percentile of a list of numbers."""
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, max(0, round(fraction * len(ordered)) - 1))]
+
+
+class Command(BaseCommand):
+    help = (
+        "Runs every myapp endpoint through the Django test client against synthetic data "
+        "and writes p50/p95 latency, query counts and allocations as JSON. The data is "
+        "generated inside a transaction that is rolled back, so use a scratch (SQLite) database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--employees", type=int, default=20)
+        parser.add_argument("--clients", type=int, default=2000)
+        parser.add_argument("--months", type=int, default=6)
+        parser.add_argument("--iterations", type=int, default=30, help="Timed requests per endpoint.")
+        parser.add_argument("--output", default="bench-results.json", help="Where to write the JSON results.")
+        parser.add_argument("--only", action="append", default=[], help="Run only scenarios whose name contains this.")
+
+    def handle(self, *args, **options):
+        try:
+            setup_test_environment()  # Allows the 'testserver' host
+            owns_environment = True
+        except RuntimeError:  # Already set up, e.g. under the test runner
+            owns_environment = False
+        profiling_logger = logging.getLogger("myapp.profiling")
+        level, profiling_logger.level = profiling_logger.level, logging.ERROR  # One log line per request otherwise
+        # Synthetic rows are rolled back; keep their cached auth state and dashboards
+        # (and generate()'s version bump) out of the caches live requests share
+        scratch_caches = {
+            alias: {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": f"bench-endpoints-{alias}"}
+            for alias in settings.CACHES
+        }
+        try:
+            with override_settings(CACHES=scratch_caches), transaction.atomic():
+                dataset = generate(employees=options["employees"], clients=options["clients"], months=options["months"])
+                results = self.run_scenarios(options)
+                transaction.set_rollback(True)
+        finally:
+            profiling_logger.setLevel(level)
+            if owns_environment:
+                teardown_test_environment()
+
+        report = {
+            "meta": self.metadata(),
+            "dataset": dataset,
+            "iterations": options["iterations"],
+            "results": results,
+        }
+        with open(options["output"], "w") as output:
+            json.dump(report, output, indent=2)
+
+        for name, result in results.items():
+            self.stdout.write(
+                f"{name:36} {result['status']:>3}  p50 {result['p50_ms']:8.2f} ms  p95 {result['p95_ms']:8.2f} ms  "
+                f"{result['queries']:3} queries  {result['alloc_peak_kb']:9.1f} KiB peak"
+            )
+        self.stdout.write(self.style.SUCCESS(f"Wrote {options['output']}."))
+
+    def run_scenarios(self, options):
+        manager = User.objects.filter(role="manager", username__startswith="synthetic_").latest("pk")
+        details = EmployeeClientDetails.objects.filter(client__assigned_employee__isnull=False).select_related("client").latest("pk")
+        employee = User.objects.get(pk=details.client.assigned_employee_id)
+        values = {"client": details.client_id, "employee": employee.pk}
+        tokens = {role: get_tokens_for_user(user)["access"] for role, user in (("manager", manager), ("employee", employee))}
+        applications = count()
+
+        results = {}
+        for name, role, method, url_name, url_args, params in SCENARIOS:
+            if options["only"] and not any(part in name for part in options["only"]):
+                continue
+            url = reverse(url_name, args=[values.get(arg, arg) for arg in url_args])
+            headers = {"HTTP_AUTHORIZATION": f"Bearer {tokens[role]}"} if role else {}
+
+            def request():
+                http = HttpClient()
+                if method == "post":
+                    response = http.post(url, self.application(next(applications)), **headers)
+                else:
+                    response = http.get(url, params, **headers)
+                if response.streaming:
+                    b"".join(response.streaming_content)
+                return response
+
+            results[name] = self.measure(request, options["iterations"])
+        return results
+
+    def measure(self, request, iterations):
+        with contextlib.redirect_stdout(io.StringIO()):  # Some views print request data
+            response = request()  # Warm-up: URL resolution, caches, lazy imports
+
+            timings = []
+            for _ in range(iterations):
+                started = perf_counter()
+                request()
+                timings.append((perf_counter() - started) * 1000)
+
+            # Counted with a wrapper: request_started resets connection.queries
+            queries = RequestProfile()
+            with connection.execute_wrapper(queries):
+                request()
+
+            # Allocations in a separate run; tracemalloc would distort the timings
+            tracemalloc.start()
+            request()
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+        return {
+            "status": response.status_code,
+            "p50_ms": round(percentile(timings, 0.50), 3),
+            "p95_ms": round(percentile(timings, 0.95), 3),
+            "mean_ms": round(sum(timings) / len(timings), 3),
+            "queries": queries.queries,
+            "alloc_peak_kb": round(peak / 1024, 1),
+        }
+
+    def application(self, n):
+        stamp = f"{datetime.now():%H%M%S}{n:05d}"
+        return {
+            "name": f"Bench applicant {n}", "contact_number": f"4{stamp}"[:15], "gmail": f"bench.{stamp}@example.com",
+            "father_name": "Father", "mother_name": "Mother", "qualifications": "B.Com", "married_status": "false",
+            "current_address": "Address", "landmark": "Landmark", "years_at_address": 2, "office_name": "Office",
+            "office_address": "Office address", "designation": "Clerk", "department": "Accounts",
+            "current_experience": 1, "overall_experience": 3, "reference_name_1": "Ref one",
+            "reference_number_1": "7000000000", "reference_name_2": "Ref two", "reference_number_2": "6000000000",
+            "expected_loan_amount": "50000.00", "loan_purpose": "Purpose",
+        }
+
+    def metadata(self):
+        try:
+            commit = subprocess.run(
+                ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, cwd=settings.BASE_DIR, check=True
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            commit = None
+        return {
+            "commit": commit,
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "database": connection.vendor,
+        }
@@ -0,0 +1,86 @@
+from datetime import date, timedelta
+from time import perf_counter
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+
+from myapp.fastserializers import ValuesSerializer
+from myapp.models import Attendance, Client, User
+from myapp.serializers import AttendanceSerializer, ClientSerializer
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares DRF serializers with the values() fast path on generated rows, "
+        "checks both render identical JSON, and rolls the rows back afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=2000, help="Rows per dataset.")
+        parser.add_argument("--repeat", type=int, default=5, help="Runs per path; the best time is reported.")
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            self.generate(options["rows"])
+            cases = [
+                ("clients", Client.objects.order_by("-created_at", "-id"), ClientSerializer),
+                ("clients?expand=assigned_employee",
+                 Client.objects.select_related("assigned_employee").order_by("-created_at", "-id"),
+                 lambda *args, **kwargs: ClientSerializer(*args, expand=["assigned_employee"], **kwargs)),
+                ("attendance", Attendance.objects.select_related("user").order_by("-date", "-id"), AttendanceSerializer),
+            ]
+            for name, queryset, make_serializer in cases:
+                self.compare(name, queryset, make_serializer, options["repeat"])
+            transaction.set_rollback(True)
+
+    def generate(self, rows):
+        employees = User.objects.bulk_create([
+            User(username=f"bench{n}", email=f"bench{n}@example.com", phone_number=f"99{n:08d}",
+                 dob=date(1990, 1, 1), role="employee")
+            for n in range(rows // 30 + 1)
+        ])
+        Client.objects.bulk_create([
+            Client(
+                name=f"Bench client {n}", contact_number=f"98{n:08d}", gmail=f"bench.client{n}@example.com",
+                father_name="Father", mother_name="Mother", qualifications="B.Com", current_address="Address",
+                landmark="Landmark", years_at_address=2, office_name="Office", office_address="Office address",
+                designation="Clerk", current_experience=1, overall_experience=3, reference_name_1="Ref one",
+                reference_number_1="7000000000", reference_name_2="Ref two", reference_number_2="6000000000",
+                expected_loan_amount="50000.00", loan_purpose="Purpose", assigned_employee=employees[n % len(employees)],
+            )
+            for n in range(rows)
+        ], batch_size=500)
+        today = date.today()
+        Attendance.objects.bulk_create([
+            Attendance(user=employees[n // 30], date=today - timedelta(days=n % 30), status="Present" if n % 7 else "Absent")
+            for n in range(rows)
+        ], batch_size=500)
+
+    def compare(self, name, queryset, make_serializer, repeat):
+        renderer = JSONRenderer()
+
+        def drf():
+            return renderer.render(make_serializer(list(queryset), many=True).data)
+
+        def fast():
+            values = ValuesSerializer(make_serializer())
+            return renderer.render(values.to_representation(queryset.values(*values.lookups)))
+
+        drf_time, drf_output = self.best_of(drf, repeat)
+        fast_time, fast_output = self.best_of(fast, repeat)
+        verdict = "identical output" if drf_output == fast_output else "OUTPUT DIFFERS"
+        style = self.style.SUCCESS if drf_output == fast_output else self.style.ERROR
+        self.stdout.write(style(
+            f"{name}: drf {drf_time * 1000:.1f} ms, fast {fast_time * 1000:.1f} ms, "
+            f"{drf_time / fast_time:.1f}x faster, {verdict} ({len(drf_output)} bytes)"
+        ))
+
+    def best_of(self, run, repeat):
+        best, output = None, None
+        for _ in range(max(repeat, 1)):
+            started = perf_counter()
+            output = run()
+            elapsed = perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        return best, output
@@ -0,0 +1,29 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from myapp.attendance import close_day, cutoff_time, is_past_cutoff
+from myapp.caching import bump_dashboard_version
+
+
+class Command(BaseCommand):
+    help = (
+        "Marks every active employee without an attendance record as Absent for the day. "
+        "Run from cron after the cutoff, e.g. `5 11 * * * manage.py close_attendance`."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--date", type=date.fromisoformat, default=None, help="Day to close (YYYY-MM-DD); defaults to today.")
+        parser.add_argument("--force", action="store_true", help="Close today even before the cutoff.")
+
+    def handle(self, *args, **options):
+        day = options["date"] or date.today()
+        if day > date.today():
+            raise CommandError("Cannot close a day in the future.")
+        if day == date.today() and not options["force"] and not is_past_cutoff():
+            raise CommandError(f"Today is still open until {cutoff_time():%H:%M}; use --force to close it now.")
+
+        created = close_day(day)
+        if created:
+            bump_dashboard_version()  # bulk_create skips the model signals
+        self.stdout.write(self.style.SUCCESS(f"Marked {created} employee(s) absent on {day.isoformat()}."))
@@ -0,0 +1,74 @@
+import os
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from myapp.models import DocumentReference
+
+BATCH_SIZE = 500
+
+
+class Command(BaseCommand):
+    help = "Deletes stored documents (content-addressed blobs and legacy uploads) that no client references."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--grace-hours", type=float, default=24,
+            help="Keep unreferenced files younger than this, so in-flight uploads are not collected.",
+        )
+        parser.add_argument("--dry-run", action="store_true", help="Only report what would be deleted.")
+
+    def handle(self, *args, **options):
+        root = os.path.join(settings.MEDIA_ROOT, "documents")
+        cutoff = time.time() - options["grace_hours"] * 3600
+        deleted = freed = 0
+
+        batch = []
+        for candidate in self.old_files(root, cutoff):
+            batch.append(candidate)
+            if len(batch) == BATCH_SIZE:
+                count, size = self.collect(batch, options["dry_run"], cutoff)
+                deleted, freed, batch = deleted + count, freed + size, []
+        if batch:
+            count, size = self.collect(batch, options["dry_run"], cutoff)
+            deleted, freed = deleted + count, freed + size
+
+        verb = "Would delete" if options["dry_run"] else "Deleted"
+        self.stdout.write(self.style.SUCCESS(f"{verb} {deleted} unreferenced file(s), {freed} bytes."))
+
+    def old_files(self, root, cutoff):
+        """Yields (storage name, path, size) for files last modified before `cutoff`."""
+        for directory, _, files in os.walk(root):
+            for filename in files:
+                path = os.path.join(directory, filename)
+                stat = os.stat(path)
+                if stat.st_mtime < cutoff:
+                    name = os.path.relpath(path, settings.MEDIA_ROOT).replace(os.sep, "/")
+                    yield name, path, stat.st_size
+
+    def referenced(self, names):
+        return set(DocumentReference.objects.filter(name__in=names).values_list("name", flat=True))
+
+    def collect(self, batch, dry_run, cutoff):
+        """
+        Deletes the unreferenced files of one batch with a single reference lookup.
+        Each file is checked again right before it is unlinked, since an upload of
+        the same content may have touched the blob and committed a reference since.
+        """
+        referenced = self.referenced([name for name, _, _ in batch])
+        deleted = freed = 0
+        for name, path, size in batch:
+            if name in referenced:
+                continue
+            if dry_run:
+                self.stdout.write(f"orphan: {name}")
+            else:
+                try:
+                    if os.stat(path).st_mtime >= cutoff or DocumentReference.objects.filter(name=name).exists():
+                        continue
+                    os.remove(path)
+                except FileNotFoundError:
+                    continue
+            deleted, freed = deleted + 1, freed + size
+        return deleted, freed
@@ -0,0 +1,29 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from myapp.synthetic import PASSWORD, generate
+
+
+class Command(BaseCommand):
+    help = "Generates synthetic employees, clients (with details), attendance and targets for development and benchmarks."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--employees", type=int, default=20)
+        parser.add_argument("--managers", type=int, default=1)
+        parser.add_argument("--clients", type=int, default=2000)
+        parser.add_argument("--months", type=int, default=6, help="Months of clients, attendance and targets, ending now.")
+        parser.add_argument("--seed", type=int, default=0, help="Random seed, for reproducible datasets.")
+        parser.add_argument("--force", action="store_true", help="Allow running with DEBUG off.")
+
+    def handle(self, *args, **options):
+        if not settings.DEBUG and not options["force"]:
+            raise CommandError("Refusing to write synthetic data with DEBUG off; pass --force if this is intended.")
+        if options["months"] < 1:
+            raise CommandError("--months must be at least 1.")
+
+        counts = generate(
+            employees=options["employees"], clients=options["clients"], months=options["months"],
+            managers=options["managers"], seed=options["seed"],
+        )
+        summary = ", ".join(f"{count} {name}" for name, count in counts.items())
+        self.stdout.write(self.style.SUCCESS(f"Created {summary}. Password for every user: {PASSWORD!r}."))
@@ -0,0 +1,46 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from myapp.imports import FILE_TYPES, check_encoding, detect_file_type, import_clients, read_rows
+
+
+class Command(BaseCommand):
+    help = "Bulk-imports clients from a CSV (header row of Client fields) or JSONL file."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="CSV or JSONL file to import.")
+        parser.add_argument("--type", choices=FILE_TYPES, help="File type; detected from the extension by default.")
+        parser.add_argument("--batch-size", type=int, default=None, help="Rows validated and inserted per batch.")
+        parser.add_argument("--no-assign", action="store_true", help="Leave direct clients without an employee unassigned.")
+        parser.add_argument("--dry-run", action="store_true", help="Validate only; nothing is written.")
+        parser.add_argument("--report", help="Write the per-row error report to this JSON file.")
+
+    def handle(self, *args, **options):
+        file_type = options["type"] or detect_file_type(options["path"])
+        if file_type is None:
+            raise CommandError("Cannot tell the file type from the extension; pass --type csv or --type jsonl.")
+
+        try:
+            with open(options["path"], "rb") as stream:
+                encoding_error = check_encoding(stream)
+                if encoding_error:
+                    raise CommandError(encoding_error[1]["file"][0])
+                report = import_clients(
+                    read_rows(stream, file_type), assign=not options["no_assign"],
+                    dry_run=options["dry_run"], size=options["batch_size"],
+                )
+        except OSError as exc:
+            raise CommandError(str(exc))
+
+        result = report.as_dict()
+        if options["report"]:
+            with open(options["report"], "w") as output:
+                json.dump(result, output, indent=2)
+        else:
+            for error in result["errors"]:
+                self.stdout.write(f"row {error['row']}: {json.dumps(error['errors'])}")
+
+        verb = "Would create" if options["dry_run"] else "Created"
+        style = self.style.SUCCESS if not result["failed"] else self.style.WARNING
+        self.stdout.write(style(f"{verb} {result['created']} client(s); {result['failed']} row(s) failed."))
@@ -0,0 +1,35 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from myapp.performance import rebuild_rollup, recent_months, rollup_drift
+
+
+class Command(BaseCommand):
+    help = "Rebuilds the MonthlyPerformance rollup from Client, or checks it for drift with --check."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--check", action="store_true",
+            help="Only report rows that disagree with Client; exits non-zero when drift is found.",
+        )
+        parser.add_argument(
+            "--months", type=int, default=None,
+            help="With --check, only compare the most recent N months.",
+        )
+
+    def handle(self, *args, **options):
+        if options["check"]:
+            months = recent_months(date.today(), options["months"]) if options["months"] else None
+            drift = rollup_drift(months)
+            for (employee_id, year, month), (expected, stored) in sorted(drift.items()):
+                self.stdout.write(
+                    f"employee={employee_id} {month}/{year}: expected {expected}, stored {stored}"
+                )
+            if drift:
+                raise CommandError(f"Rollup drift found in {len(drift)} row(s).")
+            self.stdout.write(self.style.SUCCESS("Rollup is in sync."))
+            return
+
+        rows = rebuild_rollup()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt rollup with {rows} row(s)."))
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from myapp.models import Client
+from myapp.search import SEARCH_FIELDS, backend_name, index_clients
+
+BATCH_SIZE = 1000
+
+
+class Command(BaseCommand):
+    help = "Re-indexes every client for search, e.g. after QuerySet.update() or switching SEARCH_BACKEND."
+
+    def handle(self, *args, **options):
+        total = 0
+        last_pk = 0
+        while True:
+            batch = list(Client.objects.only(*SEARCH_FIELDS).filter(pk__gt=last_pk).order_by("pk")[:BATCH_SIZE])
+            if not batch:
+                break
+            with transaction.atomic():
+                index_clients(batch)
+            total += len(batch)
+            last_pk = batch[-1].pk
+        self.stdout.write(self.style.SUCCESS(f"Indexed {total} client(s) with the {backend_name()} backend."))
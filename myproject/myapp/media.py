@@ -0,0 +1,111 @@
+import hashlib
+import mimetypes
+import os
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.http import FileResponse, HttpResponse, HttpResponseNotModified, StreamingHttpResponse
+from django.utils.http import http_date, parse_http_date_safe, parse_etags
+
+RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+CHUNK_SIZE = 64 * 1024
+
+
+def file_etag(name, size, mtime_ns):
+    """Strong validator derived from the stored file's identity (name, size, mtime)."""
+    return '"%s"' % hashlib.sha256(f"{name}:{size}:{mtime_ns}".encode()).hexdigest()[:32]
+
+
+def parse_range(header, size):
+    """Returns (start, end) inclusive for a single satisfiable byte range, None to ignore it, or False if unsatisfiable."""
+    match = RANGE_RE.match(header.strip())
+    if not match or not any(match.groups()):
+        return None  # Malformed or multi-range: serve the whole file
+    first, last = match.groups()
+    if first:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+        if start >= size or (last and int(last) < start):
+            return False
+    else:
+        length = int(last)
+        if length == 0:
+            return False
+        start, end = max(size - length, 0), size - 1
+    return start, end
+
+
+def _read_range(path, start, end):
+    with open(path, "rb") as handle:
+        handle.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = handle.read(min(CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+def serve_file(request, name, content_type=None, cache_control="private, max-age=3600"):
+    """
+    Serves a file from default_storage with strong ETag, Last-Modified and Cache-Control.
+
+    With MEDIA_ACCEL = "nginx" or "apache" the byte transfer is handed to the front
+    proxy through X-Accel-Redirect / X-Sendfile, which then also handles Range.
+    Otherwise the file is streamed from Python with single-range support.
+    """
+    path = default_storage.path(name)
+    stat = os.stat(path)
+    etag = file_etag(name, stat.st_size, stat.st_mtime_ns)
+    last_modified = http_date(stat.st_mtime)
+    content_type = content_type or mimetypes.guess_type(name)[0] or "application/octet-stream"
+
+    def with_validators(response):
+        response["ETag"] = etag
+        response["Last-Modified"] = last_modified
+        response["Cache-Control"] = cache_control
+        return response
+
+    # Conditional GET: If-None-Match wins over If-Modified-Since
+    if_none_match = request.headers.get("If-None-Match")
+    if if_none_match:
+        if etag in parse_etags(if_none_match) or if_none_match.strip() == "*":
+            return with_validators(HttpResponseNotModified())
+    else:
+        since = parse_http_date_safe(request.headers.get("If-Modified-Since", ""))
+        if since is not None and int(stat.st_mtime) <= since:
+            return with_validators(HttpResponseNotModified())
+
+    accel = getattr(settings, "MEDIA_ACCEL", None)
+    if accel == "nginx":
+        response = HttpResponse(content_type=content_type)
+        prefix = getattr(settings, "MEDIA_ACCEL_PREFIX", "/protected-media/")
+        response["X-Accel-Redirect"] = prefix + quote(name)
+        return with_validators(response)
+    if accel == "apache":
+        response = HttpResponse(content_type=content_type)
+        response["X-Sendfile"] = path
+        return with_validators(response)
+
+    byte_range = None
+    range_header = request.headers.get("Range")
+    if range_header and request.headers.get("If-Range", etag) in (etag, last_modified):
+        byte_range = parse_range(range_header, stat.st_size)
+
+    if byte_range is False:
+        response = HttpResponse(status=416)
+        response["Content-Range"] = f"bytes */{stat.st_size}"
+        return with_validators(response)
+
+    if byte_range:
+        start, end = byte_range
+        response = StreamingHttpResponse(_read_range(path, start, end), status=206, content_type=content_type)
+        response["Content-Range"] = f"bytes {start}-{end}/{stat.st_size}"
+        response["Content-Length"] = str(end - start + 1)
+    else:
+        response = FileResponse(open(path, "rb"), content_type=content_type)
+    response["Accept-Ranges"] = "bytes"
+    return with_validators(response)
@@ -0,0 +1,52 @@
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import ExtractMonth, ExtractYear
+
+
+def build_rollup(apps, schema_editor):
+    Client = apps.get_model("myapp", "Client")
+    MonthlyPerformance = apps.get_model("myapp", "MonthlyPerformance")
+
+    rows = (
+        Client.objects.filter(approval_status="approved", assigned_employee__isnull=False)
+        .annotate(month=ExtractMonth("created_at"), year=ExtractYear("created_at"))
+        .values("assigned_employee_id", "year", "month")
+        .annotate(total=Count("id"))
+        .order_by()
+    )
+    MonthlyPerformance.objects.bulk_create(
+        [
+            MonthlyPerformance(
+                employee_id=row["assigned_employee_id"], year=row["year"], month=row["month"],
+                approved_clients=row["total"],
+            )
+            for row in rows
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0009_alter_client_approval_status'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MonthlyPerformance',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year', models.IntegerField()),
+                ('month', models.IntegerField()),
+                ('approved_clients', models.IntegerField(default=0)),
+                ('employee', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='monthly_performance', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('employee', 'year', 'month'), name='unique_employee_month_performance')],
+            },
+        ),
+        migrations.RunPython(build_rollup, migrations.RunPython.noop),
+    ]
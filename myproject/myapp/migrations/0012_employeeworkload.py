@@ -0,0 +1,39 @@
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+
+def build_workloads(apps, schema_editor):
+    User = apps.get_model("myapp", "User")
+    EmployeeWorkload = apps.get_model("myapp", "EmployeeWorkload")
+
+    employees = User.objects.filter(role="employee").annotate(
+        open_count=Count("clients", filter=Q(clients__approval_status__in=["pending", "proceed"]))
+    )
+    EmployeeWorkload.objects.bulk_create(
+        [EmployeeWorkload(employee_id=employee.id, open_clients=employee.open_count) for employee in employees],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0011_client_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EmployeeWorkload',
+            fields=[
+                ('employee', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='workload', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('open_clients', models.IntegerField(default=0)),
+                ('last_assigned_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['open_clients', 'last_assigned_at'], name='workload_load_idx'), models.Index(fields=['last_assigned_at'], name='workload_last_assigned_idx')],
+            },
+        ),
+        migrations.RunPython(build_workloads, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,21 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0012_employeeworkload'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='employeeclientdetails',
+            name='processing_status',
+            field=models.CharField(choices=[('queued', 'Queued'), ('processing', 'Processing'), ('ready', 'Ready'), ('failed', 'Failed')], default='ready', max_length=10),
+        ),
+        migrations.AddField(
+            model_name='employeeclientdetails',
+            name='processing_error',
+            field=models.TextField(blank=True, default=''),
+        ),
+    ]
@@ -0,0 +1,49 @@
+import django.db.models.deletion
+import myapp.models
+import myapp.storage
+from django.db import migrations, models
+
+DOCUMENT_FIELDS = ("aadhaar_front", "aadhaar_back", "cibil_report", "pan_card", "gas_bill")
+
+
+def build_references(apps, schema_editor):
+    EmployeeClientDetails = apps.get_model("myapp", "EmployeeClientDetails")
+    DocumentReference = apps.get_model("myapp", "DocumentReference")
+
+    references = []
+    for row in EmployeeClientDetails.objects.values("id", *DOCUMENT_FIELDS).iterator():
+        for field_name in DOCUMENT_FIELDS:
+            if row[field_name]:
+                references.append(DocumentReference(details_id=row["id"], field_name=field_name, name=row[field_name]))
+    DocumentReference.objects.bulk_create(references, batch_size=1000)
+
+
+def document_field():
+    return models.ImageField(blank=True, null=True, storage=myapp.storage.document_storage, upload_to=myapp.models.client_document_path)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0013_employeeclientdetails_processing_status'),
+    ]
+
+    operations = [
+        *[
+            migrations.AlterField(model_name='employeeclientdetails', name=field_name, field=document_field())
+            for field_name in DOCUMENT_FIELDS
+        ],
+        migrations.CreateModel(
+            name='DocumentReference',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('field_name', models.CharField(max_length=30)),
+                ('name', models.CharField(db_index=True, max_length=255)),
+                ('details', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='document_references', to='myapp.employeeclientdetails')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('details', 'field_name'), name='unique_document_reference')],
+            },
+        ),
+        migrations.RunPython(build_references, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,40 @@
+from datetime import date
+
+from django.db import migrations, models
+from django.db.models import Min
+
+
+def remove_duplicate_days(apps, schema_editor):
+    """Keeps the earliest record per (user, date) so the unique constraint can be added."""
+    Attendance = apps.get_model("myapp", "Attendance")
+    duplicates = (
+        Attendance.objects.values("user_id", "date")
+        .annotate(keep=Min("id"), total=models.Count("id"))
+        .filter(total__gt=1)
+    )
+    for row in list(duplicates.order_by()):
+        Attendance.objects.filter(user_id=row["user_id"], date=row["date"]).exclude(id=row["keep"]).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0014_document_storage'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='attendance',
+            name='date',
+            field=models.DateField(default=date.today),
+        ),
+        migrations.RunPython(remove_duplicate_days, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='attendance',
+            constraint=models.UniqueConstraint(fields=('user', 'date'), name='attendance_user_date_uniq'),
+        ),
+        migrations.AddIndex(
+            model_name='attendance',
+            index=models.Index(fields=['date', 'status'], name='attendance_date_status_idx'),
+        ),
+    ]
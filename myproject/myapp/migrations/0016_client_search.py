@@ -0,0 +1,109 @@
+import re
+import sqlite3
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+# Frozen copies of myapp.search as of this migration, so later changes there
+# (or to the live models it imports) cannot alter or break it.
+SEARCH_FIELDS = ("name", "contact_number", "gmail", "office_name", "reference_number_1", "reference_number_2")
+PHONE_FIELDS = ("contact_number", "reference_number_1", "reference_number_2")
+FTS_TABLE = "myapp_client_fts"
+FULLTEXT_INDEX = "client_search_ft"
+WORD_RE = re.compile(r"[^\W_]+")
+NON_DIGITS = re.compile(r"\D")
+
+
+def search_document(row):
+    return {
+        field: NON_DIGITS.sub("", row[field] or "") if field in PHONE_FIELDS else (row[field] or "").lower()
+        for field in SEARCH_FIELDS
+    }
+
+
+def trigrams(text):
+    grams = set()
+    for word in WORD_RE.findall(text.lower()):
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def fts5_trigram_supported():
+    try:
+        sqlite3.connect(":memory:").execute("CREATE VIRTUAL TABLE probe USING fts5(x, tokenize='trigram')")
+        return True
+    except sqlite3.OperationalError:
+        return False
+
+
+def backend_name(vendor):
+    configured = getattr(settings, "SEARCH_BACKEND", "auto")
+    if configured != "auto":
+        return configured
+    if vendor == "sqlite" and fts5_trigram_supported():
+        return "fts5"
+    if vendor == "mysql":
+        return "fulltext"
+    return "trigram"
+
+
+def create_search_index(apps, schema_editor):
+    """Creates the vendor's full-text structure and backfills whichever index the configured backend reads."""
+    connection = schema_editor.connection
+    if connection.vendor == "sqlite" and fts5_trigram_supported():
+        schema_editor.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5({', '.join(SEARCH_FIELDS)}, tokenize='trigram')"
+        )
+    elif connection.vendor == "mysql":
+        schema_editor.execute(
+            f"ALTER TABLE myapp_client ADD FULLTEXT INDEX {FULLTEXT_INDEX} ({', '.join(SEARCH_FIELDS)}) WITH PARSER ngram"
+        )
+
+    Client = apps.get_model("myapp", "Client")
+    ClientSearchTrigram = apps.get_model("myapp", "ClientSearchTrigram")
+    backend = backend_name(connection.vendor)
+    for row in Client.objects.values("id", *SEARCH_FIELDS).iterator(chunk_size=2000):
+        document = search_document(row)
+        if backend == "fts5":
+            schema_editor.execute(
+                f"INSERT INTO {FTS_TABLE} (rowid, {', '.join(SEARCH_FIELDS)}) "
+                f"VALUES (%s, {', '.join(['%s'] * len(SEARCH_FIELDS))})",
+                [row["id"], *document.values()],
+            )
+        elif backend == "trigram":
+            grams = set().union(*(trigrams(text) for text in document.values()))
+            ClientSearchTrigram.objects.bulk_create(
+                [ClientSearchTrigram(client_id=row["id"], trigram=gram) for gram in grams], ignore_conflicts=True,
+            )
+
+
+def drop_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor == "sqlite":
+        schema_editor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+    elif connection.vendor == "mysql":
+        schema_editor.execute(f"ALTER TABLE myapp_client DROP INDEX {FULLTEXT_INDEX}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0015_attendance_unique_day'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ClientSearchTrigram',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('trigram', models.CharField(max_length=3)),
+                ('client', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_trigrams', to='myapp.client')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('trigram', 'client'), name='unique_client_trigram')],
+            },
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
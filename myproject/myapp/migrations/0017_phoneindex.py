@@ -0,0 +1,65 @@
+import re
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+# Frozen copies of myapp.duplicates as of this migration (which imports the live models)
+CLIENT_PHONE_FIELDS = ("contact_number", "alternative_number", "reference_number_1", "reference_number_2")
+DETAILS_PHONE_FIELDS = ("reference_number_1", "reference_number_2")
+DETAILS_PREFIX = "details_"
+NON_DIGITS = re.compile(r"\D")
+
+
+def normalize_phone(value):
+    digits = NON_DIGITS.sub("", value or "")
+    if len(digits) > 10:
+        digits = digits[-10:]
+    return digits if len(digits) >= 7 else None
+
+
+def backfill_phone_index(apps, schema_editor):
+    Client = apps.get_model("myapp", "Client")
+    EmployeeClientDetails = apps.get_model("myapp", "EmployeeClientDetails")
+    PhoneIndex = apps.get_model("myapp", "PhoneIndex")
+
+    def rows():
+        for row in Client.objects.values("id", *CLIENT_PHONE_FIELDS).iterator(chunk_size=2000):
+            for field in CLIENT_PHONE_FIELDS:
+                yield row["id"], field, row[field]
+        for row in EmployeeClientDetails.objects.values("client_id", *DETAILS_PHONE_FIELDS).iterator(chunk_size=2000):
+            for field in DETAILS_PHONE_FIELDS:
+                yield row["client_id"], DETAILS_PREFIX + field, row[field]
+
+    batch = []
+    for client_id, source, value in rows():
+        number = normalize_phone(value)
+        if number:
+            batch.append(PhoneIndex(client_id=client_id, source=source, number=number))
+        if len(batch) >= 2000:
+            PhoneIndex.objects.bulk_create(batch)
+            batch = []
+    PhoneIndex.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0016_client_search'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PhoneIndex',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source', models.CharField(choices=[('contact_number', 'Contact number'), ('alternative_number', 'Alternative number'), ('reference_number_1', 'Reference number 1'), ('reference_number_2', 'Reference number 2'), ('details_reference_number_1', 'Details reference number 1'), ('details_reference_number_2', 'Details reference number 2')], max_length=30)),
+                ('number', models.CharField(max_length=15)),
+                ('client', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='phone_numbers', to='myapp.client')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['number'], name='phone_index_number_idx')],
+                'constraints': [models.UniqueConstraint(fields=('client', 'source'), name='unique_client_phone_source')],
+            },
+        ),
+        migrations.RunPython(backfill_phone_index, migrations.RunPython.noop),
+    ]
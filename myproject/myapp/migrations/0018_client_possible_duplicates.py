@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0017_phoneindex'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='client',
+            name='possible_duplicates',
+            field=models.JSONField(blank=True, default=list),
+        ),
+    ]
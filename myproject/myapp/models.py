@@ -2,11 +2,12 @@
 from datetime import date
 # Create your models here.
 from django.contrib.auth import get_user_model
-from django.db import models
+from django.db import connections, models, transaction
 import os
 from django.contrib.auth.models import AbstractBaseUser, BaseUserManager, PermissionsMixin
 from django.db import models
 from django.conf import settings
+from .storage import document_storage
 # User = get_user_model()  # Secure way to reference User model dynamically
 
 class UserManager(BaseUserManager):
@@ -108,8 +109,22 @@ class Client(models.Model):
     )
     approval_status = models.CharField(max_length=10, choices=status_choices, default='pending')
 
+    # ✅ Existing clients sharing a phone number at application time (myapp.duplicates.find_duplicates)
+    possible_duplicates = models.JSONField(default=list, blank=True)
+
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            # Per-employee approval counts and employee client lists
+            models.Index(fields=["assigned_employee", "approval_status", "created_at"], name="client_emp_status_created_idx"),
+            # Manager-wide status filters over a date range
+            models.Index(fields=["approval_status", "created_at"], name="client_status_created_idx"),
+            models.Index(fields=["client_type"], name="client_type_idx"),
+            # Cursor pagination ordering
+            models.Index(fields=["created_at", "id"], name="client_created_id_idx"),
+        ]
+
     def __str__(self):
         return f"{self.name} ({self.client_type}) - {self.assigned_employee if self.assigned_employee else 'Unassigned'}"
 
@@ -117,7 +132,8 @@ class Client(models.Model):
 
 def client_document_path(instance, filename):
     """
-    Store files in a dedicated folder: media/documents/client_<id>/
+    Logical upload path documents/client_<id>/<filename>. ContentAddressedStorage
+    only keeps its extension and stores the file under its SHA-256.
     """
     return os.path.join(f"documents/client_{instance.client.id}/", filename)
 
@@ -128,13 +144,13 @@ class EmployeeClientDetails(models.Model):
         related_name="extra_details"
     )
 
-    # ✅ Save files inside a dedicated client folder
+    # ✅ Identical files are stored once, content-addressed (see storage.py)
     cibil_score = models.IntegerField(null=True, blank=True)
-    aadhaar_front = models.ImageField(upload_to=client_document_path, null=True, blank=True)
-    aadhaar_back = models.ImageField(upload_to=client_document_path, null=True, blank=True)
-    cibil_report = models.ImageField(upload_to=client_document_path, null=True, blank=True)
-    pan_card = models.ImageField(upload_to=client_document_path, null=True, blank=True)
-    gas_bill = models.ImageField(upload_to=client_document_path, null=True, blank=True)
+    aadhaar_front = models.ImageField(upload_to=client_document_path, storage=document_storage, null=True, blank=True)
+    aadhaar_back = models.ImageField(upload_to=client_document_path, storage=document_storage, null=True, blank=True)
+    cibil_report = models.ImageField(upload_to=client_document_path, storage=document_storage, null=True, blank=True)
+    pan_card = models.ImageField(upload_to=client_document_path, storage=document_storage, null=True, blank=True)
+    gas_bill = models.ImageField(upload_to=client_document_path, storage=document_storage, null=True, blank=True)
 
     reference_number_1 = models.CharField(max_length=15)
     reference_number_2 = models.CharField(max_length=15)
@@ -148,6 +164,16 @@ class EmployeeClientDetails(models.Model):
         limit_choices_to={'role': 'employee'}
     )
 
+    # ✅ Progress of the background document pipeline (see documents.py)
+    PROCESSING_STATUS_CHOICES = (
+        ('queued', 'Queued'),
+        ('processing', 'Processing'),
+        ('ready', 'Ready'),
+        ('failed', 'Failed'),
+    )
+    processing_status = models.CharField(max_length=10, choices=PROCESSING_STATUS_CHOICES, default='ready')
+    processing_error = models.TextField(blank=True, default="")
+
     updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
@@ -156,15 +182,112 @@ class EmployeeClientDetails(models.Model):
 
 
  
+class DocumentReference(models.Model):
+    """
+    One row per non-empty document field of an EmployeeClientDetails; the number of
+    rows pointing at a stored file is its reference count.
+    """
+    details = models.ForeignKey(EmployeeClientDetails, on_delete=models.CASCADE, related_name="document_references")
+    field_name = models.CharField(max_length=30)
+    name = models.CharField(max_length=255, db_index=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["details", "field_name"], name="unique_document_reference"),
+        ]
+
+    def __str__(self):
+        return f"{self.details_id}.{self.field_name} -> {self.name}"
+
+
+class PhoneIndex(models.Model):
+    """
+    Normalized phone numbers of a client (its own, alternative and reference
+    numbers, plus those on EmployeeClientDetails), one row per source field, so
+    new applications can be checked for repeat applicants in one indexed query.
+    Maintained by signals and the bulk paths (see duplicates.py).
+    """
+    SOURCE_CHOICES = (
+        ('contact_number', 'Contact number'),
+        ('alternative_number', 'Alternative number'),
+        ('reference_number_1', 'Reference number 1'),
+        ('reference_number_2', 'Reference number 2'),
+        ('details_reference_number_1', 'Details reference number 1'),
+        ('details_reference_number_2', 'Details reference number 2'),
+    )
+    client = models.ForeignKey(Client, on_delete=models.CASCADE, related_name="phone_numbers")
+    source = models.CharField(max_length=30, choices=SOURCE_CHOICES)
+    number = models.CharField(max_length=15)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["client", "source"], name="unique_client_phone_source"),
+        ]
+        indexes = [
+            models.Index(fields=["number"], name="phone_index_number_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.client_id}.{self.source} = {self.number}"
+
+
 class Attendance(models.Model):
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
-    date = models.DateField(auto_now_add=True)
+    # A default rather than auto_now_add, so `manage.py close_attendance --date` can close past days
+    date = models.DateField(default=date.today)
     status = models.CharField(max_length=10, choices=[('Present', 'Present'), ('Absent', 'Absent')])
 
+    class Meta:
+        constraints = [
+            # One record per employee per day; also the index for per-employee date ranges
+            models.UniqueConstraint(fields=["user", "date"], name="attendance_user_date_uniq"),
+        ]
+        indexes = [
+            # Day-wide reports and the nightly close
+            models.Index(fields=["date", "status"], name="attendance_date_status_idx"),
+        ]
+
     def __str__(self):
         return f"{self.user.username} - {self.date} - {self.status}"
     
 
+class MonthlyTargetManager(models.Manager):
+    def bulk_set_targets(self, target_clients, month, year, employees=None):
+        """
+        Upserts `target_clients` for the given employees (default: all employees)
+        with INSERT ... ON CONFLICT/ON DUPLICATE KEY UPDATE in one transaction.
+        Returns the affected targets.
+        """
+        from .caching import bump_dashboard_version  # Avoid circular imports
+        from .performance import sync_target_counts
+
+        if employees is None:
+            employees = User.objects.filter(role="employee")
+        if isinstance(employees, models.QuerySet):
+            employee_ids = list(employees.values_list("id", flat=True))
+        else:
+            employee_ids = [getattr(emp, "pk", emp) for emp in employees]
+        if not employee_ids:
+            return []
+
+        conflict_kwargs = {"update_conflicts": True, "update_fields": ["target_clients"]}
+        if connections[self.db].features.supports_update_conflicts_with_target:
+            conflict_kwargs["unique_fields"] = ["user", "month", "year"]
+
+        with transaction.atomic(using=self.db):
+            self.bulk_create(
+                [self.model(user_id=emp_id, month=month, year=year, target_clients=target_clients)
+                 for emp_id in employee_ids],
+                batch_size=500,
+                **conflict_kwargs,
+            )
+            targets = self.filter(user_id__in=employee_ids, month=month, year=year)
+            sync_target_counts(targets)  # New rows start from the rollup, not 0
+            # bulk_create skips the model signals
+            transaction.on_commit(bump_dashboard_version, using=self.db)
+        return list(targets.order_by("user_id"))
+
+
 class MonthlyTarget(models.Model):
     user = models.ForeignKey(
         User, null=True, blank=True,  # Allow null for "all employees"
@@ -176,21 +299,18 @@ class MonthlyTarget(models.Model):
     target_clients = models.IntegerField()  # Number of clients to approve
     approved_clients = models.IntegerField(default=0)  # Auto-updated count
 
+    objects = MonthlyTargetManager()
+
     class Meta:
         unique_together = ('user', 'month', 'year')  # Ensure only one target per user per month
 
     def update_approved_clients(self):
-        """Auto-updates the approved client count based on the Client model."""
-        from app.models import Client  # Avoid circular imports
-
+        """Auto-updates the approved client count from the monthly performance rollup."""
         # Ensure update only happens for specific employees
         if self.user:
-            approved_count = Client.objects.filter(
-                assigned_employee=self.user,
-                approval_status="approved",
-                created_at__month=self.month,
-                created_at__year=self.year
-            ).count()
+            approved_count = MonthlyPerformance.objects.filter(
+                employee=self.user, month=self.month, year=self.year
+            ).values_list("approved_clients", flat=True).first() or 0
 
             if self.approved_clients != approved_count:  # Prevent unnecessary updates
                 self.approved_clients = approved_count
@@ -203,12 +323,65 @@ class MonthlyTarget(models.Model):
 
         # If user is null, create targets for all employees
         if self.user is None:
-            employees = User.objects.filter(role="employee")
-            for emp in employees:
-                MonthlyTarget.objects.update_or_create(
-                    user=emp, month=self.month, year=self.year,
-                    defaults={"target_clients": self.target_clients}
-                )
+            MonthlyTarget.objects.bulk_set_targets(self.target_clients, self.month, self.year)
+
+    def __str__(self):
+        return f"{self.user.username if self.user else 'All Employees'} - {self.month}/{self.year} (Target: {self.target_clients}, Approved: {self.approved_clients})"
+
+
+class MonthlyPerformance(models.Model):
+    """
+    Rollup of approved clients per employee and month, keyed by the client's
+    `created_at` month. Kept up to date by the Client signals in signals.py;
+    `manage.py rebuild_performance_rollup` rebuilds it and checks it for drift.
+    """
+    employee = models.ForeignKey(User, on_delete=models.CASCADE, related_name="monthly_performance")
+    year = models.IntegerField()
+    month = models.IntegerField()
+    approved_clients = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["employee", "year", "month"], name="unique_employee_month_performance"),
+        ]
+
+    def __str__(self):
+        return f"{self.employee.username} - {self.month}/{self.year} (Approved: {self.approved_clients})"
+
+
+class EmployeeWorkload(models.Model):
+    """
+    Per-employee open-client counter used to auto-assign direct clients.
+    `open_clients` counts assigned clients that are still pending or proceed.
+    """
+    employee = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name="workload")
+    open_clients = models.IntegerField(default=0)
+    last_assigned_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["open_clients", "last_assigned_at"], name="workload_load_idx"),
+            models.Index(fields=["last_assigned_at"], name="workload_last_assigned_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.employee.username} (Open clients: {self.open_clients})"
+
+
+class ClientSearchTrigram(models.Model):
+    """
+    Portable inverted index for client search (see search.py): one row per
+    distinct trigram of a client's searchable fields. Used where neither SQLite
+    FTS5 nor MySQL FULLTEXT is available.
+    """
+    client = models.ForeignKey(Client, on_delete=models.CASCADE, related_name="search_trigrams")
+    trigram = models.CharField(max_length=3)
+
+    class Meta:
+        constraints = [
+            # Leading trigram column: the search query is `trigram IN (...) GROUP BY client`
+            models.UniqueConstraint(fields=["trigram", "client"], name="unique_client_trigram"),
+        ]
 
     def __str__(self):
-        return f"{self.user.username if self.user else 'All Employees'} - {self.month}/{self.year} (Target: {self.target_clients}, Approved: {self.approved_clients})"
\ No newline at end of file
+        return f"{self.client_id}: {self.trigram!r}"
@@ -0,0 +1,64 @@
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+from rest_framework.relations import ManyRelatedField, PrimaryKeyRelatedField, RelatedField
+
+
+def related_paths(serializer, prefix=""):
+    """
+    Walks a serializer's readable fields and returns (select_related, prefetch_related)
+    lookups for everything it would otherwise load row by row: nested serializers,
+    related fields that render the related object, and dotted sources.
+    """
+    select, prefetch = [], []
+    for field in serializer.fields.values():
+        if field.write_only or field.source == "*":
+            continue
+        path = prefix + field.source.replace(".", "__")
+
+        if isinstance(field, serializers.ListSerializer) or isinstance(field, ManyRelatedField):
+            prefetch.append(path)
+        elif isinstance(field, serializers.BaseSerializer):
+            select.append(path)
+            nested_select, nested_prefetch = related_paths(field, prefix=f"{path}__")
+            select.extend(nested_select)
+            prefetch.extend(nested_prefetch)
+        elif isinstance(field, RelatedField) and not isinstance(field, PrimaryKeyRelatedField):
+            select.append(path)  # e.g. StringRelatedField/SlugRelatedField read the related row
+        elif "." in field.source:
+            select.append(path.rsplit("__", 1)[0])
+    return select, prefetch
+
+
+def optimize_queryset(queryset, serializer):
+    """Applies the select_related/prefetch_related lookups a serializer needs to a queryset."""
+    if isinstance(serializer, serializers.ListSerializer):
+        serializer = serializer.child
+    select, prefetch = related_paths(serializer)
+    if select:
+        queryset = queryset.select_related(*select)
+    if prefetch:
+        queryset = queryset.prefetch_related(*prefetch)
+    return queryset
+
+
+class OptimizedQuerysetMixin:
+    """
+    Generic view mixin: list/retrieve querysets get the joins their serializer
+    needs, so nested payloads cost one query per page instead of one per row.
+    GET requests may also `?expand=` the serializer's `expandable_fields`.
+    """
+
+    def filter_queryset(self, queryset):
+        return optimize_queryset(super().filter_queryset(queryset), self.get_serializer())
+
+    def get_serializer(self, *args, **kwargs):
+        serializer_class = self.get_serializer_class()
+        expandable = getattr(serializer_class, "expandable_fields", None)
+        requested = self.request.query_params.get("expand") if self.request.method == "GET" else None
+        if expandable and requested:
+            expand = [name.strip() for name in requested.split(",") if name.strip()]
+            unknown = [name for name in expand if name not in expandable]
+            if unknown:
+                raise ValidationError({"expand": f"Cannot expand: {', '.join(unknown)}"})
+            kwargs["expand"] = expand
+        return super().get_serializer(*args, **kwargs)
@@ -0,0 +1,27 @@
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+
+
+class ClientCursorPagination(CursorPagination):
+    """
+    Keyset pagination over (created_at, id), newest first.
+    Page cost stays flat no matter how deep the client is into the list.
+    """
+    ordering = ("-created_at", "-id")
+    page_size = 50
+    page_size_query_param = "page_size"
+    max_page_size = 500
+
+
+class AttendanceCursorPagination(CursorPagination):
+    """Keyset pagination over (date, id), most recent day first."""
+    ordering = ("-date", "-id")
+    page_size = 100
+    page_size_query_param = "page_size"
+    max_page_size = 1000
+
+
+class SearchPagination(PageNumberPagination):
+    """Pages over an already ranked, capped list of search hits."""
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
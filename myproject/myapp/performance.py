@@ -0,0 +1,225 @@
+from datetime import datetime, timedelta
+
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Q, Subquery, Sum
+from django.db.models.functions import Coalesce, ExtractMonth, ExtractYear
+from django.utils import timezone
+
+from .models import Attendance, Client, MonthlyPerformance, MonthlyTarget
+
+
+def recent_months(today, count=5):
+    """Returns (month, year) pairs for the last `count` months, newest first."""
+    months = []
+    month, year = today.month, today.year
+    for _ in range(count):
+        months.append((month, year))
+        month -= 1
+        if month == 0:
+            month, year = 12, year - 1
+    return months
+
+
+def month_range(month, year):
+    """
+    Returns the half-open [start, end) aware datetimes of a calendar month, so
+    `created_at__gte=start, created_at__lt=end` can use an index on created_at
+    where `created_at__month`/`created_at__year` cannot.
+    """
+    tz = timezone.get_current_timezone()
+    start = datetime(year, month, 1, tzinfo=tz)
+    end = datetime(year + 1, 1, 1, tzinfo=tz) if month == 12 else datetime(year, month + 1, 1, tzinfo=tz)
+    return start, end
+
+
+def created_in_months(months):
+    """Sargable `created_at` filter matching any of the given (month, year) pairs."""
+    condition = Q()
+    for month, year in months:
+        start, end = month_range(month, year)
+        condition |= Q(created_at__gte=start, created_at__lt=end)
+    return condition
+
+
+def period_filter(months):
+    """Builds an OR of (month, year) pairs, avoiding the month__in x year__in cross product."""
+    condition = Q()
+    for month, year in months:
+        condition |= Q(month=month, year=year)
+    return condition
+
+
+def approved_counts(months, employee_ids=None):
+    """
+    Reads approved clients per (employee_id, month, year) from the rollup in one query.
+    Pass `employee_ids=None` to read every employee.
+    """
+    rows = MonthlyPerformance.objects.filter(period_filter(months))
+    if employee_ids is not None:
+        rows = rows.filter(employee_id__in=employee_ids)
+
+    return {
+        (employee_id, month, year): approved
+        for employee_id, month, year, approved in rows.values_list("employee_id", "month", "year", "approved_clients")
+    }
+
+
+def targets_by_employee(months, employee_ids=None):
+    """Fetches every MonthlyTarget in the given months in one query, grouped by user id."""
+    targets = MonthlyTarget.objects.filter(period_filter(months), user__isnull=False)
+    if employee_ids is not None:
+        targets = targets.filter(user_id__in=employee_ids)
+
+    grouped = {}
+    for target in targets.order_by("user_id", "pk"):
+        grouped.setdefault(target.user_id, []).append(target)
+    return grouped
+
+
+def completion(approved, target_clients):
+    """Formats the completion percentage shown on the dashboards."""
+    return f"{(approved / target_clients * 100) if target_clients else 0:.2f}%"
+
+
+def performance_rows(targets, counts):
+    """Joins targets with the pre-computed approved counts in memory."""
+    rows = []
+    for target in targets:
+        approved = counts.get((target.user_id, target.month, target.year), 0)
+        rows.append({
+            "month": target.month,
+            "year": target.year,
+            "target_clients": target.target_clients,
+            "approved_clients": approved,
+            "completion": completion(approved, target.target_clients),
+        })
+    return rows
+
+
+# Employee dashboard (EmployeePerformanceView and its async variant)
+
+def employee_dashboard_reads(user_id, today):
+    """The dashboard's independent reads as unevaluated querysets, so sync and async views share them."""
+    previous_month = (today.replace(day=1) - timedelta(days=1)).replace(day=1)
+    return {
+        "current_target": MonthlyTarget.objects.filter(user_id=user_id, month=today.month, year=today.year),
+        # Last 4 months' targets, excluding the current month
+        "past_targets": MonthlyTarget.objects.filter(
+            user_id=user_id, year__gte=previous_month.year, month__gte=previous_month.month,
+        ).exclude(month=today.month, year=today.year).order_by("-year", "-month")[:4],
+        "attendance": Attendance.objects.filter(user_id=user_id, date__gte=today - timedelta(days=10)).values("date", "status"),
+        # All of the employee's approved clients, as this field has always reported
+        # (not just this month's), summed from the precomputed rollup
+        "approved_clients": (
+            MonthlyPerformance.objects.filter(employee_id=user_id).values("employee_id")
+            .annotate(total=Sum("approved_clients")).order_by("employee_id").values_list("total", flat=True)
+        ),
+    }
+
+
+def employee_dashboard(employee, today, current_target, past_targets, attendance, approved_clients):
+    """Builds the EmployeePerformanceView payload from the evaluated reads."""
+    def target_completion(target):
+        if target and target.target_clients > 0:
+            return f"{(target.approved_clients / target.target_clients) * 100:.2f}%"
+        return "0%"
+
+    return {
+        "employee": employee,
+        "attendance_last_10_days": list(attendance),
+        "current_month": {
+            "month": today.month,
+            "year": today.year,
+            "target_clients": current_target.target_clients if current_target else 0,
+            "approved_clients": approved_clients or 0,
+            "completion": target_completion(current_target),
+        },
+        "last_4_months": [
+            {
+                "month": target.month,
+                "year": target.year,
+                "target_clients": target.target_clients,
+                "approved_clients": target.approved_clients,
+                "completion": target_completion(target),
+            } for target in past_targets
+        ],
+    }
+
+
+# Rollup maintenance
+
+def rollup_bucket(employee_id, approval_status, created_at):
+    """Returns the (employee_id, year, month) rollup row a client counts towards, if any."""
+    if not employee_id or approval_status != "approved" or created_at is None:
+        return None
+    if timezone.is_aware(created_at):
+        created_at = timezone.localtime(created_at)
+    return (employee_id, created_at.year, created_at.month)
+
+
+def adjust_rollup(bucket, delta):
+    """Atomically moves one rollup counter by `delta` and re-syncs the matching MonthlyTarget."""
+    employee_id, year, month = bucket
+    with transaction.atomic():
+        row = MonthlyPerformance.objects.filter(employee_id=employee_id, year=year, month=month)
+        if not row.update(approved_clients=F("approved_clients") + delta):
+            MonthlyPerformance.objects.get_or_create(employee_id=employee_id, year=year, month=month)
+            row.update(approved_clients=F("approved_clients") + delta)
+        sync_target_counts(MonthlyTarget.objects.filter(user_id=employee_id, year=year, month=month))
+
+
+def sync_target_counts(targets):
+    """Copies rollup counters onto MonthlyTarget.approved_clients for the given targets."""
+    rollup = MonthlyPerformance.objects.filter(
+        employee_id=OuterRef("user_id"), year=OuterRef("year"), month=OuterRef("month")
+    ).values("approved_clients")[:1]
+    return targets.update(approved_clients=Coalesce(Subquery(rollup), 0))
+
+
+def compute_approved_counts(months=None):
+    """Recomputes rollup counters from Client with a single grouped query, optionally for some months only."""
+    clients = Client.objects.filter(approval_status="approved", assigned_employee__isnull=False)
+    if months:
+        clients = clients.filter(created_in_months(months))
+    rows = (
+        clients.annotate(month=ExtractMonth("created_at"), year=ExtractYear("created_at"))
+        .values("assigned_employee_id", "year", "month")
+        .annotate(total=Count("id"))
+        .order_by()
+    )
+    return {(row["assigned_employee_id"], row["year"], row["month"]): row["total"] for row in rows}
+
+
+def rollup_drift(months=None):
+    """Returns {bucket: (expected, stored)} for every rollup row that disagrees with Client."""
+    expected = compute_approved_counts(months)
+    stored_rows = MonthlyPerformance.objects.all()
+    if months:
+        stored_rows = stored_rows.filter(period_filter(months))
+    stored = {
+        (employee_id, year, month): approved
+        for employee_id, year, month, approved in stored_rows.values_list(
+            "employee_id", "year", "month", "approved_clients"
+        )
+    }
+    return {
+        bucket: (expected.get(bucket, 0), stored.get(bucket, 0))
+        for bucket in set(expected) | set(stored)
+        if expected.get(bucket, 0) != stored.get(bucket, 0)
+    }
+
+
+def rebuild_rollup():
+    """Replaces the rollup with freshly computed counters. Returns the number of rows written."""
+    counts = compute_approved_counts()
+    with transaction.atomic():
+        MonthlyPerformance.objects.all().delete()
+        MonthlyPerformance.objects.bulk_create(
+            [
+                MonthlyPerformance(employee_id=employee_id, year=year, month=month, approved_clients=total)
+                for (employee_id, year, month), total in counts.items()
+            ],
+            batch_size=1000,
+        )
+        sync_target_counts(MonthlyTarget.objects.filter(user__isnull=False))
+    return len(counts)
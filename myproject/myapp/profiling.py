@@ -0,0 +1,157 @@
+import logging
+from contextlib import ExitStack
+from time import perf_counter
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger("myapp.profiling")
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Raised in strict mode (tests) when a view runs more queries than its budget."""
+
+
+def query_budget(max_queries):
+    """
+    Declares how many SQL queries a view may run per request.
+    Works on class-based views (`@query_budget(4)` above the class) and function views.
+    """
+    def decorator(view):
+        view.query_budget = max_queries
+        return view
+    return decorator
+
+
+class RequestProfile:
+    """Collects query count and timings for one request; doubles as a DB execute wrapper."""
+
+    def __init__(self):
+        self.started = perf_counter()
+        self.queries = 0
+        self.db_time = 0.0
+        self.render_time = 0.0
+        self.view_name = None
+        self.budget = None
+
+    def __call__(self, execute, sql, params, many, context):
+        start = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.db_time += perf_counter() - start
+
+    @property
+    def total_time(self):
+        return perf_counter() - self.started
+
+    def server_timing(self):
+        return ", ".join([
+            f'db;dur={self.db_time * 1000:.1f};desc="{self.queries} queries"',
+            f'render;dur={self.render_time * 1000:.1f};desc="Response rendering"',
+            f"total;dur={self.total_time * 1000:.1f}",
+        ])
+
+
+class QueryProfilerMiddleware:
+    """
+    Records query count, DB time, response rendering time and response size per
+    view, exposes them as a `Server-Timing` header and logs one line per request.
+
+    Views declare a budget with `@query_budget(n)`. Going over it raises
+    QueryBudgetExceeded when QUERY_BUDGET_STRICT is on (the test runner) and
+    logs a warning otherwise.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if not getattr(settings, "QUERY_PROFILER_ENABLED", True):
+            return self.get_response(request)
+
+        profile = request.query_profile = RequestProfile()
+        with ExitStack() as stack:
+            self.wrap_connections(stack, profile)
+            response = self.get_response(request)
+        return self.finish(request, response, profile)
+
+    async def __acall__(self, request):
+        if not getattr(settings, "QUERY_PROFILER_ENABLED", True):
+            return await self.get_response(request)
+
+        # Connections are thread-local: wrap the ones of the thread the request's
+        # ORM calls run on (sync_to_async is thread-sensitive under ASGI)
+        profile = request.query_profile = RequestProfile()
+        stack = ExitStack()
+        await sync_to_async(self.wrap_connections)(stack, profile)
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(stack.close)()
+        return self.finish(request, response, profile)
+
+    def wrap_connections(self, stack, profile):
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(profile))
+
+    def finish(self, request, response, profile):
+        response["Server-Timing"] = profile.server_timing()
+        self.log(request, response, profile)
+        self.check_budget(profile)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        profile = getattr(request, "query_profile", None)
+        if profile is None:
+            return None
+        view = getattr(view_func, "view_class", view_func)
+        profile.view_name = f"{view.__module__}.{view.__qualname__}"
+        profile.budget = getattr(view, "query_budget", None)
+        return None
+
+    def process_template_response(self, request, response):
+        # DRF responses render right after this hook; time that rendering
+        profile = getattr(request, "query_profile", None)
+        if profile is not None:
+            started = perf_counter()
+
+            def finish_render(rendered):
+                profile.render_time = perf_counter() - started
+                return rendered
+
+            response.add_post_render_callback(finish_render)
+        return response
+
+    def log(self, request, response, profile):
+        size = None if response.streaming else len(response.content)
+        fields = {
+            "view": profile.view_name,
+            "method": request.method,
+            "path": request.path,
+            "status": response.status_code,
+            "queries": profile.queries,
+            "db_ms": round(profile.db_time * 1000, 1),
+            "render_ms": round(profile.render_time * 1000, 1),
+            "total_ms": round(profile.total_time * 1000, 1),
+            "bytes": size,
+        }
+        logger.info(" ".join(f"{key}={value}" for key, value in fields.items()), extra={"profile": fields})
+
+    def check_budget(self, profile):
+        if profile.budget is None or profile.queries <= profile.budget:
+            return
+        message = f"{profile.view_name} ran {profile.queries} queries (budget {profile.budget})"
+        if getattr(settings, "QUERY_BUDGET_STRICT", False):
+            raise QueryBudgetExceeded(message)
+        logger.warning(message)
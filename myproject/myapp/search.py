@@ -0,0 +1,222 @@
+import functools
+import re
+import sqlite3
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Count, Q
+from django.db.models.expressions import RawSQL
+
+from .models import Client, ClientSearchTrigram
+
+SEARCH_FIELDS = ("name", "contact_number", "gmail", "office_name", "reference_number_1", "reference_number_2")
+PHONE_FIELDS = ("contact_number", "reference_number_1", "reference_number_2")
+FTS_TABLE = "myapp_client_fts"
+FULLTEXT_INDEX = "client_search_ft"
+WORD_RE = re.compile(r"[^\W_]+")
+NON_DIGITS = re.compile(r"\D")
+
+
+# ✅ Normalization shared by indexing and querying
+
+def normalize_field(field_name, value):
+    """Lowercase text; phone numbers keep only their digits so "98765 43210" matches "9876543210"."""
+    value = value or ""
+    if field_name in PHONE_FIELDS:
+        return NON_DIGITS.sub("", value)
+    return value.lower()
+
+
+def search_document(values):
+    """Normalized {field: text} for a Client instance or a values() dict."""
+    get = values.get if isinstance(values, dict) else functools.partial(getattr, values)
+    return {field: normalize_field(field, get(field)) for field in SEARCH_FIELDS}
+
+
+def words(text):
+    return WORD_RE.findall(text.lower())
+
+
+def trigrams(text):
+    """pg_trgm-style trigrams: each word padded with two leading blanks and one trailing blank."""
+    grams = set()
+    for word in words(text):
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def query_terms(query):
+    """Query words, with digit runs joined so a phone typed with spaces stays one term."""
+    query = query.strip().lower()
+    if re.fullmatch(r"[\d\s()+-]+", query):
+        return [NON_DIGITS.sub("", query)]
+    return words(query)
+
+
+# ✅ Backends
+
+@functools.lru_cache(maxsize=None)
+def fts5_trigram_supported():
+    """Whether the linked SQLite has FTS5 with the trigram tokenizer (3.34+)."""
+    try:
+        sqlite3.connect(":memory:").execute("CREATE VIRTUAL TABLE probe USING fts5(x, tokenize='trigram')")
+        return True
+    except sqlite3.OperationalError:
+        return False
+
+
+def backend_name(vendor=None):
+    """SEARCH_BACKEND, or with "auto": fts5 on SQLite, fulltext on MySQL, trigram elsewhere."""
+    configured = getattr(settings, "SEARCH_BACKEND", "auto")
+    if configured != "auto":
+        return configured
+    vendor = vendor or connection.vendor
+    if vendor == "sqlite" and fts5_trigram_supported():
+        return "fts5"
+    if vendor == "mysql":
+        return "fulltext"
+    return "trigram"
+
+
+class TrigramBackend:
+    """Inverted trigram index in ClientSearchTrigram; similarity = shared trigrams / query trigrams."""
+
+    def index(self, clients):
+        ids = [client.pk for client in clients]
+        ClientSearchTrigram.objects.filter(client_id__in=ids).delete()
+        rows = [
+            ClientSearchTrigram(client_id=client.pk, trigram=gram)
+            for client in clients
+            for gram in set().union(*(trigrams(text) for text in search_document(client).values()))
+        ]
+        # ignore_conflicts: case-/accent-insensitive collations (MySQL) can fold two trigrams together
+        ClientSearchTrigram.objects.bulk_create(rows, batch_size=1000, ignore_conflicts=True)
+
+    def remove(self, client_ids):
+        pass  # Rows cascade with the client
+
+    def search(self, query, limit):
+        grams = set().union(*(trigrams(term) for term in query_terms(query)))
+        if not grams:
+            return []
+        minimum = max(1, round(len(grams) * getattr(settings, "SEARCH_TRIGRAM_THRESHOLD", 0.5)))
+        rows = (
+            ClientSearchTrigram.objects.filter(trigram__in=grams)
+            .values("client_id")
+            .annotate(hits=Count("id"))
+            .filter(hits__gte=minimum)
+            .order_by("-hits", "-client_id")[:limit]
+        )
+        return [(row["client_id"], round(row["hits"] / len(grams), 3)) for row in rows]
+
+
+class FTS5Backend:
+    """SQLite FTS5 table with the trigram tokenizer; queries OR the query's trigrams, ranked by weighted bm25."""
+
+    def index(self, clients):
+        with connection.cursor() as cursor:
+            cursor.executemany(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [(client.pk,) for client in clients])
+            cursor.executemany(
+                f"INSERT INTO {FTS_TABLE} (rowid, {', '.join(SEARCH_FIELDS)}) "
+                f"VALUES (%s, {', '.join(['%s'] * len(SEARCH_FIELDS))})",
+                [(client.pk, *search_document(client).values()) for client in clients],
+            )
+
+    def remove(self, client_ids):
+        with connection.cursor() as cursor:
+            cursor.executemany(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [(pk,) for pk in client_ids])
+
+    def search(self, query, limit):
+        grams = {term[i:i + 3] for term in query_terms(query) for i in range(len(term) - 2)}
+        if not grams:
+            return []
+        grams = sorted(grams)
+        expression = " OR ".join(f'"{gram}"' for gram in grams)
+        # OR-ing trigrams matches anything sharing one; keep rows containing enough of them (typo tolerance).
+        # Filtered in SQL so LIMIT counts only rows that pass the threshold.
+        minimum = max(1, round(len(grams) * getattr(settings, "SEARCH_TRIGRAM_THRESHOLD", 0.5)))
+        document = " || ' ' || ".join(SEARCH_FIELDS)
+        shared = " + ".join([f"(instr({document}, %s) > 0)"] * len(grams))
+        # Column weights: name and contact number matter most
+        weights = ", ".join(["10.0", "8.0", "4.0", "2.0", "3.0", "3.0"])
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT rowid, -bm25({FTS_TABLE}, {weights}) AS score FROM {FTS_TABLE} "
+                f"WHERE {FTS_TABLE} MATCH %s AND {shared} >= %s ORDER BY score DESC, rowid DESC LIMIT %s",
+                [expression, *grams, minimum, limit],
+            )
+            return [(pk, round(score, 6)) for pk, score in cursor.fetchall()]
+
+
+class FullTextBackend:
+    """MySQL FULLTEXT index (ngram parser) on the Client columns; InnoDB keeps it current."""
+
+    def index(self, clients):
+        pass
+
+    def remove(self, client_ids):
+        pass
+
+    def search(self, query, limit):
+        terms = " ".join(query_terms(query))
+        if not terms:
+            return []
+        score = RawSQL(f"MATCH ({', '.join(SEARCH_FIELDS)}) AGAINST (%s IN NATURAL LANGUAGE MODE)", [terms])
+        rows = (
+            Client.objects.annotate(score=score).filter(score__gt=0)
+            .order_by("-score", "-id").values_list("id", "score")[:limit]
+        )
+        return [(pk, round(float(value), 6)) for pk, value in rows]
+
+
+BACKENDS = {
+    "trigram": TrigramBackend,
+    "fts5": FTS5Backend,
+    "fulltext": FullTextBackend,
+}
+
+
+def get_backend():
+    return BACKENDS[backend_name()]()
+
+
+def index_clients(clients):
+    """(Re)indexes the given saved clients; call after bulk_create/bulk_update, which skip signals."""
+    clients = list(clients)
+    if not clients:
+        return
+    if clients[0].pk is None:
+        # bulk_create() leaves pks unset on MySQL; contact numbers are unique
+        pks = dict(Client.objects.filter(
+            contact_number__in=[client.contact_number for client in clients]
+        ).values_list("contact_number", "pk"))
+        for client in clients:
+            client.pk = pks[client.contact_number]
+    get_backend().index(clients)
+
+
+def remove_clients(client_ids):
+    if client_ids:
+        get_backend().remove(list(client_ids))
+
+
+def prefix_search(terms, limit):
+    """Queries too short for trigrams ("ra", "98"): plain prefix match on the indexed columns, newest first."""
+    condition = Q()
+    for term in terms:
+        for field in SEARCH_FIELDS:
+            condition |= Q(**{f"{field}__istartswith": term})
+    rows = Client.objects.filter(condition).order_by("-id").values_list("id", flat=True)[:limit]
+    return [(pk, 1.0) for pk in rows]
+
+
+def search_clients(query, limit=None):
+    """Returns up to `limit` (client_id, score) pairs, best match first."""
+    limit = limit or getattr(settings, "SEARCH_MAX_RESULTS", 200)
+    terms = query_terms(query)
+    if not terms:
+        return []
+    if max(len(term) for term in terms) < 3:
+        return prefix_search(terms, limit)
+    return get_backend().search(query, limit)
@@ -1,7 +1,11 @@
 from rest_framework import serializers
+from rest_framework.utils.serializer_helpers import ReturnList
 from django.contrib.auth import get_user_model
 from .models import Client, EmployeeClientDetails,Attendance,MonthlyTarget
+from .documents import DOCUMENT_FIELDS
+from .thumbnails import DERIVATIVE_SIZES, document_version
 from django.conf import settings
+from django.urls import reverse
 from datetime import date
 User = get_user_model()
 
@@ -41,11 +45,43 @@ class UserSerializer(serializers.ModelSerializer):
         fields = ["id", "username", "email", "role", "phone_number", "dob"]
 
 
+class DynamicFieldsModelSerializer(serializers.ModelSerializer):
+    """
+    ModelSerializer that accepts a `fields` argument to limit the output
+    to a subset of its declared fields, and an `expand` argument to render
+    the `expandable_fields` relations as nested objects instead of ids.
+    """
+    expandable_fields = {}
+
+    def __init__(self, *args, **kwargs):
+        fields = kwargs.pop("fields", None)
+        expand = kwargs.pop("expand", ())
+        super().__init__(*args, **kwargs)
+
+        if fields is not None:
+            for field_name in set(self.fields) - set(fields):
+                self.fields.pop(field_name)
+
+        for field_name in expand:
+            if field_name in self.fields and field_name in self.expandable_fields:
+                self.fields[field_name] = self.expandable_fields[field_name](read_only=True)
+
+
 # ✅ Serializer for Clients (Direct & Employee-Registered)
-class ClientSerializer(serializers.ModelSerializer):
+class ClientSerializer(DynamicFieldsModelSerializer):
+    expandable_fields = {"assigned_employee": UserSerializer}  # ?expand=assigned_employee
+
     class Meta:
         model = Client
         fields = "__all__"
+        read_only_fields = ["possible_duplicates"]  # Set by ClientApplicationView
+
+
+# ✅ Slim serializer for client list screens (no long address/purpose text)
+class ClientSummarySerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Client
+        fields = ["id", "name", "contact_number", "client_type", "approval_status", "assigned_employee", "created_at"]
 
 
 # # ✅ Serializer for Employee-Registered Clients (Sensitive Data)
@@ -55,10 +91,27 @@ class ClientSerializer(serializers.ModelSerializer):
 #         fields = "__all__"
 
 class EmployeeClientDetailsSerializer(serializers.ModelSerializer):
+    # ✅ Lazily generated thumbnail/preview URLs per document, e.g. derivatives["pan_card"]["thumbnail"]
+    derivatives = serializers.SerializerMethodField()
+
     class Meta:
         model = EmployeeClientDetails
         fields = "__all__"
 
+    def get_derivatives(self, obj):
+        request = self.context.get("request")
+        derivatives = {}
+        for field_name in DOCUMENT_FIELDS:
+            if not getattr(obj, field_name):
+                continue
+            derivatives[field_name] = {}
+            # Versioned, so browsers can cache them until the document is replaced
+            version = document_version(getattr(obj, field_name).name)
+            for size in DERIVATIVE_SIZES:
+                url = reverse("client-document-derivative", args=[obj.client_id, field_name, size]) + f"?v={version}"
+                derivatives[field_name][size] = request.build_absolute_uri(url) if request else url
+        return derivatives
+
 # class EmployeeClientDetailsSerializer(serializers.ModelSerializer):
 #     aadhaar_front = serializers.SerializerMethodField()
 #     aadhaar_back = serializers.SerializerMethodField()
@@ -100,11 +153,12 @@ class AttendanceSerializer(serializers.ModelSerializer):
     class Meta:
         model = Attendance
         fields = ['id', 'user', 'date', 'status']
+        read_only_fields = ['date']  # Always today, set by the view
 
 
 class MonthlyTargetSerializer(serializers.ModelSerializer):
-    month = serializers.IntegerField(default=date.today().month)
-    year = serializers.IntegerField(default=date.today().year)
+    month = serializers.IntegerField(required=False)  # validate() fills in today's, per request
+    year = serializers.IntegerField(required=False)
     user = serializers.PrimaryKeyRelatedField(
         queryset=User.objects.filter(role="employee"), required=False, allow_null=True
     )
@@ -112,39 +166,41 @@ class MonthlyTargetSerializer(serializers.ModelSerializer):
     class Meta:
         model = MonthlyTarget
         fields = ["user", "month", "year", "target_clients", "approved_clients"]
+        validators = []  # (user, month, year) is upserted by bulk_set_targets, not rejected
 
     def validate(self, attrs):
         """Ensure month/year default values are applied if missing."""
         attrs.setdefault("month", date.today().month)
         attrs.setdefault("year", date.today().year)
+        if not attrs.get("user") and not User.objects.filter(role="employee").exists():
+            raise serializers.ValidationError({"user": "No employees found."})
         return attrs
 
     def create(self, validated_data):
         """Handle case where user is None (assign targets to all employees)."""
         user = validated_data.pop("user", None)  # Get user or None
+        employees = [user] if user else None  # None means every employee
 
+        targets = MonthlyTarget.objects.bulk_set_targets(
+            validated_data["target_clients"], validated_data["month"], validated_data["year"],
+            employees=employees,
+        )
         if user:  # Creating target for a specific employee
-            target, _ = MonthlyTarget.objects.update_or_create(
-                user=user, month=validated_data["month"], year=validated_data["year"],
-                defaults={"target_clients": validated_data["target_clients"]}
-            )
-            return target
-        else:  # Creating target for ALL employees
-            employees = User.objects.filter(role="employee")
-            targets = []
-            for emp in employees:
-                target, _ = MonthlyTarget.objects.update_or_create(
-                    user=emp, month=validated_data["month"], year=validated_data["year"],
-                    defaults={"target_clients": validated_data["target_clients"]}
-                )
-                targets.append(target)
-            return targets  # Return a list when setting targets for all
+            return targets[0]
+        return targets  # Return a list when setting targets for all
 
     def to_representation(self, instance):
         """Ensure consistent output for multiple targets."""
         if isinstance(instance, list):
-            return [super().to_representation(obj) for obj in instance]
+            represent = super().to_representation  # zero-arg super() is unavailable inside the comprehension
+            return [represent(obj) for obj in instance]
         return super().to_representation(instance)
+
+    @property
+    def data(self):
+        if isinstance(self.instance, list):
+            return ReturnList(self.to_representation(self.instance), serializer=self)
+        return super().data
 # class MonthlyTargetSerializer(serializers.ModelSerializer):
 #     class Meta:
 #         model = MonthlyTarget
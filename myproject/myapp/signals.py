@@ -0,0 +1,170 @@
+from django.db import connections
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .assignment import adjust_workload, open_employee
+from .authentication import forget_user_state
+from .caching import bump_dashboard_version
+from .documents import DOCUMENT_FIELDS
+from .duplicates import (
+    CLIENT_PHONE_FIELDS, DETAILS_PHONE_FIELDS, index_client_phones, index_details_phones, unindex_details_phones,
+)
+from .models import Attendance, Client, DocumentReference, EmployeeClientDetails, EmployeeWorkload, MonthlyTarget, User
+from .performance import adjust_rollup, rollup_bucket
+from .search import SEARCH_FIELDS, index_clients, remove_clients
+from .thumbnails import delete_derivatives
+
+
+# ✅ Keep the MonthlyPerformance rollup and EmployeeWorkload counters in step
+# with Client changes. QuerySet.update()/bulk_create() skip these signals; run
+# `manage.py rebuild_performance_rollup` after bulk changes.
+
+@receiver(pre_save, sender=Client)
+def remember_client_state(sender, instance, raw=False, **kwargs):
+    instance._previous_state = None
+    if raw or instance.pk is None:
+        return
+    instance._previous_state = Client.objects.filter(pk=instance.pk).values_list(
+        "assigned_employee_id", "approval_status", "created_at"
+    ).first()
+
+
+@receiver(post_save, sender=Client)
+def update_counters_on_save(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    previous = getattr(instance, "_previous_state", None) or (None, None, None)
+    current = (instance.assigned_employee_id, instance.approval_status, instance.created_at)
+
+    previous_bucket, current_bucket = rollup_bucket(*previous), rollup_bucket(*current)
+    if previous_bucket != current_bucket:
+        if previous_bucket:
+            adjust_rollup(previous_bucket, -1)
+        if current_bucket:
+            adjust_rollup(current_bucket, 1)
+
+    previous_open, current_open = open_employee(*previous[:2]), open_employee(*current[:2])
+    if previous_open != current_open:
+        if previous_open:
+            adjust_workload(previous_open, -1)
+        if current_open:
+            adjust_workload(current_open, 1)
+
+
+@receiver(post_delete, sender=Client)
+def update_counters_on_delete(sender, instance, **kwargs):
+    bucket = rollup_bucket(instance.assigned_employee_id, instance.approval_status, instance.created_at)
+    if bucket:
+        adjust_rollup(bucket, -1)
+
+    employee_id = open_employee(instance.assigned_employee_id, instance.approval_status)
+    if employee_id:
+        adjust_workload(employee_id, -1)
+
+
+@receiver(post_save, sender=User)
+def ensure_employee_workload(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    if raw or instance.role != "employee":
+        return
+    if not created and update_fields is not None and "role" not in update_fields:
+        return
+    EmployeeWorkload.objects.get_or_create(employee=instance)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def forget_cached_user_state(sender, instance, **kwargs):
+    # Deactivation, role or password changes must reach ClaimsJWTAuthentication right away
+    forget_user_state(instance.pk)
+
+
+# ✅ Any change to dashboard data moves the cached dashboards to a new key version
+
+for model in (Client, MonthlyTarget, Attendance, User):
+    post_save.connect(bump_dashboard_version, sender=model, dispatch_uid=f"dashboard-save-{model.__name__}")
+    post_delete.connect(bump_dashboard_version, sender=model, dispatch_uid=f"dashboard-delete-{model.__name__}")
+
+
+# ✅ Keep the client search index current (bulk paths call search.index_clients)
+
+@receiver(post_save, sender=Client)
+def index_client_on_save(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw or (update_fields is not None and not set(update_fields) & set(SEARCH_FIELDS)):
+        return
+    index_clients([instance])
+
+
+@receiver(post_delete, sender=Client)
+def unindex_client_on_delete(sender, instance, **kwargs):
+    remove_clients([instance.pk])
+
+
+# ✅ Keep the phone number index for duplicate detection current (bulk paths call duplicates.index_*)
+
+@receiver(post_save, sender=Client)
+def index_client_phones_on_save(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    if raw or (update_fields is not None and not set(update_fields) & set(CLIENT_PHONE_FIELDS)):
+        return
+    index_client_phones([instance], new=created)
+
+
+@receiver(post_save, sender=EmployeeClientDetails)
+def index_details_phones_on_save(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    if raw or (update_fields is not None and not set(update_fields) & set(DETAILS_PHONE_FIELDS)):
+        return
+    index_details_phones([instance], new=created)
+
+
+@receiver(post_delete, sender=EmployeeClientDetails)
+def unindex_details_phones_on_delete(sender, instance, **kwargs):
+    unindex_details_phones([instance.client_id])
+
+
+# ✅ Drop cached thumbnails/previews when a document is replaced or removed
+
+@receiver(pre_save, sender=EmployeeClientDetails)
+def remember_document_names(sender, instance, raw=False, **kwargs):
+    instance._previous_documents = {}
+    if raw or instance.pk is None:
+        return
+    previous = EmployeeClientDetails.objects.filter(pk=instance.pk).values(*DOCUMENT_FIELDS).first()
+    instance._previous_documents = previous or {}
+
+
+@receiver(post_save, sender=EmployeeClientDetails)
+def invalidate_replaced_derivatives(sender, instance, raw=False, **kwargs):
+    for field_name, previous_name in getattr(instance, "_previous_documents", {}).items():
+        if previous_name and previous_name != getattr(instance, field_name).name:
+            delete_derivatives(previous_name)
+
+
+@receiver(post_save, sender=EmployeeClientDetails)
+def sync_document_references(sender, instance, raw=False, **kwargs):
+    # One DocumentReference per filled field; blobs without references are garbage-collected
+    if raw:
+        return
+    previous = getattr(instance, "_previous_documents", {})
+    filled, cleared = [], []
+    for field_name in DOCUMENT_FIELDS:
+        name = getattr(instance, field_name).name or ""
+        if name == (previous.get(field_name) or ""):
+            continue
+        if name:
+            filled.append(DocumentReference(details=instance, field_name=field_name, name=name))
+        else:
+            cleared.append(field_name)
+
+    if filled:
+        conflict_kwargs = {"update_conflicts": True, "update_fields": ["name"]}
+        if connections[DocumentReference.objects.db].features.supports_update_conflicts_with_target:
+            conflict_kwargs["unique_fields"] = ["details", "field_name"]
+        DocumentReference.objects.bulk_create(filled, **conflict_kwargs)
+    if cleared:
+        DocumentReference.objects.filter(details=instance, field_name__in=cleared).delete()
+
+
+@receiver(post_delete, sender=EmployeeClientDetails)
+def delete_derivatives_on_delete(sender, instance, **kwargs):
+    for field_name in DOCUMENT_FIELDS:
+        if getattr(instance, field_name):
+            delete_derivatives(getattr(instance, field_name).name)
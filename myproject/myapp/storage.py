@@ -0,0 +1,64 @@
+import hashlib
+import os
+import re
+import tempfile
+
+from django.core.files.storage import FileSystemStorage
+
+BLOB_PREFIX = "documents/blobs"
+BLOB_NAME_RE = re.compile(rf"^{BLOB_PREFIX}/[0-9a-f]{{2}}/[0-9a-f]{{2}}/(?P<digest>[0-9a-f]{{64}})(\.\w+)?$")
+
+
+def blob_digest(name):
+    """Returns the SHA-256 encoded in a blob name, or None for other names."""
+    match = BLOB_NAME_RE.match(name or "")
+    return match.group("digest") if match else None
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    Stores every distinct file once, as documents/blobs/<aa>/<bb>/<sha256><ext>.
+    The name produced by upload_to only contributes its extension, so re-uploading
+    the same image returns the existing blob instead of writing a suffixed copy.
+    References are tracked in DocumentReference; `manage.py gc_documents` removes
+    blobs nothing points at.
+    """
+
+    def get_available_name(self, name, max_length=None):
+        return name  # Names are derived from content in _save()
+
+    def _save(self, name, content):
+        extension = os.path.splitext(name)[1].lower()
+        directory = self.path(BLOB_PREFIX)
+        os.makedirs(directory, exist_ok=True)
+
+        # Hash while spooling to a temporary file, then move it into place atomically
+        sha = hashlib.sha256()
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".part")
+        try:
+            with os.fdopen(fd, "wb") as temp:
+                for chunk in content.chunks():
+                    sha.update(chunk)
+                    temp.write(chunk)
+            digest = sha.hexdigest()
+            blob_name = f"{BLOB_PREFIX}/{digest[:2]}/{digest[2:4]}/{digest}{extension}"
+            blob_path = self.path(blob_name)
+            if os.path.exists(blob_path):
+                os.remove(temp_path)
+                # Restart the gc grace period: the blob may be unreferenced until this upload commits
+                os.utime(blob_path)
+            else:
+                os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+                if self.file_permissions_mode is not None:
+                    os.chmod(temp_path, self.file_permissions_mode)
+                os.replace(temp_path, blob_path)  # Concurrent identical uploads write identical bytes
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        return blob_name
+
+
+def document_storage():
+    """Storage callable for the EmployeeClientDetails document fields."""
+    return ContentAddressedStorage()
@@ -0,0 +1,143 @@
+import random
+from datetime import date, datetime, timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from .caching import bump_dashboard_version
+from .duplicates import index_client_phones, index_details_phones
+from .imports import record_counters
+from .models import Attendance, Client, EmployeeClientDetails, EmployeeWorkload, MonthlyTarget, User
+from .performance import recent_months
+from .search import index_clients
+
+BATCH_SIZE = 1000
+FIRST_NAMES = ["Aarav", "Priya", "Rahul", "Sneha", "Vikram", "Anjali", "Karthik", "Divya", "Arjun", "Meera"]
+LAST_NAMES = ["Sharma", "Iyer", "Reddy", "Patel", "Nair", "Gupta", "Rao", "Singh", "Das", "Menon"]
+STATUS_WEIGHTS = {"pending": 30, "proceed": 15, "approved": 40, "rejected": 15}
+PASSWORD = "synthetic"
+
+
+def generate(employees=20, clients=2000, months=6, managers=1, seed=0):
+    """
+    Writes a realistic dataset in bulk: users, clients spread over the last
+    `months` months (with EmployeeClientDetails for employee-registered ones),
+    weekday attendance and monthly targets. Counters that signals would normally
+    maintain (workloads, the performance rollup, the search and
+    phone indexes) are updated
+    explicitly.
+    Every user's password is "synthetic". Returns the number of rows per model.
+    """
+    rng = random.Random(seed)
+    today = date.today()
+    start = (today.replace(day=1) - timedelta(days=31 * (months - 1))).replace(day=1)
+    offset = (User.objects.aggregate(n=Max("pk"))["n"] or 0) + (Client.objects.aggregate(n=Max("pk"))["n"] or 0)
+    password = make_password(PASSWORD)  # Hash once; PBKDF2 per user would dominate the run
+
+    with transaction.atomic():
+        users = User.objects.bulk_create([
+            User(
+                username=f"synthetic_{role}_{offset + n}", email=f"synthetic.{role}.{offset + n}@example.com",
+                phone_number=f"9{offset + n:09d}"[-15:], dob=date(1980 + n % 20, 1 + n % 12, 1 + n % 28),
+                role=role, password=password,
+            )
+            for n, role in enumerate(["manager"] * managers + ["employee"] * employees)
+        ], batch_size=BATCH_SIZE)
+        _load_pks(users, "username")
+        staff = [user for user in users if user.role == "employee"]
+        EmployeeWorkload.objects.bulk_create([EmployeeWorkload(employee=user) for user in staff], batch_size=BATCH_SIZE)
+
+        # Targets first, so the rollup below syncs their approved counts
+        periods = recent_months(today, months)
+        MonthlyTarget.objects.bulk_create([
+            MonthlyTarget(user=user, month=month, year=year, target_clients=rng.randint(10, 40))
+            for user in staff for month, year in periods
+        ], batch_size=BATCH_SIZE)
+
+        created = _clients(rng, staff, clients, start, today, offset)
+        record_counters(created)
+        index_clients(created)
+        index_client_phones(created, new=True)
+        details = EmployeeClientDetails.objects.bulk_create([
+            EmployeeClientDetails(
+                client=client, cibil_score=rng.randint(550, 850), filled_by_id=client.assigned_employee_id,
+                reference_number_1=client.reference_number_1, reference_number_2=client.reference_number_2,
+            )
+            for client in created if client.client_type == "employee_registered"
+        ], batch_size=BATCH_SIZE)
+        index_details_phones(details, new=True)
+
+        attendance = _attendance(rng, staff, start, today)
+
+    bump_dashboard_version()  # bulk_create skips the model signals
+    return {
+        "users": len(users), "clients": len(created), "client_details": len(details),
+        "attendance": attendance, "targets": len(staff) * len(periods),
+    }
+
+
+def _load_pks(objects, unique_field):
+    """bulk_create() leaves pks unset on MySQL (no RETURNING); read them back by a unique field."""
+    if not objects or objects[0].pk is not None:
+        return
+    model = type(objects[0])
+    for start in range(0, len(objects), BATCH_SIZE):
+        batch = objects[start:start + BATCH_SIZE]
+        pks = dict(model.objects.filter(
+            **{f"{unique_field}__in": [getattr(obj, unique_field) for obj in batch]}
+        ).values_list(unique_field, "pk"))
+        for obj in batch:
+            obj.pk = pks[getattr(obj, unique_field)]
+
+
+def _clients(rng, staff, count, start, today, offset):
+    span = max((today - start).days, 1) * 86400
+    tz = timezone.get_current_timezone()
+    statuses, weights = zip(*STATUS_WEIGHTS.items())
+    clients = []
+    for n in range(count):
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        number = offset + n
+        client = Client(
+            name=f"{first} {last}", contact_number=f"8{number:09d}"[-15:], gmail=f"{first}.{last}.{number}@example.com".lower(),
+            alternative_number=f"7{number:09d}"[-15:] if n % 3 == 0 else None,
+            father_name=f"{rng.choice(FIRST_NAMES)} {last}", mother_name=f"{rng.choice(FIRST_NAMES)} {last}",
+            qualifications=rng.choice(["B.Com", "B.Sc", "MBA", "Diploma", "12th"]), married_status=rng.random() < 0.5,
+            current_address=f"{rng.randint(1, 999)} Main Road", landmark="Near bus stand", years_at_address=rng.randint(0, 20),
+            office_name=f"{last} Traders", office_address=f"{rng.randint(1, 99)} Market Street",
+            designation=rng.choice(["Clerk", "Manager", "Engineer", "Sales"]), current_experience=rng.randint(0, 10),
+            overall_experience=rng.randint(0, 25), reference_name_1=rng.choice(FIRST_NAMES),
+            reference_number_1=f"6{(number * 7) % 10**9:09d}", reference_name_2=rng.choice(FIRST_NAMES),
+            reference_number_2=f"5{(number * 11) % 10**9:09d}",
+            expected_loan_amount=f"{rng.randint(20, 2000) * 500}.00", loan_purpose=rng.choice(["Home", "Vehicle", "Business", "Education"]),
+            client_type="employee_registered" if rng.random() < 0.4 else "direct",
+            assigned_employee=rng.choice(staff) if staff else None,
+            approval_status=rng.choices(statuses, weights)[0],
+        )
+        client.synthetic_created_at = datetime.combine(start, datetime.min.time(), tz) + timedelta(seconds=rng.randrange(span))
+        clients.append(client)
+
+    Client.objects.bulk_create(clients, batch_size=BATCH_SIZE)
+    _load_pks(clients, "contact_number")
+    # auto_now_add stamps every row with now(); spread them back over the period
+    for client in clients:
+        client.created_at = client.synthetic_created_at
+    Client.objects.bulk_update(clients, ["created_at"], batch_size=BATCH_SIZE)
+    return clients
+
+
+def _attendance(rng, staff, start, today):
+    rows, day = [], start
+    while day <= today:
+        if day.weekday() < 5:
+            rows.extend(
+                Attendance(user=user, date=day, status="Present" if rng.random() < 0.9 else "Absent") for user in staff
+            )
+        if len(rows) >= BATCH_SIZE * 10:
+            Attendance.objects.bulk_create(rows, batch_size=BATCH_SIZE, ignore_conflicts=True)
+            rows = []
+        day += timedelta(days=1)
+    Attendance.objects.bulk_create(rows, batch_size=BATCH_SIZE, ignore_conflicts=True)
+    return Attendance.objects.filter(user__in=staff).count()
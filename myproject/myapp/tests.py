@@ -1,3 +1,1546 @@
-from django.test import TestCase
+import csv
+import importlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from io import BytesIO, StringIO
+from itertools import count
+from unittest.mock import patch
 
-# Create your tests here.
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.exceptions import ImproperlyConfigured
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection, connections
+from django.db.models import QuerySet
+from django.http import HttpResponse
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings, skipUnlessDBFeature
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from PIL import Image
+from rest_framework.test import APIClient, APIRequestFactory
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from .authentication import ClaimsJWTAuthentication
+from .caching import dashboard_version
+from .checks import check_performance_settings, database_warnings
+from .compression import CompressionMiddleware
+from .db_backends.pool import ConnectionPool, PoolTimeout, close_pools
+from .db_backends.sqlite3.base import DatabaseWrapper as PooledSQLiteWrapper
+from .duplicates import find_duplicates, normalize_phone
+from .fastserializers import FastPathUnsupported, ValuesSerializer
+from .imports import import_clients
+from .management.commands.gc_documents import Command as GcDocumentsCommand
+from .models import Attendance, Client, DocumentReference, EmployeeClientDetails, EmployeeWorkload, MonthlyPerformance, MonthlyTarget, User
+from .performance import created_in_months, month_range, recent_months, rollup_drift
+from .profiling import QueryBudgetExceeded
+from .search import backend_name, search_clients
+from .serializers import EmployeeClientDetailsSerializer
+from .storage import document_storage
+from .thumbnails import ensure_derivative
+from .views import ManagerPerformanceView, get_tokens_for_user
+
+_sequence = count(1)
+
+
+def make_user(role="employee", **extra):
+    n = next(_sequence)
+    return User.objects.create_user(
+        username=extra.pop("username", f"{role}{n}"),
+        email=extra.pop("email", f"{role}{n}@example.com"),
+        phone_number=extra.pop("phone_number", f"90000{n:05d}"),
+        dob=date(1990, 1, 1),
+        role=role,
+        password="secret",
+    )
+
+
+def client_payload(**extra):
+    n = next(_sequence)
+    fields = {
+        "name": f"Client {n}",
+        "contact_number": f"80000{n:05d}",
+        "father_name": "Father",
+        "mother_name": "Mother",
+        "qualifications": "B.Com",
+        "current_address": "Address",
+        "landmark": "Landmark",
+        "years_at_address": 2,
+        "gmail": f"client{n}@example.com",
+        "office_name": "Office",
+        "office_address": "Office address",
+        "designation": "Clerk",
+        "current_experience": 1,
+        "overall_experience": 3,
+        "reference_name_1": "Ref one",
+        "reference_number_1": f"70000{n:05d}",
+        "reference_name_2": "Ref two",
+        "reference_number_2": f"60000{n:05d}",
+        "expected_loan_amount": "50000.00",
+        "loan_purpose": "Purpose",
+    }
+    fields.update(extra)
+    return fields
+
+
+def make_client(**extra):
+    created_at = extra.pop("created_at", None)
+    client = Client.objects.create(**client_payload(**extra))
+    if created_at is not None:
+        # auto_now_add only applies on insert, so a second save keeps the backdated value
+        client.created_at = created_at
+        client.save(update_fields=["created_at"])
+    return client
+
+
+class ManagerPerformanceViewTests(TestCase):
+    def setUp(self):
+        self.manager = make_user("manager")
+        self.api = APIClient()
+        self.api.force_authenticate(self.manager)
+        self.url = reverse("manager-employee-performance")
+        self.today = date.today()
+
+    def add_employee(self, approved=1, target=5):
+        employee = make_user()
+        MonthlyTarget.objects.bulk_create([
+            MonthlyTarget(user=employee, month=self.today.month, year=self.today.year, target_clients=target)
+        ])
+        for _ in range(approved):
+            make_client(assigned_employee=employee, approval_status="approved")
+        make_client(assigned_employee=employee, approval_status="pending")
+        return employee
+
+    def test_counts_approved_clients_per_employee(self):
+        first = self.add_employee(approved=2, target=4)
+        second = self.add_employee(approved=0, target=3)
+
+        response = self.api.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        by_id = {row["employee_id"]: row["performance"] for row in response.data}
+        self.assertEqual(by_id[first.id][0]["approved_clients"], 2)
+        self.assertEqual(by_id[first.id][0]["completion"], "50.00%")
+        self.assertEqual(by_id[second.id][0]["approved_clients"], 0)
+        self.assertEqual(by_id[second.id][0]["completion"], "0.00%")
+
+    def test_query_count_does_not_grow_with_employees(self):
+        self.add_employee()
+        with CaptureQueriesContext(connection) as few:
+            self.api.get(self.url)
+
+        for _ in range(10):
+            self.add_employee()
+        with CaptureQueriesContext(connection) as many:
+            response = self.api.get(self.url)
+
+        self.assertEqual(len(response.data), 11)
+        self.assertEqual(len(few), len(many))
+
+    def test_specific_employee_ignores_other_months(self):
+        employee = self.add_employee(approved=1)
+        old = timezone.make_aware(datetime(self.today.year - 2, 1, 15))
+        make_client(assigned_employee=employee, approval_status="approved", created_at=old)
+
+        response = self.api.get(self.url, {"employee_id": employee.id})
+
+        self.assertEqual(response.data["performance"][0]["approved_clients"], 1)
+
+    def test_recent_months_crosses_year_boundary(self):
+        self.assertEqual(recent_months(date(2025, 2, 10), 4), [(2, 2025), (1, 2025), (12, 2024), (11, 2024)])
+
+
+class ClientListCreateViewTests(TestCase):
+    def setUp(self):
+        self.manager = make_user("manager")
+        self.api = APIClient()
+        self.api.force_authenticate(self.manager)
+        self.url = reverse("client-list-create")
+
+    def test_cursor_pagination_walks_every_client_once(self):
+        created = {make_client().id for _ in range(5)}
+
+        seen = []
+        response = self.api.get(self.url, {"page_size": 2})
+        while True:
+            seen.extend(row["id"] for row in response.data["results"])
+            if not response.data["next"]:
+                break
+            response = self.api.get(response.data["next"])
+
+        self.assertEqual(len(seen), 5)
+        self.assertEqual(set(seen), created)
+
+    def test_summary_projection_skips_long_columns(self):
+        make_client()
+        with CaptureQueriesContext(connection) as queries:
+            response = self.api.get(self.url, {"fields": "summary"})
+
+        row = response.data["results"][0]
+        self.assertNotIn("current_address", row)
+        self.assertIn("approval_status", row)
+        self.assertFalse(any("current_address" in query["sql"] for query in queries))
+
+    def test_custom_projection(self):
+        make_client()
+        response = self.api.get(self.url, {"fields": "name,gmail"})
+        self.assertEqual(set(response.data["results"][0]), {"name", "gmail"})
+
+        response = self.api.get(self.url, {"fields": "name,password"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_explicit_assignee_is_kept(self):
+        chosen, idle = make_user(), make_user()
+        make_client(assigned_employee=chosen)
+
+        response = self.api.post(self.url, client_payload(assigned_employee=chosen.id), format="json")
+
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual(Client.objects.get(pk=response.data["id"]).assigned_employee, chosen)
+        self.assertEqual(EmployeeWorkload.objects.get(employee=idle).open_clients, 0)
+
+
+class MonthlyPerformanceRollupTests(TestCase):
+    def setUp(self):
+        self.employee = make_user()
+        self.today = date.today()
+
+    def approved(self, employee=None):
+        row = MonthlyPerformance.objects.filter(
+            employee=employee or self.employee, month=self.today.month, year=self.today.year
+        ).first()
+        return row.approved_clients if row else 0
+
+    def test_rollup_follows_approval_and_reassignment(self):
+        client = make_client(assigned_employee=self.employee)
+        self.assertEqual(self.approved(), 0)
+
+        client.approval_status = "approved"
+        client.save()
+        self.assertEqual(self.approved(), 1)
+
+        other = make_user()
+        client.assigned_employee = other
+        client.save()
+        self.assertEqual(self.approved(), 0)
+        self.assertEqual(self.approved(other), 1)
+
+        client.delete()
+        self.assertEqual(self.approved(other), 0)
+
+    def test_rollup_syncs_monthly_target(self):
+        MonthlyTarget.objects.bulk_create([
+            MonthlyTarget(user=self.employee, month=self.today.month, year=self.today.year, target_clients=3)
+        ])
+        make_client(assigned_employee=self.employee, approval_status="approved")
+
+        self.assertEqual(MonthlyTarget.objects.get(user=self.employee).approved_clients, 1)
+
+    def test_employee_dashboard_counts_every_approved_client(self):
+        make_client(assigned_employee=self.employee, approval_status="approved")
+        make_client(assigned_employee=self.employee, approval_status="approved", created_at=timezone.now() - timedelta(days=400))
+        make_client(assigned_employee=self.employee)
+        api = APIClient()
+        api.force_authenticate(self.employee)
+
+        response = api.get(reverse("employee-performance"))
+
+        # All-time approvals, as before the rollup; the target rows carry the per-month counts
+        self.assertEqual(response.data["current_month"]["approved_clients"], 2)
+
+    def test_command_detects_and_repairs_drift(self):
+        make_client(assigned_employee=self.employee, approval_status="approved")
+        Client.objects.update(approval_status="rejected")  # bypasses signals
+
+        with self.assertRaises(CommandError):
+            call_command("rebuild_performance_rollup", check=True, stdout=StringIO())
+
+        call_command("rebuild_performance_rollup", stdout=StringIO())
+        call_command("rebuild_performance_rollup", check=True, stdout=StringIO())
+        self.assertEqual(self.approved(), 0)
+
+
+class ClientIndexTests(TestCase):
+    """The hot Client predicates must be answerable from the composite indexes."""
+
+    def explain(self, queryset):
+        if connection.vendor not in ("sqlite", "mysql"):
+            self.skipTest("EXPLAIN assertions are written for SQLite and MySQL")
+        return queryset.explain()
+
+    def test_month_range_is_half_open(self):
+        start, end = month_range(12, 2024)
+        self.assertEqual((start.year, start.month, start.day), (2024, 12, 1))
+        self.assertEqual((end.year, end.month, end.day), (2025, 1, 1))
+
+    def test_employee_monthly_approvals_use_composite_index(self):
+        employee = make_user()
+        today = date.today()
+        queryset = Client.objects.filter(
+            created_in_months([(today.month, today.year)]),
+            assigned_employee=employee, approval_status="approved",
+        )
+        self.assertIn("client_emp_status_created_idx", self.explain(queryset))
+
+    def test_status_range_uses_status_index(self):
+        start, end = month_range(1, 2025)
+        queryset = Client.objects.filter(approval_status="pending", created_at__gte=start, created_at__lt=end)
+        self.assertIn("client_status_created_idx", self.explain(queryset))
+
+    def test_client_type_filter_uses_index(self):
+        self.assertIn("client_type_idx", self.explain(Client.objects.filter(client_type="direct")))
+
+
+class ClientAutoAssignmentTests(TestCase):
+    def setUp(self):
+        self.busy = make_user()
+        self.idle = make_user()
+        for _ in range(2):
+            make_client(assigned_employee=self.busy)
+        self.url = reverse("client-apply")
+
+    def apply(self):
+        payload = client_payload(department="Sales", married_status=False)
+        response = APIClient().post(self.url, payload, format="json")
+        self.assertEqual(response.status_code, 201, response.data)
+        return Client.objects.get(contact_number=payload["contact_number"]).assigned_employee
+
+    def test_least_loaded_fills_the_idle_employee_first(self):
+        assigned = [self.apply() for _ in range(4)]
+
+        self.assertEqual(assigned[:2], [self.idle, self.idle])
+        self.assertEqual(EmployeeWorkload.objects.get(employee=self.busy).open_clients, 3)
+        self.assertEqual(EmployeeWorkload.objects.get(employee=self.idle).open_clients, 3)
+
+    @override_settings(CLIENT_ASSIGNMENT_STRATEGY="round_robin")
+    def test_round_robin_rotates_regardless_of_load(self):
+        assigned = [self.apply() for _ in range(4)]
+
+        self.assertEqual(assigned[0], assigned[2])
+        self.assertEqual(assigned[1], assigned[3])
+        self.assertNotEqual(assigned[0], assigned[1])
+
+    def test_waits_for_a_lock_when_every_workload_row_is_held(self):
+        select_for_update = QuerySet.select_for_update
+
+        def all_rows_locked(queryset, *args, skip_locked=False, **kwargs):
+            locked = select_for_update(queryset, *args, **kwargs)
+            return locked.none() if skip_locked else locked  # What SKIP LOCKED sees under concurrent submits
+
+        with patch.object(connection.features, "has_select_for_update_skip_locked", True), \
+                patch.object(QuerySet, "select_for_update", all_rows_locked):
+            self.assertEqual(self.apply(), self.idle)
+
+    def test_workload_tracks_status_changes(self):
+        client = Client.objects.filter(assigned_employee=self.busy).first()
+        client.approval_status = "approved"
+        client.save()
+
+        self.assertEqual(EmployeeWorkload.objects.get(employee=self.busy).open_clients, 1)
+
+    def test_submit_queries_do_not_grow_with_clients(self):
+        with CaptureQueriesContext(connection) as few:
+            self.apply()
+        for _ in range(10):
+            make_client(assigned_employee=self.idle)
+        with CaptureQueriesContext(connection) as many:
+            self.apply()
+
+        self.assertEqual(len(few), len(many))
+
+
+
+@skipUnlessDBFeature("has_select_for_update")  # SQLite serializes writers; the row locks are what's under test
+class ConcurrentAssignmentTests(TransactionTestCase):
+    def test_concurrent_submissions_are_spread_and_all_assigned(self):
+        employees = [make_user() for _ in range(3)]
+        payloads = [client_payload(department="Sales", married_status=False) for _ in range(6)]
+        barrier = threading.Barrier(len(payloads))
+
+        def apply(payload):
+            try:
+                barrier.wait()
+                return APIClient().post(reverse("client-apply"), payload, format="json").status_code
+            finally:
+                connections.close_all()
+
+        with ThreadPoolExecutor(max_workers=len(payloads)) as pool:
+            statuses = list(pool.map(apply, payloads))
+
+        self.assertEqual(statuses, [201] * len(payloads))
+        self.assertFalse(Client.objects.filter(assigned_employee=None).exists())
+        self.assertEqual(
+            set(Client.objects.values_list("assigned_employee", flat=True)), {employee.pk for employee in employees},
+        )
+
+class MonthlyTargetBulkTests(TestCase):
+    def setUp(self):
+        self.manager = make_user("manager")
+        self.api = APIClient()
+        self.api.force_authenticate(self.manager)
+        self.url = reverse("set-target")
+        self.today = date.today()
+
+    def set_for_all(self, target_clients):
+        response = self.api.post(self.url, {"target_clients": target_clients}, format="json")
+        self.assertEqual(response.status_code, 201, response.data)
+        return response
+
+    def test_all_employee_fan_out_uses_constant_queries(self):
+        make_user()
+        with CaptureQueriesContext(connection) as few:
+            self.set_for_all(5)
+        for _ in range(10):
+            make_user()
+        with CaptureQueriesContext(connection) as many:
+            response = self.set_for_all(7)
+
+        self.assertEqual(len(few), len(many))
+        self.assertEqual(len(response.data), 11)
+        self.assertEqual(MonthlyTarget.objects.count(), 11)
+        self.assertEqual(set(MonthlyTarget.objects.values_list("target_clients", flat=True)), {7})
+
+    def test_specific_employee_target_is_upserted(self):
+        employee = make_user()
+        make_client(assigned_employee=employee, approval_status="approved")
+        for target_clients in (3, 4):
+            response = self.api.post(self.url, {"user": employee.id, "target_clients": target_clients}, format="json")
+            self.assertEqual(response.status_code, 201, response.data)
+
+        target = MonthlyTarget.objects.get(user=employee)
+        self.assertEqual((target.target_clients, target.approved_clients), (4, 1))
+
+    def test_no_employees(self):
+        response = self.api.post(self.url, {"target_clients": 3}, format="json")
+        self.assertEqual(response.status_code, 400)
+
+    def test_default_month_follows_the_calendar(self):
+        make_user()
+        with patch("myapp.serializers.date") as fake_date:
+            fake_date.today.return_value = date(2025, 1, 31)
+            self.set_for_all(3)
+            fake_date.today.return_value = date(2025, 2, 1)
+            self.set_for_all(4)
+
+        self.assertEqual(
+            set(MonthlyTarget.objects.values_list("month", "year", "target_clients")), {(1, 2025, 3), (2, 2025, 4)},
+        )
+
+    def test_model_save_without_user_fans_out(self):
+        employees = [make_user(), make_user()]
+        MonthlyTarget(user=None, month=self.today.month, year=self.today.year, target_clients=2).save()
+
+        self.assertEqual(MonthlyTarget.objects.filter(user__in=employees, target_clients=2).count(), 2)
+
+
+class QueryProfilerMiddlewareTests(TestCase):
+    def setUp(self):
+        self.manager = make_user("manager")
+        self.api = APIClient()
+        self.api.force_authenticate(self.manager)
+        self.url = reverse("manager-employee-performance")
+
+    def test_server_timing_header(self):
+        response = self.api.get(self.url)
+
+        self.assertRegex(response["Server-Timing"], r'^db;dur=[\d.]+;desc="\d+ queries", render;dur=[\d.]+')
+
+    def test_budget_overrun_fails_in_strict_mode(self):
+        with patch.object(ManagerPerformanceView, "query_budget", 0):
+            with override_settings(QUERY_BUDGET_STRICT=True), self.assertRaises(QueryBudgetExceeded):
+                self.api.get(self.url)
+
+            caches["dashboard"].clear()  # The first response was cached despite the overrun
+            with override_settings(QUERY_BUDGET_STRICT=False), self.assertLogs("myapp.profiling", "WARNING"):
+                self.assertEqual(self.api.get(self.url).status_code, 200)
+
+
+class ClaimsJWTAuthenticationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.employee = make_user()
+        self.token = get_tokens_for_user(self.employee)["access"]
+        self.auth = ClaimsJWTAuthentication()
+
+    def authenticate(self):
+        request = APIRequestFactory().get("/", HTTP_AUTHORIZATION=f"Bearer {self.token}")
+        return self.auth.authenticate(request)
+
+    def test_warm_cache_authenticates_without_queries(self):
+        self.authenticate()
+        with self.assertNumQueries(0):
+            user, _ = self.authenticate()
+
+        self.assertEqual((user.pk, user.role, user.username), (self.employee.pk, "employee", self.employee.username))
+        self.assertEqual(Client.objects.filter(assigned_employee=user).count(), 0)
+
+    def test_deferred_fields_load_on_access(self):
+        user, _ = self.authenticate()
+        with self.assertNumQueries(1):
+            self.assertEqual(user.phone_number, self.employee.phone_number)
+
+    def test_deactivation_and_role_change_revoke_token(self):
+        self.authenticate()
+        self.employee.is_active = False
+        self.employee.save()
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate()
+
+        self.employee.is_active = True
+        self.employee.role = "manager"
+        self.employee.save()
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate()
+
+    def test_tokens_without_claims_fall_back_to_database(self):
+        self.token = str(RefreshToken.for_user(self.employee).access_token)
+        with self.assertNumQueries(1):
+            user, _ = self.authenticate()
+        self.assertEqual(user, self.employee)
+
+
+class DashboardCacheTests(TestCase):
+    def setUp(self):
+        self.manager = make_user("manager")
+        self.employee = make_user()
+        self.api = APIClient()
+        self.api.force_authenticate(self.manager)
+        self.url = reverse("manager-employee-performance")
+
+    def test_repeat_request_is_served_from_cache(self):
+        first = self.api.get(self.url)
+        with self.assertNumQueries(0):
+            second = self.api.get(self.url)
+
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(second.data, first.data)
+        self.assertEqual(second["ETag"], first["ETag"])
+
+    def test_conditional_get_returns_not_modified(self):
+        etag = self.api.get(self.url)["ETag"]
+
+        response = self.api.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+
+    def test_client_approval_invalidates_cached_dashboard(self):
+        today = date.today()
+        MonthlyTarget.objects.create(user=self.employee, month=today.month, year=today.year, target_clients=2)
+        etag = self.api.get(self.url)["ETag"]
+        make_client(assigned_employee=self.employee, approval_status="approved")
+
+        response = self.api.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(response.data[0]["performance"][0]["approved_clients"], 1)
+
+    def test_setting_targets_invalidates_cached_dashboard(self):
+        self.api.get(self.url)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.api.post(reverse("set-target"), {"target_clients": 9}, format="json")
+
+        response = self.api.get(self.url)
+
+        self.assertEqual(response.data[0]["performance"][0]["target_clients"], 9)
+
+    def test_entries_are_scoped_per_user(self):
+        other = make_user()
+        self.api.get(reverse("employee-performance"))
+        self.api.force_authenticate(other)
+
+        response = self.api.get(reverse("employee-performance"))
+
+        self.assertEqual(response.data["employee"]["id"], other.id)
+
+    def test_other_roles_are_not_served_the_manager_entry(self):
+        self.api.get(self.url)
+        self.api.force_authenticate(self.employee)
+
+        self.assertEqual(self.api.get(self.url).status_code, 403)
+
+
+class ExportViewTests(TestCase):
+    def setUp(self):
+        self.manager = make_user("manager")
+        self.employee = make_user()
+        self.api = APIClient()
+        self.api.force_authenticate(self.manager)
+
+    def read_csv(self, response):
+        return list(csv.reader(StringIO(b"".join(response.streaming_content).decode("utf-8-sig"))))
+
+    @override_settings(EXPORT_CHUNK_SIZE=2)
+    def test_csv_streams_every_row_across_chunks(self):
+        clients = [make_client(assigned_employee=self.employee) for _ in range(5)]
+
+        response = self.api.get(reverse("export", args=["clients", "csv"]))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertIn("attachment;", response["Content-Disposition"])
+        rows = self.read_csv(response)
+        self.assertEqual(rows[0][:3], ["id", "name", "contact_number"])
+        self.assertEqual([int(row[0]) for row in rows[1:]], [client.id for client in clients])
+
+    def test_formula_like_text_is_neutralized(self):
+        make_client(name='=HYPERLINK("http://evil.example","x")', gmail="@SUM(1)", expected_loan_amount=-5)
+
+        header, row = self.read_csv(self.api.get(reverse("export", args=["clients", "csv"])))
+        row = dict(zip(header, row))
+
+        self.assertEqual(row["name"], '\'=HYPERLINK("http://evil.example","x")')
+        self.assertEqual(row["gmail"], "'@SUM(1)")
+        self.assertEqual(float(row["expected_loan_amount"]), -5)  # Numbers are left alone
+
+    def test_filters_by_employee_status_and_date(self):
+        other = make_user()
+        keep = make_client(assigned_employee=self.employee, approval_status="approved")
+        make_client(assigned_employee=self.employee, approval_status="pending")
+        make_client(assigned_employee=other, approval_status="approved")
+        make_client(assigned_employee=self.employee, approval_status="approved",
+                    created_at=timezone.make_aware(datetime(2020, 1, 1)))
+
+        response = self.api.get(reverse("export", args=["clients", "csv"]), {
+            "employee": self.employee.id, "status": "approved", "date_from": "2021-01-01",
+        })
+
+        self.assertEqual([row[0] for row in self.read_csv(response)[1:]], [str(keep.id)])
+
+    def test_xlsx_is_a_readable_workbook(self):
+        today = date.today()
+        MonthlyTarget.objects.create(user=self.employee, month=today.month, year=today.year, target_clients=4)
+
+        response = self.api.get(reverse("export", args=["targets", "xlsx"]))
+
+        self.assertEqual(response.status_code, 200)
+        with zipfile.ZipFile(BytesIO(b"".join(response.streaming_content))) as workbook:
+            sheet = workbook.read("xl/worksheets/sheet1.xml").decode()
+        self.assertIn(f"<t xml:space=\"preserve\">{self.employee.username}</t>", sheet)
+        self.assertIn("<c><v>4</v></c>", sheet)
+
+    def test_rejects_employees_and_bad_dates(self):
+        url = reverse("export", args=["attendance", "csv"])
+        self.assertEqual(self.api.get(url, {"date_from": "01/02/2024"}).status_code, 400)
+
+        self.api.force_authenticate(self.employee)
+        self.assertEqual(self.api.get(url).status_code, 403)
+
+
+class ClientImportTests(TestCase):
+    def setUp(self):
+        self.manager = make_user("manager")
+        self.employees = [make_user(), make_user()]
+        self.api = APIClient()
+        self.api.force_authenticate(self.manager)
+        self.url = reverse("client-import")
+
+    def csv_upload(self, rows, name="clients.csv"):
+        output = StringIO()
+        writer = csv.DictWriter(output, fieldnames=list(client_payload()))
+        writer.writeheader()
+        writer.writerows(rows)
+        return SimpleUploadedFile(name, output.getvalue().encode(), content_type="text/csv")
+
+    def test_csv_import_reports_bad_rows_and_balances_assignment(self):
+        existing = make_client()
+        rows = [client_payload() for _ in range(4)]
+        duplicate_in_file = client_payload(gmail=rows[0]["gmail"])
+        taken = client_payload(contact_number=existing.contact_number)
+        invalid = client_payload(gmail="not-an-email")
+
+        response = self.api.post(
+            self.url, {"file": self.csv_upload(rows + [duplicate_in_file, taken, invalid])}, format="multipart"
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["created"], 4)
+        self.assertEqual({error["row"]: list(error["errors"]) for error in response.data["errors"]},
+                         {6: ["gmail"], 7: ["contact_number"], 8: ["gmail"]})
+        imported = Client.objects.filter(gmail__in=[row["gmail"] for row in rows])
+        self.assertEqual(
+            sorted(imported.values_list("assigned_employee_id", flat=True)),
+            sorted([employee.id for employee in self.employees] * 2),
+        )
+        self.assertEqual(
+            list(EmployeeWorkload.objects.filter(employee__in=self.employees).values_list("open_clients", flat=True)),
+            [2, 2],
+        )
+
+    def test_uniqueness_is_checked_with_one_query_per_batch(self):
+        rows = [client_payload() for _ in range(20)]
+        with CaptureQueriesContext(connection) as queries:
+            self.api.post(self.url + "?assign=0", {"file": self.csv_upload(rows)}, format="multipart")
+
+        lookups = [query for query in queries if "contact_number" in query["sql"] and query["sql"].startswith("SELECT")]
+        self.assertEqual(len(lookups), 1)
+        self.assertEqual(Client.objects.count(), 20)
+
+    def test_command_imports_jsonl_in_batches(self):
+        rows = [client_payload() for _ in range(3)]
+        with tempfile.NamedTemporaryFile("w", suffix=".jsonl", delete=False) as handle:
+            handle.write("\n".join(json.dumps(row) for row in rows) + "\n{broken\n")
+        self.addCleanup(os.remove, handle.name)
+        out = StringIO()
+
+        call_command("import_clients", handle.name, "--batch-size", "2", stdout=out)
+
+        self.assertEqual(Client.objects.filter(gmail__in=[row["gmail"] for row in rows]).count(), 3)
+        self.assertIn("row 4: ", out.getvalue())
+        self.assertIn("Created 3 client(s); 1 row(s) failed.", out.getvalue())
+
+    def test_non_utf8_file_is_rejected_before_importing(self):
+        rows = [client_payload() for _ in range(3)]
+        rows[2]["office_name"] = "Caf\u00e9 Traders"
+        upload = self.csv_upload(rows)
+        upload = SimpleUploadedFile(upload.name, upload.read().decode().encode("cp1252"), content_type="text/csv")
+
+        response = self.api.post(self.url, {"file": upload}, format="multipart")
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data["created"], 0)
+        [error] = response.data["errors"]
+        self.assertEqual(error["row"], 4)
+        self.assertIn("not UTF-8", error["errors"]["file"][0])
+        self.assertEqual(Client.objects.count(), 0)
+
+    def test_dry_run_writes_nothing_and_employees_are_refused(self):
+        response = self.api.post(self.url + "?dry_run=1", {"file": self.csv_upload([client_payload()])}, format="multipart")
+        self.assertEqual(response.data["created"], 1)
+        self.assertEqual(Client.objects.count(), 0)
+
+        self.api.force_authenticate(self.employees[0])
+        self.assertEqual(self.api.post(self.url, {"file": self.csv_upload([])}, format="multipart").status_code, 403)
+
+
+class AttendanceCloseTests(TestCase):
+    def setUp(self):
+        self.present, self.missing = make_user(), make_user()
+        self.inactive = make_user()
+        self.inactive.is_active = False
+        self.inactive.save()
+        self.day = date(2024, 3, 4)
+        Attendance.objects.create(user=self.present, date=self.day, status="Present")
+
+    def test_marks_missing_employees_absent_once(self):
+        out = StringIO()
+        with self.assertNumQueries(2):
+            call_command("close_attendance", "--date", self.day.isoformat(), stdout=out)
+        call_command("close_attendance", "--date", self.day.isoformat(), stdout=out)
+
+        self.assertEqual(
+            dict(Attendance.objects.filter(date=self.day).values_list("user_id", "status")),
+            {self.present.id: "Present", self.missing.id: "Absent"},
+        )
+        self.assertIn("Marked 1 employee(s) absent on 2024-03-04.", out.getvalue())
+        self.assertIn("Marked 0 employee(s)", out.getvalue())
+
+    def test_today_stays_open_until_cutoff(self):
+        with patch("myapp.management.commands.close_attendance.is_past_cutoff", return_value=False):
+            with self.assertRaises(CommandError):
+                call_command("close_attendance", stdout=StringIO())
+
+    def test_second_post_is_rejected_by_the_constraint(self):
+        api = APIClient()
+        api.force_authenticate(self.missing)
+        Attendance.objects.create(user=self.missing, status="Present")
+
+        with patch("myapp.views.is_past_cutoff", return_value=False):
+            response = api.post(reverse("attendance-list"), {"status": "Present"})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(Attendance.objects.filter(user=self.missing).count(), 1)
+
+
+class AttendanceSummaryTests(TestCase):
+    def setUp(self):
+        self.manager = make_user("manager")
+        self.first, self.second = make_user(), make_user()
+        self.api = APIClient()
+        self.api.force_authenticate(self.manager)
+        start = date(2024, 3, 1)
+        for offset, status in enumerate(["Present", "Present", "Absent", None, "Present", "Present", "Present"]):
+            if status:
+                Attendance.objects.create(user=self.first, date=start.replace(day=1 + offset), status=status)
+        Attendance.objects.create(user=self.second, date=start, status="Absent")
+
+    def test_counts_days_and_streaks_in_one_query(self):
+        with self.assertNumQueries(1):
+            response = self.api.get(reverse("attendance-summary"), {"date_from": "2024-03-01", "date_to": "2024-03-08"})
+
+        rows = {row["employee_id"]: row for row in response.data["employees"]}
+        self.assertEqual(rows[self.first.id]["days"], "PPA-PPP-")
+        self.assertEqual(
+            {key: rows[self.first.id][key] for key in ("present", "absent", "no_record", "longest_present_streak")},
+            {"present": 5, "absent": 1, "no_record": 2, "longest_present_streak": 3},
+        )
+        self.assertEqual(rows[self.first.id]["current_present_streak"], 0)
+        self.assertEqual(rows[self.second.id]["days"], "A-------")
+
+    def test_employees_only_see_themselves(self):
+        self.api.force_authenticate(self.second)
+
+        response = self.api.get(reverse("attendance-summary"), {"date_from": "2024-03-01", "date_to": "2024-03-07"})
+
+        self.assertEqual([row["employee_id"] for row in response.data["employees"]], [self.second.id])
+
+    def test_rejects_inverted_ranges(self):
+        response = self.api.get(reverse("attendance-summary"), {"date_from": "2024-03-08", "date_to": "2024-03-01"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_raw_list_is_filtered_and_paginated(self):
+        response = self.api.get(reverse("attendance-list"), {
+            "employee": self.first.id, "date_from": "2024-03-05", "page_size": 2,
+        })
+
+        self.assertEqual([row["date"] for row in response.data["results"]], ["2024-03-07", "2024-03-06"])
+        self.assertIsNotNone(response.data["next"])
+
+
+class QuerysetOptimizerTests(TestCase):
+    def setUp(self):
+        self.manager = make_user("manager")
+        self.api = APIClient()
+        self.api.force_authenticate(self.manager)
+        for _ in range(4):
+            employee = make_user()
+            make_client(assigned_employee=employee)
+            Attendance.objects.create(user=employee, status="Present")
+
+    def test_attendance_page_nests_users_in_one_query(self):
+        with self.assertNumQueries(1):
+            response = self.api.get(reverse("attendance-list"))
+
+        self.assertEqual(len(response.data["results"]), 4)
+        self.assertIn("username", response.data["results"][0]["user"])
+
+    def test_expanded_clients_page_is_one_query(self):
+        with self.assertNumQueries(1):
+            response = self.api.get(reverse("client-list-create"), {"expand": "assigned_employee"})
+
+        employee = response.data["results"][0]["assigned_employee"]
+        self.assertEqual(set(employee), {"id", "username", "email", "role", "phone_number", "dob"})
+
+    def test_expand_combines_with_projection(self):
+        with self.assertNumQueries(1):
+            response = self.api.get(reverse("client-list-create"), {
+                "fields": "id,name,assigned_employee", "expand": "assigned_employee",
+            })
+
+        self.assertEqual(set(response.data["results"][0]), {"id", "name", "assigned_employee"})
+        self.assertIn("username", response.data["results"][0]["assigned_employee"])
+
+    def test_unknown_expansions_are_rejected(self):
+        response = self.api.get(reverse("client-list-create"), {"expand": "details"})
+        self.assertEqual(response.status_code, 400)
+
+
+class FastSerializerTests(TestCase):
+    def setUp(self):
+        self.manager = make_user("manager")
+        self.api = APIClient()
+        self.api.force_authenticate(self.manager)
+        employee = make_user()
+        make_client(assigned_employee=employee, expected_loan_amount="1234.50", alternative_number=None)
+        make_client(created_at=timezone.make_aware(datetime(2024, 5, 6, 7, 8, 9, 123456)))
+        Attendance.objects.create(user=employee, status="Absent")
+
+    def assert_identical_to_drf(self, url, params=None):
+        fast = self.api.get(url, params)
+        with patch("myapp.fastserializers.ValuesSerializer", side_effect=FastPathUnsupported):
+            slow = self.api.get(url, params)
+        self.assertEqual(fast.status_code, 200)
+        self.assertEqual(fast.content, slow.content)
+
+    def test_client_pages_match_drf_byte_for_byte(self):
+        url = reverse("client-list-create")
+        self.assert_identical_to_drf(url)
+        self.assert_identical_to_drf(url, {"fields": "summary"})
+        self.assert_identical_to_drf(url, {"fields": "name,created_at", "page_size": 1})
+        self.assert_identical_to_drf(url, {"expand": "assigned_employee"})
+
+    def test_attendance_page_matches_drf_byte_for_byte(self):
+        self.assert_identical_to_drf(reverse("attendance-list"))
+
+    def test_method_fields_fall_back_to_drf(self):
+        with self.assertRaises(FastPathUnsupported):
+            ValuesSerializer(EmployeeClientDetailsSerializer())
+
+    def test_benchmark_command_checks_output(self):
+        out = StringIO()
+        call_command("bench_serializers", "--rows", "20", "--repeat", "1", stdout=out)
+
+        self.assertIn("identical output", out.getvalue())
+        self.assertEqual(Client.objects.count(), 2)  # Benchmark rows are rolled back
+
+
+class SyntheticDataTests(TestCase):
+    def test_generate_data_keeps_counters_consistent(self):
+        out = StringIO()
+        call_command("generate_data", "--employees", "3", "--clients", "40", "--months", "2", "--force", stdout=out)
+
+        self.assertIn("40 clients", out.getvalue())
+        self.assertEqual(User.objects.filter(role="employee").count(), 3)
+        self.assertEqual(rollup_drift(), {})
+        open_clients = Client.objects.filter(approval_status__in=["pending", "proceed"]).count()
+        self.assertEqual(sum(EmployeeWorkload.objects.values_list("open_clients", flat=True)), open_clients)
+        self.assertGreater(Client.objects.filter(created_at__lt=month_range(date.today().month, date.today().year)[0]).count(), 0)
+
+    def test_bench_endpoints_writes_json_and_rolls_back(self):
+        output = os.path.join(tempfile.mkdtemp(), "bench.json")
+        self.addCleanup(shutil.rmtree, os.path.dirname(output))
+
+        version = dashboard_version()
+
+        call_command("bench_endpoints", "--employees", "2", "--clients", "10", "--months", "1",
+                     "--iterations", "2", "--only", "manager performance", "--output", output, stdout=StringIO())
+
+        with open(output) as handle:
+            report = json.load(handle)
+        result = report["results"]["manager performance"]
+        self.assertEqual(result["status"], 200)
+        self.assertEqual(set(result), {"status", "p50_ms", "p95_ms", "mean_ms", "queries", "alloc_peak_kb"})
+        self.assertEqual(Client.objects.count(), 0)
+        # Dashboards built from the rolled-back rows never reached the shared cache
+        self.assertEqual(dashboard_version(), version)
+
+
+class ClientSearchTests(TestCase):
+    BACKENDS = ("fts5", "trigram")
+
+    def setUp(self):
+        self.manager = make_user("manager")
+        self.api = APIClient()
+        self.api.force_authenticate(self.manager)
+
+    def search(self, query):
+        return [pk for pk, _ in search_clients(query)]
+
+    def make_clients(self):
+        ramesh = make_client(name="Ramesh Kumar", contact_number="9876543210", gmail="ramesh.kumar@example.com",
+                             office_name="Sunrise Traders")
+        suresh = make_client(name="Suresh Patel", office_name="Lakshmi Textiles")
+        return ramesh, suresh
+
+    def test_auto_backend_uses_fts5_on_sqlite(self):
+        self.assertEqual(backend_name(), "fts5")
+
+    def test_typo_prefix_phone_and_email_matches(self):
+        for backend in self.BACKENDS:
+            with self.subTest(backend=backend), override_settings(SEARCH_BACKEND=backend):
+                ramesh, suresh = self.make_clients()
+
+                self.assertEqual(self.search("ramesh kumr")[0], ramesh.pk)
+                self.assertEqual(self.search("lakshmi textile")[0], suresh.pk)
+                self.assertEqual(self.search("98765 43210"), [ramesh.pk])
+                self.assertIn(ramesh.pk, self.search("876543"))
+                self.assertEqual(self.search("ramesh.kum")[0], ramesh.pk)
+                self.assertNotIn(suresh.pk, self.search("sunrise"))
+                Client.objects.all().delete()
+
+    def test_index_follows_saves_and_deletes(self):
+        for backend in self.BACKENDS:
+            with self.subTest(backend=backend), override_settings(SEARCH_BACKEND=backend):
+                ramesh, _ = self.make_clients()
+                ramesh.name, ramesh.gmail = "Harini Venkatesh", "harini@example.com"
+                ramesh.save()
+
+                self.assertEqual(self.search("venkatesh")[:1], [ramesh.pk])
+                self.assertNotIn(ramesh.pk, self.search("ramesh kumar"))
+                ramesh.delete()
+                self.assertEqual(self.search("venkatesh"), [])
+                Client.objects.all().delete()
+
+    def test_threshold_applies_before_the_limit(self):
+        # Two of the query's four trigrams, deep in a long low-weight column
+        rame = make_client(name="Zed", office_name="Sri Venkateswara Rame Enterprises And General Traders "
+                                                   "Private Limited Head Office Branch")
+        for name in ["Ram", "Ame"] * 4:  # One trigram each, in the name: ranked higher, below the threshold
+            make_client(name=name, office_name="Zz")
+        for _ in range(30):
+            make_client(name="Filler", office_name="Zz")
+
+        self.assertEqual([pk for pk, _ in search_clients("ramesh", limit=1)], [rame.pk])
+
+    def test_short_queries_fall_back_to_prefix_match(self):
+        ramesh, suresh = self.make_clients()
+        self.assertEqual(self.search("ra"), [ramesh.pk])
+
+    def test_bulk_import_is_indexed(self):
+        rows = [(2, client_payload(name="Imported Iyer"), None)]
+        import_clients(rows, assign=False)
+        self.assertEqual(len(self.search("iyer")), 1)
+
+    def test_rebuild_command_restores_the_index(self):
+        with override_settings(SEARCH_BACKEND="trigram"):
+            ramesh, _ = self.make_clients()
+            ramesh.search_trigrams.all().delete()
+            self.assertNotIn(ramesh.pk, self.search("ramesh"))
+
+            call_command("rebuild_search_index", stdout=StringIO())
+            self.assertEqual(self.search("ramesh")[0], ramesh.pk)
+
+    def test_view_returns_ranked_paginated_results(self):
+        ramesh, suresh = self.make_clients()
+        for n in range(3):
+            make_client(name=f"Rameshwar {n}")
+
+        with self.assertNumQueries(2):
+            response = self.api.get(reverse("client-search"), {"q": "ramesh kumar", "page_size": 2})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["count"], 4)
+        self.assertIsNotNone(response.data["next"])
+        first = response.data["results"][0]
+        self.assertEqual(first["id"], ramesh.pk)
+        self.assertGreaterEqual(first["score"], response.data["results"][1]["score"])
+
+    def test_view_requires_manager_and_query(self):
+        self.assertEqual(self.api.get(reverse("client-search")).status_code, 400)
+        self.api.force_authenticate(make_user())
+        self.assertEqual(self.api.get(reverse("client-search"), {"q": "ramesh"}).status_code, 403)
+
+
+class DuplicateApplicantTests(TestCase):
+    def setUp(self):
+        self.employee = make_user()
+        self.existing = make_client(contact_number="9876543210", reference_number_1="9123456780")
+        self.url = reverse("client-apply")
+
+    def apply(self, api=None, **extra):
+        payload = client_payload(department="Sales", married_status=False, **extra)
+        return (api or APIClient()).post(self.url, payload, format="json")
+
+    def test_normalize_phone(self):
+        self.assertEqual(normalize_phone("+91 98765-43210"), "9876543210")
+        self.assertEqual(normalize_phone("098765 43210"), "9876543210")
+        self.assertIsNone(normalize_phone("NA"))
+
+    def staff(self):
+        api = APIClient()
+        api.force_authenticate(self.employee)
+        return api
+
+    def test_alternate_and_reference_numbers_are_flagged(self):
+        response = self.apply(self.staff(), alternative_number="+91 98765 43210", reference_number_2="9123456780")
+
+        self.assertEqual(response.status_code, 201, response.data)
+        [duplicate] = response.data["possible_duplicates"]
+        self.assertEqual(duplicate["client"], self.existing.pk)
+        self.assertCountEqual(duplicate["matches"], [
+            {"field": "alternative_number", "existing_field": "contact_number"},
+            {"field": "reference_number_2", "existing_field": "reference_number_1"},
+        ])
+
+    def test_anonymous_applicants_learn_nothing_about_existing_numbers(self):
+        for number in ("9123456780", "9000099999"):
+            with self.subTest(number=number):
+                response = self.apply(reference_number_1=number)
+
+                self.assertEqual(response.status_code, 201, response.data)
+                self.assertNotIn("possible_duplicates", response.data)
+                self.assertNotIn("possible_duplicates", response.data["client"])
+
+    def test_anonymous_applications_are_flagged_for_staff(self):
+        response = self.apply(reference_number_1="9123456780")
+        client_id = response.data["client"]["id"]
+        flagged = [{"client": self.existing.pk,
+                    "matches": [{"field": "reference_number_1", "existing_field": "reference_number_1"}]}]
+
+        manager = APIClient()
+        manager.force_authenticate(make_user("manager"))
+        self.assertEqual(Client.objects.get(pk=client_id).possible_duplicates, flagged)
+        self.assertEqual(manager.get(reverse("client-retrieve", args=[client_id])).data["possible_duplicates"], flagged)
+        listed = {row["id"]: row for row in manager.get(reverse("client-list-create")).data["results"]}
+        self.assertEqual(listed[client_id]["possible_duplicates"], flagged)
+        self.assertEqual(listed[self.existing.pk]["possible_duplicates"], [])
+
+    def test_staff_see_matching_clients(self):
+        response = self.apply(self.staff(), reference_number_1="9876543210")
+
+        self.assertEqual(response.data["possible_duplicates"], [
+            {"client": self.existing.pk, "matches": [{"field": "reference_number_1", "existing_field": "contact_number"}]},
+        ])
+
+    def test_exact_duplicate_is_flagged_with_the_error(self):
+        response = self.apply(self.staff(), contact_number="9876543210")
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("contact_number", response.data["error"])
+        self.assertEqual(response.data["possible_duplicates"][0]["client"], self.existing.pk)
+        self.assertNotIn("possible_duplicates", self.apply(contact_number="9876543210").data)
+
+    def test_details_numbers_and_updates_are_indexed(self):
+        EmployeeClientDetails.objects.create(client=self.existing, reference_number_1="9000011111",
+                                             reference_number_2="9000022222", filled_by=self.employee)
+        self.assertEqual(find_duplicates({"contact_number": "9000022222"})[0]["matches"],
+                         [{"field": "contact_number", "existing_field": "details_reference_number_2"}])
+
+        self.existing.extra_details.delete()
+        self.assertEqual(find_duplicates({"contact_number": "9000022222"}), [])
+
+        self.existing.reference_number_1 = "9555555555"
+        self.existing.save()
+        self.assertEqual(find_duplicates({"contact_number": "9123456780"}), [])
+        self.assertEqual(len(find_duplicates({"contact_number": "9555555555"})), 1)
+
+    def test_check_is_one_query(self):
+        with self.assertNumQueries(1):
+            find_duplicates({"contact_number": "9876543210", "alternative_number": "9123456780",
+                             "reference_number_1": "9000000001", "reference_number_2": "9000000002"})
+
+
+@override_settings(ROOT_URLCONF="myproject.asgi_urls")
+class AsyncViewTests(TestCase):
+    """The async variants served under ASGI return what the sync views return under WSGI."""
+
+    def setUp(self):
+        self.today = date.today()
+        self.manager = make_user("manager")
+        self.employee = make_user()
+        MonthlyTarget.objects.create(user=self.employee, month=self.today.month, year=self.today.year, target_clients=4)
+        Attendance.objects.create(user=self.employee, status="Present")
+        self.client_record = make_client(assigned_employee=self.employee, approval_status="approved")
+        EmployeeClientDetails.objects.create(client=self.client_record, reference_number_1="9000000001",
+                                             reference_number_2="9000000002", cibil_score=700)
+
+    def auth(self, user):
+        return {"Authorization": f"Bearer {get_tokens_for_user(user)['access']}"}
+
+    async def compare(self, user, url, params=None):
+        with override_settings(ROOT_URLCONF="myproject.urls"):
+            expected = await sync_to_async(self.client.get)(url, params, headers=self.auth(user))
+        await sync_to_async(caches["dashboard"].clear)()
+        response = await self.async_client.get(url, params, headers=self.auth(user))
+        self.assertEqual(response.status_code, expected.status_code)
+        self.assertEqual(response.json(), expected.json())
+        return response
+
+    async def test_employee_performance_matches_sync(self):
+        response = await self.compare(self.employee, reverse("employee-performance"))
+        self.assertEqual(response.json()["current_month"]["approved_clients"], 1)
+        self.assertTrue(response.has_header("ETag"))
+
+    async def test_manager_performance_matches_sync(self):
+        await self.compare(self.manager, reverse("manager-employee-performance"))
+        await self.compare(self.manager, reverse("manager-employee-performance"), {"employee_id": self.employee.pk})
+        await self.compare(self.manager, reverse("manager-employee-performance"), {"employee_id": 999999})
+
+    async def test_client_documents_match_sync(self):
+        await self.compare(self.employee, reverse("client-documents", args=[self.client_record.pk]))
+        await self.compare(self.employee, reverse("client-documents", args=[999999]))
+
+    async def test_authentication_and_roles(self):
+        url = reverse("manager-employee-performance")
+        response = await self.async_client.get(url)
+        self.assertEqual(response.status_code, 401)
+        self.assertIn("Bearer", response["WWW-Authenticate"])
+
+        response = await self.async_client.get(url, headers=self.auth(self.employee))
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(response.json(), {"detail": "Only managers can view performance data."})
+
+    def test_asgi_urlconf_swaps_only_the_async_views(self):
+        from django.urls import resolve
+        self.assertEqual(resolve(reverse("employee-performance")).func.view_class.__name__, "AsyncEmployeePerformanceView")
+        self.assertEqual(resolve(reverse("client-list-create")).func.view_class.__name__, "ClientListCreateView")
+
+
+class AsgiLoadTestTests(TransactionTestCase):
+    def test_bench_asgi_serves_both_modes(self):
+        cache.clear()  # User ids restart after the flush; drop auth state cached by earlier tests
+        call_command("generate_data", "--employees", "2", "--clients", "20", "--months", "1", "--force", stdout=StringIO())
+        out = StringIO()
+
+        call_command("bench_asgi", "--concurrency", "2", "--requests", "12", "--uncached", stdout=out)
+
+        wsgi, asgi = out.getvalue().split("asgi:")
+        self.assertIn("errors 0", wsgi)
+        self.assertIn("errors 0", asgi)
+
+
+class FakeConnection:
+    def __init__(self):
+        self.closed = False
+        self.rollbacks = 0
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    def close(self):
+        self.closed = True
+
+
+class ConnectionPoolTests(SimpleTestCase):
+    def test_released_connections_are_rolled_back_and_reused(self):
+        pool = ConnectionPool(FakeConnection, max_size=2)
+        first = pool.acquire()
+        pool.release(first)
+
+        self.assertIs(pool.acquire(), first)
+        self.assertEqual(first.rollbacks, 1)
+        self.assertEqual((pool.stats["opened"], pool.stats["reused"]), (1, 1))
+
+    def test_unhealthy_connections_are_replaced(self):
+        pool = ConnectionPool(FakeConnection, max_size=1, validate=lambda connection: not connection.rollbacks)
+        first = pool.acquire()
+        pool.release(first)
+
+        second = pool.acquire()
+
+        self.assertIsNot(second, first)
+        self.assertTrue(first.closed)
+        self.assertEqual(pool.size, 1)
+
+    def test_waits_for_a_free_connection_then_times_out(self):
+        pool = ConnectionPool(FakeConnection, max_size=1, timeout=0.05)
+        pool.acquire()
+
+        with self.assertRaises(PoolTimeout):
+            pool.acquire()
+
+
+class PooledSQLiteBackendTests(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        self.addCleanup(close_pools)
+        settings_dict = connections.configure_settings({"default": {
+            "ENGINE": "myapp.db_backends.sqlite3", "NAME": os.path.join(directory, "pool.sqlite3"),
+        }})["default"]
+        self.wrapper = PooledSQLiteWrapper(settings_dict, "pooled")
+        self.addCleanup(self.wrapper.close)
+
+    def test_close_returns_the_connection_to_the_pool(self):
+        with self.wrapper.cursor() as cursor:
+            cursor.execute("CREATE TABLE numbers (n integer)")
+        raw = self.wrapper.connection
+        self.wrapper.close()
+
+        self.wrapper.connect()
+
+        self.assertIs(self.wrapper.connection, raw)
+        self.assertEqual(self.wrapper.get_pool().stats["opened"], 1)
+
+    def test_open_transactions_do_not_leak_to_the_next_borrower(self):
+        with self.wrapper.cursor() as cursor:
+            cursor.execute("CREATE TABLE numbers (n integer)")
+        self.wrapper.set_autocommit(False)
+        with self.wrapper.cursor() as cursor:
+            cursor.execute("INSERT INTO numbers VALUES (1)")
+        self.wrapper.close()
+
+        with self.wrapper.cursor() as cursor:
+            cursor.execute("SELECT COUNT(*) FROM numbers")
+            self.assertEqual(cursor.fetchone(), (0,))
+
+
+class ConnectionBenchmarkTests(TransactionTestCase):
+    def test_bench_connections_runs_every_mode(self):
+        cache.clear()  # User ids restart after the flush; drop auth state cached by earlier tests
+        call_command("generate_data", "--employees", "2", "--clients", "20", "--months", "1", "--force", stdout=StringIO())
+        out = StringIO()
+
+        call_command("bench_connections", "--concurrency", "2", "--requests", "9", stdout=out)
+
+        lines = [line for line in out.getvalue().splitlines() if "p95" in line]
+        self.assertEqual(len(lines), 3)
+        for line in lines:
+            self.assertIn("errors 0", line)
+
+
+def load_settings_profile(name, **environ):
+    module = f"myproject.settings.{name}"
+    sys.modules.pop(module, None)
+    try:
+        with patch.dict(os.environ, environ):
+            return importlib.import_module(module)
+    finally:
+        sys.modules.pop(module, None)
+
+
+class SettingsProfileTests(SimpleTestCase):
+    def test_prod_requires_a_secret_key_and_hosts(self):
+        with self.assertRaises(ImproperlyConfigured):
+            load_settings_profile("prod", DJANGO_ALLOWED_HOSTS="api.example.com")
+
+    def test_prod_defaults(self):
+        prod = load_settings_profile("prod", DJANGO_SECRET_KEY="prod-key", DJANGO_ALLOWED_HOSTS="api.example.com")
+
+        self.assertFalse(prod.DEBUG)
+        self.assertEqual(prod.ALLOWED_HOSTS, ["api.example.com"])
+        self.assertEqual(prod.TEMPLATES[0]["OPTIONS"]["loaders"][0][0], "django.template.loaders.cached.Loader")
+        self.assertEqual(prod.MIDDLEWARE[1:4], [
+            "django.middleware.security.SecurityMiddleware",
+            "myapp.compression.CompressionMiddleware",
+            "corsheaders.middleware.CorsMiddleware",
+        ])
+
+
+class PerformanceCheckTests(SimpleTestCase):
+    def check_ids(self):
+        return {warning.id for warning in check_performance_settings(None)}
+
+    def test_test_profile_is_clean(self):
+        self.assertEqual(self.check_ids() - {"myapp.W006", "myapp.W007"}, set())  # Silenced for tests
+
+    def test_warns_about_hostile_settings(self):
+        middleware = [name for name in settings.MIDDLEWARE if name != "corsheaders.middleware.CorsMiddleware"]
+        with override_settings(DEBUG=True, MIDDLEWARE=middleware + ["corsheaders.middleware.CorsMiddleware"]), patch(
+            "myapp.checks.caches", {"default": caches["default"], "dashboard": DummyCache("", {})},
+        ):
+            self.assertEqual(self.check_ids(), {"myapp.W001", "myapp.W004", "myapp.W005"})
+
+    def test_warns_about_connect_per_request(self):
+        databases = {
+            "per-request": {"ENGINE": "django.db.backends.mysql", "NAME": "loanapp", "CONN_MAX_AGE": 0},
+            "pooled": {"ENGINE": "myapp.db_backends.mysql", "NAME": "loanapp", "CONN_MAX_AGE": 0},
+            "persistent": {"ENGINE": "django.db.backends.mysql", "NAME": "loanapp", "CONN_MAX_AGE": 60},
+            "memory": {"ENGINE": "django.db.backends.sqlite3", "NAME": ":memory:", "CONN_MAX_AGE": 0},
+        }
+
+        warnings = database_warnings(databases)
+
+        self.assertEqual([warning.msg for warning in warnings], [
+            "Database 'per-request' opens a new connection for every request.",
+        ])
+
+
+class CompressionMiddlewareTests(SimpleTestCase):
+    def respond(self, content_type):
+        request = APIRequestFactory().get("/", HTTP_ACCEPT_ENCODING="gzip")
+        middleware = CompressionMiddleware(lambda request: HttpResponse(b"x" * 1000, content_type=content_type))
+        return middleware(request)
+
+    def test_compresses_json(self):
+        self.assertEqual(self.respond("application/json")["Content-Encoding"], "gzip")
+
+    def test_skips_already_compressed_types(self):
+        self.assertFalse(self.respond("image/jpeg").has_header("Content-Encoding"))
+
+
+def image_upload(name="photo.jpg", size=(64, 48), exif=True):
+    image = Image.new("RGB", size, "red")
+    data = BytesIO()
+    extra = {}
+    if exif:
+        metadata = Image.Exif()
+        metadata[0x010F] = "PhoneMaker"  # Make
+        extra["exif"] = metadata
+    image.save(data, "JPEG", **extra)
+    return SimpleUploadedFile(name, data.getvalue(), content_type="image/jpeg")
+
+
+class MediaRootTestMixin:
+    def setUp(self):
+        super().setUp()
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        media = override_settings(MEDIA_ROOT=self.media_root,
+                                  DOCUMENT_STAGING_ROOT=os.path.join(self.media_root, "staging"))
+        media.enable()
+        self.addCleanup(media.disable)
+
+
+class UploadClientDocumentsViewTests(MediaRootTestMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.employee = make_user()
+        self.client_obj = make_client(assigned_employee=self.employee)
+        self.api = APIClient()
+        self.api.force_authenticate(self.employee)
+        self.url = reverse("upload-documents", args=[self.client_obj.id])
+
+    def test_upload_is_finalized_and_stripped(self):
+        response = self.api.patch(self.url, {"pan_card": image_upload("pan.png")}, format="multipart")
+
+        self.assertEqual(response.status_code, 202)
+        details = EmployeeClientDetails.objects.get(client=self.client_obj)
+        self.assertEqual(details.processing_status, "ready")
+        self.assertTrue(details.pan_card.name.startswith("documents/blobs/"))
+        with Image.open(details.pan_card.path) as stored:
+            self.assertEqual(stored.format, "JPEG")
+            self.assertEqual(len(stored.getexif()), 0)
+        self.assertEqual(os.listdir(os.path.join(self.media_root, "staging", f"client_{self.client_obj.id}")), [])
+
+    def test_invalid_image_marks_details_failed(self):
+        bogus = SimpleUploadedFile("pan.jpg", b"not an image", content_type="image/jpeg")
+        with self.assertLogs("myapp.documents", "ERROR"):
+            self.api.patch(self.url, {"pan_card": bogus}, format="multipart")
+
+        details = EmployeeClientDetails.objects.get(client=self.client_obj)
+        self.assertEqual(details.processing_status, "failed")
+        self.assertFalse(details.pan_card)
+
+    def test_unknown_field_is_rejected(self):
+        response = self.api.patch(self.url, {"selfie": image_upload()}, format="multipart")
+        self.assertEqual(response.status_code, 400)
+
+
+class DocumentDerivativeTests(MediaRootTestMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.employee = make_user()
+        self.client_obj = make_client(assigned_employee=self.employee)
+        self.details = EmployeeClientDetails.objects.create(
+            client=self.client_obj, reference_number_1="1", reference_number_2="2"
+        )
+        self.details.pan_card.save("pan.jpg", image_upload(size=(1600, 1200)))
+        self.api = APIClient()
+        self.api.force_authenticate(self.employee)
+
+    def test_serializer_exposes_lazy_urls(self):
+        response = self.api.get(reverse("client-documents", args=[self.client_obj.id]))
+
+        url = response.data["derivatives"]["pan_card"]["thumbnail"]
+        self.assertIn(f"/client-documents/{self.client_obj.id}/pan_card/thumbnail/?v=", url)
+        self.assertFalse(os.path.exists(os.path.join(self.media_root, "derivatives")))
+
+    def test_derivative_is_generated_once_and_resized(self):
+        url = reverse("client-document-derivative", args=[self.client_obj.id, "pan_card", "thumbnail"])
+        first = self.api.get(url)
+        content = b"".join(first.streaming_content)
+
+        self.assertEqual(first.status_code, 200)
+        with Image.open(BytesIO(content)) as image:
+            self.assertLessEqual(max(image.size), 200)
+        with patch("myapp.thumbnails.Image.open") as reopen:
+            self.assertEqual(self.api.get(url).status_code, 200)
+        reopen.assert_not_called()
+
+    def test_replacing_the_source_invalidates_derivatives(self):
+        name = ensure_derivative(self.details.pan_card, "thumbnail")
+        self.details.pan_card.save("pan2.jpg", image_upload(size=(300, 300)))
+
+        self.assertFalse(default_storage.exists(name))
+
+    def test_only_the_current_version_is_cached_for_good(self):
+        def thumbnail_url():
+            response = self.api.get(reverse("client-documents", args=[self.client_obj.id]))
+            return response.data["derivatives"]["pan_card"]["thumbnail"]
+
+        old_url = thumbnail_url()
+        self.assertIn("immutable", self.api.get(old_url)["Cache-Control"])
+        self.details.pan_card.save("pan2.jpg", image_upload(size=(300, 300)))
+
+        self.assertNotEqual(thumbnail_url(), old_url)
+        self.assertEqual(self.api.get(old_url)["Cache-Control"], "private, no-cache")
+        self.assertIn("immutable", self.api.get(thumbnail_url())["Cache-Control"])
+
+    def test_other_employees_are_denied(self):
+        self.api.force_authenticate(make_user())
+        url = reverse("client-document-derivative", args=[self.client_obj.id, "pan_card", "thumbnail"])
+        self.assertEqual(self.api.get(url).status_code, 403)
+
+
+class MediaFileViewTests(MediaRootTestMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.employee = make_user()
+        self.client_obj = make_client(assigned_employee=self.employee)
+        self.name = default_storage.save(f"documents/client_{self.client_obj.id}/scan.bin", ContentFile(b"0123456789"))
+        self.url = f"/media/{self.name}"
+        self.api = APIClient()
+        self.api.force_authenticate(self.employee)
+
+    def test_full_and_conditional_requests(self):
+        response = self.api.get(self.url)
+        self.assertEqual(b"".join(response.streaming_content), b"0123456789")
+        self.assertEqual(response["Accept-Ranges"], "bytes")
+
+        cached = self.api.get(self.url, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(cached.status_code, 304)
+
+    def test_range_requests(self):
+        response = self.api.get(self.url, HTTP_RANGE="bytes=2-5")
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response["Content-Range"], "bytes 2-5/10")
+        self.assertEqual(b"".join(response.streaming_content), b"2345")
+
+        self.assertEqual(b"".join(self.api.get(self.url, HTTP_RANGE="bytes=-3").streaming_content), b"789")
+        self.assertEqual(self.api.get(self.url, HTTP_RANGE="bytes=20-").status_code, 416)
+
+    @override_settings(MEDIA_ACCEL="nginx")
+    def test_nginx_offload(self):
+        response = self.api.get(self.url)
+        self.assertEqual(response["X-Accel-Redirect"], f"/protected-media/{self.name}")
+        self.assertEqual(response.content, b"")
+
+    def test_permissions(self):
+        self.api.force_authenticate(make_user())
+        self.assertEqual(self.api.get(self.url).status_code, 403)
+
+        self.api.force_authenticate(make_user("manager"))
+        self.assertEqual(self.api.get(self.url).status_code, 200)
+
+        self.api.force_authenticate(None)
+        self.assertEqual(self.api.get(self.url).status_code, 401)
+
+
+class ContentAddressedStorageTests(MediaRootTestMixin, TestCase):
+    def details_for(self, client):
+        return EmployeeClientDetails.objects.create(client=client, reference_number_1="1", reference_number_2="2")
+
+    def blob_files(self):
+        blobs = os.path.join(self.media_root, "documents", "blobs")
+        return [name for _, _, files in os.walk(blobs) for name in files]
+
+    def test_identical_uploads_share_one_blob(self):
+        first, second = self.details_for(make_client()), self.details_for(make_client())
+        content = image_upload().read()
+        first.pan_card.save("a.jpg", ContentFile(content))
+        second.aadhaar_front.save("b.jpg", ContentFile(content))
+
+        self.assertEqual(first.pan_card.name, second.aadhaar_front.name)
+        self.assertEqual(len(self.blob_files()), 1)
+        self.assertEqual(DocumentReference.objects.filter(name=first.pan_card.name).count(), 2)
+
+    def test_gc_removes_only_unreferenced_blobs(self):
+        details = self.details_for(make_client())
+        details.pan_card.save("old.jpg", image_upload(size=(10, 10)))
+        old_name = details.pan_card.name
+        details.pan_card.save("new.jpg", image_upload(size=(20, 20)))
+
+        call_command("gc_documents", grace_hours=0, stdout=StringIO())
+
+        self.assertFalse(default_storage.exists(old_name))
+        self.assertTrue(default_storage.exists(details.pan_card.name))
+        self.assertEqual(len(self.blob_files()), 1)
+
+    def test_reuploading_an_orphan_restarts_its_grace_period(self):
+        storage = document_storage()
+        content = image_upload().read()
+        name = storage.save("a.jpg", ContentFile(content))
+        os.utime(storage.path(name), (0, 0))  # An old blob nothing references any more
+
+        self.assertEqual(storage.save("b.jpg", ContentFile(content)), name)  # Reference not committed yet
+        call_command("gc_documents", grace_hours=1, stdout=StringIO())
+
+        self.assertTrue(storage.exists(name))
+
+    def test_gc_rechecks_references_before_unlinking(self):
+        details = self.details_for(make_client())
+        details.pan_card.save("a.jpg", image_upload())
+        os.utime(details.pan_card.path, (0, 0))
+
+        # The batch lookup ran before the upload's reference committed
+        with patch.object(GcDocumentsCommand, "referenced", return_value=set()):
+            call_command("gc_documents", grace_hours=1, stdout=StringIO())
+
+        self.assertTrue(default_storage.exists(details.pan_card.name))
@@ -0,0 +1,95 @@
+import hashlib
+from io import BytesIO
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, ImageOps, features
+
+from .storage import blob_digest
+
+DERIVATIVE_SIZES = getattr(settings, "DOCUMENT_DERIVATIVE_SIZES", {"thumbnail": 200, "preview": 1024})
+DERIVATIVE_ROOT = "derivatives"
+
+
+def derivative_format():
+    """WebP when Pillow was built with it, JPEG otherwise."""
+    return ("WEBP", "webp", "image/webp") if features.check("webp") else ("JPEG", "jpg", "image/jpeg")
+
+
+def file_digest(storage, name):
+    """SHA-256 of a stored file, cached by file name so each upload is hashed once."""
+    digest = blob_digest(name)
+    if digest:
+        return digest  # Content-addressed names already carry it
+    key = f"doc-digest:{name}"
+    digest = cache.get(key)
+    if digest is None:
+        sha = hashlib.sha256()
+        with storage.open(name, "rb") as source:
+            for chunk in iter(lambda: source.read(64 * 1024), b""):
+                sha.update(chunk)
+        digest = sha.hexdigest()
+        cache.set(key, digest, None)
+    return digest
+
+
+def document_version(name):
+    """
+    Short tag that changes whenever the document at `name` is replaced: the content
+    digest for blobs, a hash of the name for legacy uploads (replacements get new names).
+    """
+    return (blob_digest(name) or hashlib.sha256(name.encode()).hexdigest())[:16]
+
+
+def derivative_cache_control(request, name):
+    """
+    Derivative URLs carry ?v=document_version(); a request for the current
+    version can be cached for good, anything else must revalidate its ETag.
+    """
+    if request.GET.get("v") == document_version(name):
+        return "private, max-age=31536000, immutable"
+    return "private, no-cache"
+
+
+def derivative_name(digest, size):
+    _, extension, _ = derivative_format()
+    return f"{DERIVATIVE_ROOT}/{digest[:2]}/{digest}_{size}.{extension}"
+
+
+def ensure_derivative(fieldfile, size):
+    """Returns the storage name of a resized copy of `fieldfile`, generating it on first request."""
+    if size not in DERIVATIVE_SIZES:
+        raise ValueError(f"Unknown derivative size: {size}")
+
+    name = derivative_name(file_digest(fieldfile.storage, fieldfile.name), size)
+    if default_storage.exists(name):
+        return name
+
+    pil_format, _, _ = derivative_format()
+    with fieldfile.storage.open(fieldfile.name, "rb") as source, Image.open(source) as image:
+        image = ImageOps.exif_transpose(image)
+        if image.mode not in ("RGB", "L"):
+            image = image.convert("RGB")
+        image.thumbnail((DERIVATIVE_SIZES[size], DERIVATIVE_SIZES[size]))
+        output = BytesIO()
+        image.save(output, pil_format, quality=80)
+
+    saved = default_storage.save(name, ContentFile(output.getvalue()))
+    if saved != name:  # Lost a race with another request generating the same derivative
+        default_storage.delete(saved)
+    return name
+
+
+def delete_derivatives(name, storage=None):
+    """Removes every cached derivative of the document stored at `name`."""
+    storage = storage or default_storage
+    if cache.get(f"doc-digest:{name}") is None and not storage.exists(name):
+        return
+    digest = file_digest(storage, name)
+    for size in DERIVATIVE_SIZES:
+        derivative = derivative_name(digest, size)
+        if default_storage.exists(derivative):
+            default_storage.delete(derivative)
+    cache.delete(f"doc-digest:{name}")
@@ -1,17 +1,19 @@
-from django.urls import path
+from django.urls import path, re_path
 from .views import (
     ClientListCreateView, EmployeeClientUpdateView, ManagerClientUpdateView,
     EmployeeClientDetailsUpdateView,ClientApplicationView,UploadClientDocumentsView,
-    GetClientDocumentsView,AttendanceListCreateView,MonthlyTargetView,EmployeeListView,
+    GetClientDocumentsView,ClientDocumentDerivativeView,AttendanceListCreateView,MonthlyTargetView,EmployeeListView,
     EmployeeClientListView,EmployeeTargetView,EmployeePerformanceView,
 )
-from .views import RegisterEmployeeView, LoginEmployeeView, ClientRetrieveView,ManagerPerformanceView
+from .views import RegisterEmployeeView, LoginEmployeeView, ClientRetrieveView,ManagerPerformanceView,ExportView,ClientImportView,AttendanceSummaryView,ClientSearchView
  
 
 
 
 urlpatterns = [
     path('clients/', ClientListCreateView.as_view(), name='client-list-create'),
+    path('clients/import/', ClientImportView.as_view(), name='client-import'),
+    path('clients/search/', ClientSearchView.as_view(), name='client-search'),
     path('clients/<int:pk>/', ClientRetrieveView.as_view(), name='client-retrieve'),
 
     path('clients/<int:pk>/update/', EmployeeClientUpdateView.as_view(), name='employee-client-update'),
@@ -24,11 +26,14 @@ urlpatterns = [
     path("client/apply/", ClientApplicationView.as_view(), name="client-apply"),
     path('upload-documents/<int:client_id>/', UploadClientDocumentsView.as_view(), name='upload-documents'),
     path('client-documents/<int:client_id>/', GetClientDocumentsView.as_view(), name='client-documents'),
+    path('client-documents/<int:client_id>/<str:field_name>/<str:size>/', ClientDocumentDerivativeView.as_view(), name='client-document-derivative'),
     path('attendance/', AttendanceListCreateView.as_view(), name='attendance-list'),
+    path('attendance/summary/', AttendanceSummaryView.as_view(), name='attendance-summary'),
     # path('manage/target/', MonthlyTargetView.as_view(), name='manage-target'),
     path("manage/employees/", EmployeeListView.as_view(), name="manage-employees"),
     path("manage/employees/<int:employee_id>/clients/", EmployeeClientListView.as_view(), name="employee-clients"),
      path("targets/", MonthlyTargetView.as_view(), name="set-target"),
     path("targets/my-performance/", EmployeePerformanceView.as_view(), name="employee-performance"),
     path("targets/performance/", ManagerPerformanceView.as_view(), name="manager-employee-performance"),
+    re_path(r"^manage/exports/(?P<dataset>clients|targets|attendance)\.(?P<file_type>csv|xlsx)$", ExportView.as_view(), name="export"),
 ]
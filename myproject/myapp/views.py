@@ -1,13 +1,19 @@
 from django.shortcuts import render
+from django.core.files.storage import default_storage
+import posixpath
+import re
 from rest_framework.permissions import BasePermission
 # Create your views here.
 from rest_framework import generics, permissions
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework.parsers import MultiPartParser, FormParser
-from rest_framework_simplejwt.authentication import JWTAuthentication
-from .models import Client, EmployeeClientDetails
-from .serializers import ClientSerializer, EmployeeClientDetailsSerializer
+from .authentication import ClaimsJWTAuthentication, add_user_claims
+from .models import Client, DocumentReference, EmployeeClientDetails
+from .serializers import ClientSerializer, ClientSummarySerializer, EmployeeClientDetailsSerializer
+from .pagination import AttendanceCursorPagination, ClientCursorPagination, SearchPagination
+from .optimizers import OptimizedQuerysetMixin
+from .fastserializers import FastListMixin
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
@@ -18,15 +24,46 @@ from .serializers import UserRegisterSerializer, UserLoginSerializer, UserSerial
 import random
 from .serializers import EmployeeClientDetailsSerializer, AttendanceSerializer,MonthlyTargetSerializer,EmployeeSerializer
 from django.core.exceptions import ObjectDoesNotExist
-from django.db.models import Count
+from django.db import IntegrityError, transaction
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.exceptions import ValidationError 
 from datetime import date, datetime, time,timedelta
 from rest_framework.exceptions import PermissionDenied, NotFound
+from .assignment import pick_employee
+from .attendance import attendance_summary, is_past_cutoff
+from .documents import DOCUMENT_FIELDS, can_view_client_documents, enqueue_uploads, stage_uploads
+from .media import serve_file
+from .storage import BLOB_PREFIX
+from .thumbnails import DERIVATIVE_SIZES, derivative_cache_control, derivative_format, ensure_derivative
+from .profiling import query_budget
+from .caching import cached_dashboard
+from .exports import CONTENT_TYPES, DATASETS, WRITERS
+from .imports import ImportReport, check_encoding, detect_file_type, import_clients, read_rows
+from .search import search_clients
+from .duplicates import find_duplicates
+from django.http import StreamingHttpResponse
+from .performance import approved_counts, employee_dashboard, employee_dashboard_reads, performance_rows, recent_months, targets_by_employee
+
+CLIENT_DOCUMENT_PATH = re.compile(r"^documents/client_(\d+)/")
+
+
+def parse_date_params(params, names=("date_from", "date_to")):
+    """Reads optional YYYY-MM-DD query parameters; raises ValidationError listing the bad ones."""
+    dates, errors = {}, {}
+    for name in names:
+        value = params.get(name)
+        try:
+            dates[name] = date.fromisoformat(value) if value else None
+        except ValueError:
+            errors[name] = "Use the YYYY-MM-DD format."
+    if errors:
+        raise ValidationError(errors)
+    return dates
+
 
 # ✅ Generate JWT Token
 def get_tokens_for_user(user):
-    refresh = RefreshToken.for_user(user)
+    refresh = add_user_claims(RefreshToken.for_user(user), user)  # role/is_active etc. for ClaimsJWTAuthentication
     return {
         "refresh": str(refresh),
         "access": str(refresh.access_token),
@@ -34,6 +71,7 @@ def get_tokens_for_user(user):
 
 
 # ✅ Employee & Manager Registration API
+@query_budget(10)
 class RegisterEmployeeView(APIView):
     def post(self, request):
         serializer = UserRegisterSerializer(data=request.data)
@@ -48,6 +86,7 @@ class RegisterEmployeeView(APIView):
 
 
 # ✅ Employee & Manager Login API
+@query_budget(3)
 class LoginEmployeeView(APIView):
     def post(self, request):
         serializer = UserLoginSerializer(data=request.data)
@@ -92,26 +131,70 @@ class IsManager(BasePermission):
         return request.user.is_authenticated and request.user.role == 'manager'
 
 # ✅ Create & View Clients (Employees & Managers)
-class ClientListCreateView(generics.ListCreateAPIView):
+@query_budget(12)
+class ClientListCreateView(FastListMixin, OptimizedQuerysetMixin, generics.ListCreateAPIView):
+    """
+    Lists clients with cursor pagination. `?fields=summary` returns the slim
+    summary serializer, `?fields=id,name,...` returns only the listed fields.
+    """
     serializer_class = ClientSerializer
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [ClaimsJWTAuthentication]
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = ClientCursorPagination
 
     def get_queryset(self):
         """Filter clients based on user role"""
         user = self.request.user
         
         if user.role == 'employee':  
-            return Client.objects.filter(assigned_employee=user)  # Only assigned clients
-        return Client.objects.all()  # Managers can view all clients
+            queryset = Client.objects.filter(assigned_employee=user)  # Only assigned clients
+        else:
+            queryset = Client.objects.all()  # Managers can view all clients
+
+        fields = self.get_projected_fields()
+        if fields is not None:
+            # Cursor pagination always needs its ordering columns
+            queryset = queryset.only(*(set(fields) | {"id", "created_at"}))
+        return queryset
+
+    def get_projected_fields(self):
+        """Returns the model fields requested through `?fields=`, or None for the full payload."""
+        if self.request.method != "GET":
+            return None
+
+        requested = self.request.query_params.get("fields")
+        if not requested:
+            return None
+        if requested == "summary":
+            return list(ClientSummarySerializer.Meta.fields)
+
+        fields = [name.strip() for name in requested.split(",") if name.strip()]
+        available = {field.name for field in Client._meta.concrete_fields}
+        unknown = [name for name in fields if name not in available]
+        if unknown:
+            raise ValidationError({"fields": f"Unknown fields: {', '.join(unknown)}"})
+        return fields
+
+    def get_serializer(self, *args, **kwargs):
+        fields = self.get_projected_fields()
+        if fields is None:
+            return super().get_serializer(*args, **kwargs)
+        if self.request.query_params.get("fields") == "summary":
+            kwargs.setdefault("context", self.get_serializer_context())
+            return ClientSummarySerializer(*args, **kwargs)
+        return super().get_serializer(*args, fields=fields, **kwargs)
 
     def perform_create(self, serializer):
         """Assign an employee dynamically in API View"""
         client_type = serializer.validated_data.get('client_type', 'direct')  # Default to direct
 
         if client_type == 'direct':
-            # 🚀 TODO: Add logic to assign an available employee automatically (if required)
-            serializer.save()
+            if serializer.validated_data.get('assigned_employee') is not None:
+                serializer.save()  # Keep the employee a manager chose explicitly
+                return
+            # ✅ Auto-assign through the workload counters; the row lock is held until the save commits
+            with transaction.atomic():
+                serializer.save(assigned_employee=pick_employee())
         else:
             if self.request.user.role == 'employee':  # Ensure only employees are assigned
                 serializer.save(assigned_employee=self.request.user)
@@ -121,9 +204,10 @@ class ClientListCreateView(generics.ListCreateAPIView):
 # ✅ Employee: View & Update Only Their Clients
 
 
+@query_budget(14)
 class EmployeeClientUpdateView(generics.RetrieveUpdateAPIView):
     serializer_class = ClientSerializer
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [ClaimsJWTAuthentication]
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
@@ -136,22 +220,25 @@ class EmployeeClientUpdateView(generics.RetrieveUpdateAPIView):
  
      # Employee can update only assigned clients
 # ✅ Manager: View & Update Any Client
+@query_budget(14)
 class ManagerClientUpdateView(generics.RetrieveUpdateAPIView):
     queryset = Client.objects.all()
     serializer_class = ClientSerializer
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [ClaimsJWTAuthentication]
     permission_classes = [IsManager]
 
 # ✅ Employee & Manager: Update Employee Client Details (CIBIL, Aadhaar, PAN, etc.)
+@query_budget(8)
 class EmployeeClientDetailsUpdateView(generics.RetrieveUpdateAPIView):
     queryset = EmployeeClientDetails.objects.all()
     serializer_class = EmployeeClientDetailsSerializer
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [ClaimsJWTAuthentication]
     permission_classes = [permissions.IsAuthenticated]  # Both Employees & Managers can update
 
 
  
-class ClientRetrieveView(generics.RetrieveAPIView):
+@query_budget(3)
+class ClientRetrieveView(OptimizedQuerysetMixin, generics.RetrieveAPIView):
     queryset = Client.objects.all()
     serializer_class = ClientSerializer
     permission_classes = [IsAuthenticated]  # Ensure user is authenticated
@@ -165,6 +252,7 @@ class ClientRetrieveView(generics.RetrieveAPIView):
         return Client.objects.none()
   
  
+@query_budget(14)
 class ClientApplicationView(APIView):
     permission_classes = [permissions.AllowAny]  # No authentication required
 
@@ -203,13 +291,18 @@ class ClientApplicationView(APIView):
                     {"error": "Invalid assigned employee ID"},
                     status=status.HTTP_400_BAD_REQUEST
                 )
-            client_type = "employee_client"
+            client_type = "employee_registered"
         else:
-            # Auto-assign employee using round-robin method
-            employees = User.objects.filter(role="employee").annotate(client_count=Count("clients")).order_by("client_count")
-            assigned_employee = employees.first() if employees.exists() else None
+            # Auto-assigned below, once the data is known to be valid
+            assigned_employee = None
             client_type = "direct"
 
+        # ✅ Repeat applicants: any submitted number already on file (one indexed query).
+        # Stored on the client for staff; never echoed to anonymous callers, since
+        # this endpoint is public and would let anyone probe for clients and references.
+        duplicates = find_duplicates(request.data)
+        staff = request.user.is_authenticated
+
         # ✅ Prepare data for serializer
         data = request.data.copy()
         data["client_type"] = client_type
@@ -218,25 +311,35 @@ class ClientApplicationView(APIView):
         # ✅ Validate and save the data
         serializer = ClientSerializer(data=data)
         if serializer.is_valid():
-            serializer.save(assigned_employee=assigned_employee)
-            return Response(
-                {
-                    "message": "Client application submitted successfully",
-                    "client": serializer.data,
-                    "assigned_employee": assigned_employee.email if assigned_employee else "Not assigned yet"
-                },
-                status=status.HTTP_201_CREATED
-            )
+            with transaction.atomic():
+                if client_type == "direct":
+                    # Least-loaded or round-robin pick (CLIENT_ASSIGNMENT_STRATEGY), locked until commit
+                    assigned_employee = pick_employee()
+                serializer.save(assigned_employee=assigned_employee, possible_duplicates=duplicates)
+            client = serializer.data
+            body = {
+                "message": "Client application submitted successfully",
+                "client": client,
+                "assigned_employee": assigned_employee.email if assigned_employee else "Not assigned yet",
+            }
+            if staff:
+                body["possible_duplicates"] = duplicates
+            else:
+                client.pop("possible_duplicates")
+            return Response(body, status=status.HTTP_201_CREATED)
 
         # ✅ Log and return exact serializer errors
         print("Serializer Errors:", serializer.errors)
-        return Response({"error": serializer.errors}, status=status.HTTP_400_BAD_REQUEST)
+        body = {"error": serializer.errors}
+        if staff:
+            body["possible_duplicates"] = duplicates
+        return Response(body, status=status.HTTP_400_BAD_REQUEST)
 
 class SendApprovalRequestView(APIView):
     """
     Employee sends client details to Manager (MD) for loan approval.
     """
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [ClaimsJWTAuthentication]
     permission_classes = [IsEmployee]  # Only employees can send requests
 
     def post(self, request, client_id):
@@ -295,38 +398,43 @@ class SendApprovalRequestView(APIView):
             return Response({"error": "Client not found or not assigned to you."}, status=status.HTTP_404_NOT_FOUND)
 
 
+@query_budget(12)  # Includes inline processing when DOCUMENT_PIPELINE_EAGER is on
 class UploadClientDocumentsView(APIView):
     parser_classes = [MultiPartParser, FormParser]
     permission_classes = [IsAuthenticated]
 
     def patch(self, request, client_id):
-        print("🔴 DEBUG: Received FILES -->", request.FILES)
-
+        """Stages the uploaded files and returns right away; a background worker finalizes them."""
         try:
             client = Client.objects.get(id=client_id)
         except Client.DoesNotExist:
             return Response({"error": "Client not found"}, status=status.HTTP_404_NOT_FOUND)
 
-        extra_details, created = EmployeeClientDetails.objects.get_or_create(client=client)
+        unknown_fields = sorted(set(request.FILES) - set(DOCUMENT_FIELDS))
+        if unknown_fields:
+            return Response({"error": f"Unknown document fields: {', '.join(unknown_fields)}"},
+                            status=status.HTTP_400_BAD_REQUEST)
 
-        # ✅ Manually assign each file field before saving
-        for field_name, file in request.FILES.items():
-            print(f"🟡 Saving {field_name}: {file.name}")  # Debugging line
-            setattr(extra_details, field_name, file)
+        extra_details, created = EmployeeClientDetails.objects.get_or_create(client=client)
 
-        extra_details.save()  # ✅ Manually save after assigning files
+        if request.FILES:
+            # ✅ Stream to staging, mark as queued, finalize in the document worker pool
+            batch_dir, staged = stage_uploads(client.id, request.FILES)
+            EmployeeClientDetails.objects.filter(pk=extra_details.pk).update(processing_status="queued", processing_error="")
+            enqueue_uploads(extra_details.pk, batch_dir, staged)
+            extra_details.refresh_from_db()
 
         serializer = EmployeeClientDetailsSerializer(extra_details)
 
         return Response({
-            "message": "Documents uploaded successfully",
+            "message": "Documents received and queued for processing",
             "data": serializer.data
-        }, status=200)
-
+        }, status=status.HTTP_202_ACCEPTED)
 
 
 
 
+@query_budget(3)
 class GetClientDocumentsView(APIView):
     # authentication_classes = [TokenAuthentication]
     permission_classes = [IsAuthenticated]
@@ -340,41 +448,117 @@ class GetClientDocumentsView(APIView):
             return Response({"error": "No documents found"}, status=404)
         
 
+@query_budget(3)
+class ClientDocumentDerivativeView(APIView):
+    """Serves a thumbnail or preview of one client document, generating it on first request."""
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, client_id, field_name, size):
+        if field_name not in DOCUMENT_FIELDS or size not in DERIVATIVE_SIZES:
+            raise NotFound("Unknown document or size.")
+
+        details = EmployeeClientDetails.objects.select_related("client").filter(client_id=client_id).first()
+        if details is None:
+            raise NotFound("No documents found")
+        if not can_view_client_documents(request.user, details.client):
+            raise PermissionDenied("You cannot view this client's documents.")
+
+        document = getattr(details, field_name)
+        if not document:
+            raise NotFound("Document not uploaded.")
+
+        name = ensure_derivative(document, size)
+        _, _, content_type = derivative_format()
+        return serve_file(request, name, content_type=content_type,
+                          cache_control=derivative_cache_control(request, document.name))
+
+
+@query_budget(3)
+class MediaFileView(APIView):
+    """
+    Serves MEDIA_URL with client-level permission checks: document blobs and legacy
+    documents/client_<id>/... files are visible to managers and the assigned
+    employee, anything else to managers only.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, path):
+        name = posixpath.normpath(path).lstrip("/")
+        if name.startswith("..") or name.startswith("staging/") or not default_storage.exists(name):
+            raise NotFound("File not found.")
+
+        match = CLIENT_DOCUMENT_PATH.match(name)
+        if name.startswith(BLOB_PREFIX + "/"):
+            # Shared blobs: visible if any client referencing it is visible
+            if request.user.role != "manager" and not DocumentReference.objects.filter(
+                name=name, details__client__assigned_employee_id=request.user.pk
+            ).exists():
+                raise PermissionDenied("You cannot view this client's documents.")
+        elif match:
+            client = Client.objects.filter(pk=match.group(1)).only("assigned_employee").first()
+            if client is None or not can_view_client_documents(request.user, client):
+                raise PermissionDenied("You cannot view this client's documents.")
+        elif request.user.role != "manager":
+            raise PermissionDenied("You cannot view this file.")
+
+        return serve_file(request, name)
+
+
 # sriram attdendancde code
  
 
  
 
 
-class AttendanceListCreateView(generics.ListCreateAPIView):
+@query_budget(5)
+class AttendanceListCreateView(FastListMixin, OptimizedQuerysetMixin, generics.ListCreateAPIView):
+    """
+    Attendance records, newest first, in cursor-paginated pages.
+    Filters: ?date_from=YYYY-MM-DD&date_to=YYYY-MM-DD&status=Present|Absent, and ?employee=<id> for managers.
+    """
     queryset = Attendance.objects.all()
     serializer_class = AttendanceSerializer
     permission_classes = [permissions.IsAuthenticated]
-
+    pagination_class = AttendanceCursorPagination
 
     def get_queryset(self):
         user = self.request.user
         if user.role == 'manager':
-            return Attendance.objects.all()  # Manager can see all records
-        return Attendance.objects.filter(user=user)  # Employee sees only their own records
+            queryset = Attendance.objects.all()  # Manager can see all records
+            employee = self.request.query_params.get("employee")
+            if employee:
+                if not employee.isdigit():
+                    raise ValidationError({"employee": "Must be an employee id."})
+                queryset = queryset.filter(user_id=employee)
+        else:
+            queryset = Attendance.objects.filter(user=user)  # Employee sees only their own records
+
+        dates = parse_date_params(self.request.query_params)
+        if dates["date_from"]:
+            queryset = queryset.filter(date__gte=dates["date_from"])
+        if dates["date_to"]:
+            queryset = queryset.filter(date__lte=dates["date_to"])
+        if self.request.query_params.get("status"):
+            queryset = queryset.filter(status=self.request.query_params["status"])
+        return queryset
 
     def perform_create(self, serializer):
         user = self.request.user
         today = date.today()
-        now = datetime.now().time()  # Get current time
-        cutoff_time = time(11, 0)  # 11:00 AM cutoff
-
-        # Check if attendance for today already exists
-        if Attendance.objects.filter(user=user, date=today).exists():
-            raise ValidationError("You have already marked attendance for today.")
 
-        # If the current time is past 11:00 AM, mark as "Absent" automatically
-        status_value = "Absent" if now > cutoff_time else serializer.validated_data.get("status", "Present")
+        # If the current time is past the cutoff (11:00 AM), mark as "Absent" automatically
+        status_value = "Absent" if is_past_cutoff() else serializer.validated_data.get("status", "Present")
 
-        serializer.save(user=user, date=today, status=status_value)  # Save attendance with appropriate status
+        # ✅ The (user, date) unique constraint rejects a second record, even from concurrent posts
+        try:
+            with transaction.atomic():
+                serializer.save(user=user, date=today, status=status_value)  # Save attendance with appropriate status
+        except IntegrityError:
+            raise ValidationError("You have already marked attendance for today.")
 
 
-class MonthlyTargetView(generics.ListCreateAPIView):
+@query_budget(12)
+class MonthlyTargetView(OptimizedQuerysetMixin, generics.ListCreateAPIView):
     queryset = MonthlyTarget.objects.all()
     serializer_class = MonthlyTargetSerializer
     permission_classes = [permissions.IsAuthenticated]
@@ -384,37 +568,9 @@ class MonthlyTargetView(generics.ListCreateAPIView):
         if user.role != "manager":
             raise ValidationError("Only managers can set targets.")
 
-        data = self.request.data
-        month, year = date.today().month, date.today().year  # ✅ Get default month and year
-
-        if "user" in data and data["user"]:  
-            # ✅ Set target for a specific employee
-            try:
-                employee = User.objects.get(id=data["user"], role="employee")
-            except User.DoesNotExist:
-                raise ValidationError("Invalid employee ID.")
-
-            target, created = MonthlyTarget.objects.update_or_create(
-                user=employee, month=month, year=year,
-                defaults={"target_clients": data["target_clients"]}
-            )
-
-            return Response({"message": f"Target {'updated' if not created else 'set'} for {employee.username}"})
-
-        else:
-            # ✅ Set target for all employees
-            employees = User.objects.filter(role="employee")
-            if not employees:
-                return Response({"message": "No employees found."}, status=400)
-
-            for emp in employees:
-                MonthlyTarget.objects.update_or_create(
-                    user=emp, month=month, year=year,
-                    defaults={"target_clients": data["target_clients"]}
-                )
+        # ✅ One employee or all employees, both through MonthlyTarget.objects.bulk_set_targets
+        serializer.save()
 
-            return Response({"message": "Targets updated for all employees"})
-        
 class UpdateMonthlyTargetView(APIView):
     """Allow managers to update an existing employee's target."""
     permission_classes = [permissions.IsAuthenticated]
@@ -437,7 +593,7 @@ class UpdateMonthlyTargetView(APIView):
         else:
             return Response({"error": "target_clients field is required"}, status=400)
       
-class EmployeeTargetView(generics.ListAPIView):
+class EmployeeTargetView(OptimizedQuerysetMixin, generics.ListAPIView):
     """
     API for employees to view their current target & performance history.
     """
@@ -460,6 +616,8 @@ class EmployeeTargetView(generics.ListAPIView):
         ).order_by("-year", "-month")  # Show latest first
 
 
+@query_budget(7)
+@cached_dashboard(scope="user")
 class EmployeePerformanceView(APIView):
     """Get employee performance, attendance, and target history."""
     permission_classes = [IsAuthenticated]
@@ -467,69 +625,19 @@ class EmployeePerformanceView(APIView):
     def get(self, request, *args, **kwargs):
         user = request.user  # Logged-in employee
         today = date.today()
-        current_month, current_year = today.month, today.year
-
-        # Serialize user details
-        user_data = UserSerializer(user).data  
-
-        # Get current month's target
-        current_target = MonthlyTarget.objects.filter(
-            user=user, month=current_month, year=current_year
-        ).first()
-
-        # Get last 4 months' target history (excluding current month)
-        four_months_ago = today.replace(day=1) - timedelta(days=1)
-        four_months_ago = four_months_ago.replace(day=1)
-
-        past_targets = MonthlyTarget.objects.filter(
-            user=user,
-            year__gte=four_months_ago.year,
-            month__gte=four_months_ago.month
-        ).exclude(month=current_month, year=current_year).order_by("-year", "-month")[:4]
-
-        # Get last 10 days' attendance
-        ten_days_ago = today - timedelta(days=10)
-        attendance_records = Attendance.objects.filter(
-            user=user,
-            date__gte=ten_days_ago
-        ).values("date", "status")  
-
-        # Count approved clients
-        approved_clients = Client.objects.filter(
-            assigned_employee=user,
-            approval_status="approved"
-        ).count()
-
-        # Completion percentage helper
-        def calculate_completion(target):
-            if target and target.target_clients > 0:
-                return f"{(target.approved_clients / target.target_clients) * 100:.2f}%"
-            return "0%"
-
-        # Response format
-        response_data = {
-            "employee": user_data,  # Full employee details
-            "attendance_last_10_days": list(attendance_records),
-            "current_month": {
-                "month": current_month,
-                "year": current_year,
-                "target_clients": current_target.target_clients if current_target else 0,
-                "approved_clients": approved_clients,
-                "completion": calculate_completion(current_target)
-            },
-            "last_4_months": [
-                {
-                    "month": target.month,
-                    "year": target.year,
-                    "target_clients": target.target_clients,
-                    "approved_clients": target.approved_clients,
-                    "completion": calculate_completion(target)
-                } for target in past_targets
-            ]
-        }
-
-        return Response(response_data)
-
+        reads = employee_dashboard_reads(user.id, today)
+
+        return Response(employee_dashboard(
+            UserSerializer(user).data,  # Full employee details
+            today,
+            current_target=reads["current_target"].first(),
+            past_targets=reads["past_targets"],
+            attendance=reads["attendance"],
+            approved_clients=reads["approved_clients"].first(),
+        ))
+
+@query_budget(6)
+@cached_dashboard(scope="role")
 class ManagerPerformanceView(generics.ListAPIView):
     """
     Managers can view performance of all employees or a specific employee.
@@ -542,8 +650,7 @@ class ManagerPerformanceView(generics.ListAPIView):
             raise PermissionDenied("Only managers can view performance data.")
 
         employee_id = request.query_params.get("employee_id")
-        today = date.today()
-        last_five_months = [(today.month - i, today.year) for i in range(5)]
+        last_five_months = recent_months(date.today())
 
         if employee_id:
             return self.get_specific_employee_performance(employee_id, last_five_months)
@@ -555,62 +662,36 @@ class ManagerPerformanceView(generics.ListAPIView):
         except User.DoesNotExist:
             raise NotFound("Employee not found.")
 
-        performance_data = self.get_employee_performance(employee, last_five_months)
+        targets = targets_by_employee(last_five_months, employee_ids=[employee.id])
+        counts = approved_counts(last_five_months, employee_ids=[employee.id])
 
         return Response({
             "employee_id": employee.id,
             "employee": employee.username,
-            "performance": performance_data
+            "performance": performance_rows(targets.get(employee.id, []), counts)
         })
 
     def get_all_employees_performance(self, last_five_months):
-        employees = User.objects.filter(role="employee")
+        """Builds every employee's performance from three queries, regardless of headcount."""
+        employees = User.objects.filter(role="employee").only("id", "username")
+        targets = targets_by_employee(last_five_months)
+        counts = approved_counts(last_five_months)
+
         performance_data = [
             {
                 "employee_id": employee.id,
                 "employee": employee.username,
-                "performance": self.get_employee_performance(employee, last_five_months)
+                "performance": performance_rows(targets.get(employee.id, []), counts)
             }
             for employee in employees
         ]
 
         return Response(performance_data)
 
-    def get_employee_performance(self, employee, last_five_months):
-        """Fetches performance data for a single employee over the last five months."""
-        targets = MonthlyTarget.objects.filter(
-            user=employee,
-            month__in=[m[0] for m in last_five_months],
-            year__in=[m[1] for m in last_five_months]
-        )
-
-        return [
-            {
-                "month": target.month,
-                "year": target.year,
-                "target_clients": target.target_clients,
-                "approved_clients": self.get_approved_clients(employee, target.month, target.year),
-                "completion": self.calculate_completion(target.target_clients, employee, target.month, target.year)
-            }
-            for target in targets
-        ]
-
-    def get_approved_clients(self, employee, month, year):
-        """Returns the count of approved clients for a given employee and time period."""
-        return Client.objects.filter(
-            assigned_employee=employee,
-            approval_status="approved",
-            created_at__month=month,
-            created_at__year=year
-        ).count()
-
-    def calculate_completion(self, target_clients, employee, month, year):
-        """Calculates the completion percentage."""
-        approved_count = self.get_approved_clients(employee, month, year)
-        return f"{(approved_count / target_clients * 100) if target_clients else 0:.2f}%"
-
     
-class EmployeeListView(generics.ListAPIView):
+@query_budget(3)
+@cached_dashboard(scope="role")
+class EmployeeListView(OptimizedQuerysetMixin, generics.ListAPIView):
     serializer_class = EmployeeSerializer
     permission_classes = [permissions.IsAuthenticated]
 
@@ -621,7 +702,8 @@ class EmployeeListView(generics.ListAPIView):
         return User.objects.none()  # Others see nothing
 
 
-class EmployeeClientListView(generics.ListAPIView):
+@query_budget(3)
+class EmployeeClientListView(FastListMixin, OptimizedQuerysetMixin, generics.ListAPIView):
     serializer_class = ClientSerializer
     permission_classes = [permissions.IsAuthenticated]
 
@@ -630,4 +712,138 @@ class EmployeeClientListView(generics.ListAPIView):
         if user.role == 'manager':
             employee_id = self.kwargs.get("employee_id")
             return Client.objects.filter(assigned_employee_id=employee_id)  # Filter clients by employee
-        return Client.objects.none()  # Others see nothing
\ No newline at end of file
+        return Client.objects.none()  # Others see nothing
+
+
+# ✅ Manager: streaming CSV/XLSX exports
+# The budget covers the request up to the response (auth, filter validation). The
+# keyset queries run later, as the server iterates the stream, after the profiler's
+# execute_wrapper has exited, so they are neither counted nor limited; exports.py
+# bounds them instead (one query per EXPORT_CHUNK_SIZE rows).
+@query_budget(2)
+class ExportView(APIView):
+    """
+    Streams clients, monthly targets or attendance as CSV or XLSX.
+    Filters: ?employee=<id>&status=<status>&date_from=YYYY-MM-DD&date_to=YYYY-MM-DD
+    Rows are read in keyset-paginated chunks while the response is sent, so memory
+    stays flat however large the export is.
+    """
+    permission_classes = [IsManager]
+
+    def perform_content_negotiation(self, request, force=False):
+        # The file type comes from the URL; never 406 on Accept: text/csv
+        return super().perform_content_negotiation(request, force=True)
+
+    def get(self, request, dataset, file_type):
+        filters = self.get_filters(request.query_params)
+        header, rows = DATASETS[dataset](**filters)
+
+        response = StreamingHttpResponse(WRITERS[file_type](header, rows), content_type=CONTENT_TYPES[file_type])
+        response["Content-Disposition"] = f'attachment; filename="{dataset}-{date.today().isoformat()}.{file_type}"'
+        response["Cache-Control"] = "no-store"
+        return response
+
+    def get_filters(self, params):
+        employee = params.get("employee")
+        if employee and not employee.isdigit():
+            raise ValidationError({"employee": "Must be an employee id."})
+        return {
+            "employee": int(employee) if employee else None,
+            "status": params.get("status") or None,
+            **parse_date_params(params),
+        }
+
+
+# ✅ Manager: ranked client search
+@query_budget(2)
+class ClientSearchView(APIView):
+    """
+    ?q= matches name, contact number, email, office name and reference numbers,
+    tolerating typos and partial words. Results are ranked best first (`score`)
+    and paginated with ?page=/?page_size=.
+    """
+    permission_classes = [IsManager]
+    pagination_class = SearchPagination
+
+    def get(self, request, *args, **kwargs):
+        query = request.query_params.get("q", "").strip()
+        if not query:
+            raise ValidationError({"q": "This parameter is required."})
+
+        paginator = self.pagination_class()
+        hits = paginator.paginate_queryset(search_clients(query), request, view=self)
+        clients = Client.objects.in_bulk([pk for pk, _ in hits])
+        results = []
+        for pk, score in hits:
+            if pk in clients:  # Deleted since it was indexed
+                results.append({**ClientSummarySerializer(clients[pk]).data, "score": score})
+        return paginator.get_paginated_response(results)
+
+
+# ✅ Manager: bulk client import (CSV or JSONL upload)
+@query_budget(None)  # A few queries per batch; grows with the file, not per row
+class ClientImportView(APIView):
+    """
+    POST a `file` (.csv with a header row of Client fields, or .jsonl with one
+    object per line). `?dry_run=1` validates only, `?assign=0` skips auto-assignment.
+    Responds with the number created and a per-row error report.
+    """
+    permission_classes = [IsManager]
+    parser_classes = [MultiPartParser, FormParser]
+
+    def post(self, request, *args, **kwargs):
+        upload = request.FILES.get("file")
+        if upload is None:
+            raise ValidationError({"file": "Upload a .csv or .jsonl file."})
+        file_type = detect_file_type(upload.name)
+        if file_type is None:
+            raise ValidationError({"file": "Only .csv and .jsonl files can be imported."})
+
+        encoding_error = check_encoding(upload)
+        if encoding_error:
+            report = ImportReport()
+            report.add_error(*encoding_error)
+            return Response(report.as_dict(), status=status.HTTP_400_BAD_REQUEST)
+
+        report = import_clients(
+            read_rows(upload, file_type),
+            assign=request.query_params.get("assign") != "0",
+            dry_run=request.query_params.get("dry_run") == "1",
+        )
+        return Response(report.as_dict(), status=status.HTTP_200_OK)
+
+
+# ✅ Attendance calendar: counts, day strings and streaks per employee
+@query_budget(2)
+@cached_dashboard(scope="user")
+class AttendanceSummaryView(APIView):
+    """
+    Per-employee attendance over ?date_from..?date_to (default: the last 30 days).
+    `days` has one character per day of the range: P (present), A (absent), - (no record).
+    Managers see every employee (or ?employee=<id>); employees see themselves.
+    """
+    permission_classes = [IsAuthenticated]
+    max_days = 366
+
+    def get(self, request, *args, **kwargs):
+        dates = parse_date_params(request.query_params)
+        date_to = dates["date_to"] or date.today()
+        date_from = dates["date_from"] or date_to - timedelta(days=29)
+        if date_from > date_to:
+            raise ValidationError({"date_from": "Must not be after date_to."})
+        if (date_to - date_from).days >= self.max_days:
+            raise ValidationError({"date_from": f"The range is limited to {self.max_days} days."})
+
+        if request.user.role == "manager":
+            employee = request.query_params.get("employee")
+            if employee and not employee.isdigit():
+                raise ValidationError({"employee": "Must be an employee id."})
+            employee_ids = [int(employee)] if employee else None
+        else:
+            employee_ids = [request.user.pk]
+
+        return Response({
+            "date_from": date_from,
+            "date_to": date_to,
+            "employees": attendance_summary(date_from, date_to, employee_ids=employee_ids),
+        })
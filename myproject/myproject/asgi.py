@@ -2,6 +2,15 @@
 ASGI config for myproject project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+Requests are routed through ASGI_URLCONF, which serves the dashboards and
+document endpoints from their async views (myapp.async_views). Run with an
+ASGI server, e.g.:
+
+    uvicorn myproject.asgi:application --workers 4 --lifespan off
+
+`manage.py bench_asgi` compares it with the WSGI path under concurrent polling.
+Leave DB_CONN_MAX_AGE at 0 here (async requests hop between threads, so
+persistent connections pile up); set DB_POOL=1 to reuse connections instead.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.1/howto/deployment/asgi/
@@ -9,8 +18,26 @@ https://docs.djangoproject.com/en/5.1/howto/deployment/asgi/
 
 import os
 
-from django.core.asgi import get_asgi_application
+import django
+from django.conf import settings
+from django.core.handlers.asgi import ASGIHandler
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'myproject.settings')
 
-application = get_asgi_application()
+
+class AsyncViewsASGIHandler(ASGIHandler):
+    """Routes every request through settings.ASGI_URLCONF."""
+
+    def create_request(self, scope, body_file):
+        request, error_response = super().create_request(scope, body_file)
+        if request is not None:
+            request.urlconf = settings.ASGI_URLCONF
+        return request, error_response
+
+
+def get_application():
+    django.setup(set_prefix=False)
+    return AsyncViewsASGIHandler()
+
+
+application = get_application()
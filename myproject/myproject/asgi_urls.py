@@ -0,0 +1,12 @@
+"""
+URLconf used by the ASGI application: the same routes as urls.py, with the
+read-heavy endpoints served by their async variants (myapp.async_views).
+"""
+from django.urls import include, path
+
+from .urls import urlpatterns as wsgi_urlpatterns
+
+urlpatterns = [
+    path("manage/", include("myapp.async_urls")),
+    *[pattern for pattern in wsgi_urlpatterns if str(pattern.pattern) != "manage/"],
+]
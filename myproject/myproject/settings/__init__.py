@@ -0,0 +1,19 @@
+"""
+Settings profiles. DJANGO_ENV picks one of dev (default), test or prod, each
+layered over base.py; `manage.py test` uses test unless DJANGO_ENV says otherwise.
+"""
+import os
+import sys
+
+from django.core.exceptions import ImproperlyConfigured
+
+ENVIRONMENT = os.environ.get("DJANGO_ENV") or ("test" if sys.argv[1:2] == ["test"] else "dev")
+
+if ENVIRONMENT == "prod":
+    from .prod import *  # noqa: F401,F403
+elif ENVIRONMENT == "test":
+    from .test import *  # noqa: F401,F403
+elif ENVIRONMENT == "dev":
+    from .dev import *  # noqa: F401,F403
+else:
+    raise ImproperlyConfigured(f"DJANGO_ENV must be dev, test or prod, not {ENVIRONMENT!r}.")
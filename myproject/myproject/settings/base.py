@@ -0,0 +1,290 @@
+"""
+Django settings for clientmanagement project: the defaults shared by every
+profile. myproject.settings layers dev.py, test.py or prod.py on top, picked
+by DJANGO_ENV; values that differ between deployments come from the environment.
+
+Generated by 'django-admin startproject' using Django 5.1.7.
+
+For more information on this file, see
+https://docs.djangoproject.com/en/5.1/topics/settings/
+
+For the full list of settings and their values, see
+https://docs.djangoproject.com/en/5.1/ref/settings/
+"""
+
+from pathlib import Path
+from datetime import timedelta
+import os
+
+MEDIA_URL = "/media/"
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+MEDIA_ROOT = os.path.join(BASE_DIR, "media")
+
+# Build paths inside the project like this: BASE_DIR / 'subdir'.
+
+ 
+ 
+# Quick-start development settings - unsuitable for production
+# See https://docs.djangoproject.com/en/5.1/howto/deployment/checklist/
+
+def env_bool(name, default):
+    return os.environ.get(name, str(default)).strip().lower() in ("1", "true", "yes", "on")
+
+
+def env_seconds(name, default):
+    """Seconds from the environment; "none" (or "persistent") means no limit."""
+    value = os.environ.get(name, str(default)).strip().lower()
+    return None if value in ("none", "persistent") else int(value)
+
+
+def env_list(name, default=""):
+    return [item.strip() for item in os.environ.get(name, default).split(",") if item.strip()]
+
+
+# SECURITY WARNING: keep the secret key used in production secret!
+# prod.py requires DJANGO_SECRET_KEY; this fallback is for dev and tests only.
+SECRET_KEY = os.environ.get(
+    "DJANGO_SECRET_KEY", 'django-insecure-is0^8rzysh@5b%71*-61hz6h=d6)m*zpdk$1256wsah$y0yofh'
+)
+
+# SECURITY WARNING: don't run with debug turned on in production!
+# Debug also keeps every query in connection.queries; dev.py turns it on.
+DEBUG = False
+
+ALLOWED_HOSTS = env_list("DJANGO_ALLOWED_HOSTS")
+
+
+# Application definition
+
+INSTALLED_APPS = [
+    'django.contrib.admin',
+    'django.contrib.auth',
+    'django.contrib.contenttypes',
+    'django.contrib.sessions',
+    'django.contrib.messages',
+    'django.contrib.staticfiles',
+    "rest_framework",
+    "rest_framework_simplejwt",
+    "corsheaders",
+    
+    "myapp",
+]
+AUTH_USER_MODEL = "myapp.User"
+
+# AUTH_USER_MODEL = "api.User"  # Replace "your_app" with your actual app name
+# AUTH_USER_MODEL = "api.CustomUser"
+REST_FRAMEWORK = {
+    "DEFAULT_AUTHENTICATION_CLASSES": (
+        "myapp.authentication.ClaimsJWTAuthentication",
+    ),
+    # "DEFAULT_PERMISSION_CLASSES": [
+    #     "rest_framework.permissions.IsAuthenticated",
+    # ],
+}
+SIMPLE_JWT = {
+    'ACCESS_TOKEN_LIFETIME': timedelta(days=1),  # or any expiration time you prefer
+    'REFRESH_TOKEN_LIFETIME': timedelta(days=5),    # or any expiration time you prefer
+    'ROTATE_REFRESH_TOKENS': False,
+    'BLACKLIST_AFTER_ROTATION': True,
+    'ALGORITHM': 'HS256',  # Ensure this matches the algorithm used when signing
+    'SIGNING_KEY': 'your-secret-key-here',  # This should be your secret key
+    'VERIFYING_KEY': None,  # You don't need this unless you're using public/private key pair
+    'AUTH_HEADER_TYPES': ('Bearer',),
+}
+# Strategy for auto-assigning direct clients: "least_loaded" or "round_robin"
+CLIENT_ASSIGNMENT_STRATEGY = "least_loaded"
+
+TESTING = False  # test.py
+
+# Per-request query/timing profiler (myapp.profiling). Views over their
+# @query_budget fail under the test runner and log a warning otherwise.
+QUERY_PROFILER_ENABLED = True
+QUERY_BUDGET_STRICT = False
+
+# Seconds ClaimsJWTAuthentication caches a user's active/role/password state
+AUTH_USER_STATE_TTL = 60
+
+# Local caches only (no Redis). "dashboard" holds the cached dashboard responses
+# (myapp.caching); it is file-based so every worker process on the host sees the
+# same key version and a signal-driven bump invalidates them all at once.
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "myapp-default",
+    },
+    "dashboard": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": os.path.join(BASE_DIR, "cache", "dashboard"),
+    },
+}
+DASHBOARD_CACHE_ALIAS = "dashboard"
+DASHBOARD_CACHE_TIMEOUT = 300
+
+# Rows per query for the streaming CSV/XLSX exports (myapp.exports)
+EXPORT_CHUNK_SIZE = 2000
+
+# Rows validated and bulk-inserted together by the client import (myapp.imports)
+CLIENT_IMPORT_BATCH_SIZE = 500
+
+# Attendance posted after this time is Absent; `manage.py close_attendance`
+# (cron, after the cutoff) marks everyone without a record Absent
+ATTENDANCE_CUTOFF = "11:00"
+
+# Client search index (myapp.search): "auto" picks SQLite FTS5 or MySQL
+# FULLTEXT, falling back to the portable trigram table ("trigram")
+SEARCH_BACKEND = "auto"
+SEARCH_MAX_RESULTS = 200
+SEARCH_TRIGRAM_THRESHOLD = 0.5
+
+# Background document pipeline (myapp.documents): uploads are staged and
+# finalized by a local thread pool. EAGER processes inline (tests).
+DOCUMENT_STAGING_ROOT = os.path.join(MEDIA_ROOT, "staging")
+DOCUMENT_WORKERS = 2
+DOCUMENT_MAX_DIMENSION = 2000
+DOCUMENT_JPEG_QUALITY = 85
+DOCUMENT_PIPELINE_EAGER = False
+
+# Protected media (myapp.media.serve_file), from MEDIA_ACCEL. None streams from Python (development);
+# "nginx" sends X-Accel-Redirect to MEDIA_ACCEL_PREFIX, which must be an
+# `internal` location aliased to MEDIA_ROOT; "apache" sends X-Sendfile.
+MEDIA_ACCEL = os.environ.get("MEDIA_ACCEL") or None
+MEDIA_ACCEL_PREFIX = "/protected-media/"
+
+# CorsMiddleware sits above CommonMiddleware so preflight OPTIONS requests are
+# answered before any redirect or view work (and error responses keep their CORS
+# headers). prod.py adds compression right below SecurityMiddleware.
+MIDDLEWARE = [
+    "myapp.profiling.QueryProfilerMiddleware",
+    'django.middleware.security.SecurityMiddleware',
+    "corsheaders.middleware.CorsMiddleware",
+    'django.contrib.sessions.middleware.SessionMiddleware',
+    'django.middleware.common.CommonMiddleware',
+    'django.middleware.csrf.CsrfViewMiddleware',
+    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'django.contrib.messages.middleware.MessageMiddleware',
+    'django.middleware.clickjacking.XFrameOptionsMiddleware',
+]
+
+ROOT_URLCONF = 'myproject.urls'
+# Served by myproject.asgi: the same routes with async dashboard/document views
+ASGI_URLCONF = 'myproject.asgi_urls'
+
+TEMPLATES = [
+    {
+        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'DIRS': [],
+        'APP_DIRS': True,
+        'OPTIONS': {
+            'context_processors': [
+                'django.template.context_processors.debug',
+                'django.template.context_processors.request',
+                'django.contrib.auth.context_processors.auth',
+                'django.contrib.messages.context_processors.messages',
+            ],
+        },
+    },
+]
+
+WSGI_APPLICATION = 'myproject.wsgi.application'
+
+
+# Database
+# https://docs.djangoproject.com/en/5.1/ref/settings/#databases
+
+# DB_ENGINE=mysql (default) or sqlite, a local file at SQLITE_PATH for dev.
+# Connections are reused across requests for DB_CONN_MAX_AGE seconds (0 opens
+# one per request, "none" keeps it for the worker's lifetime), and pinged before
+# reuse while DB_CONN_HEALTH_CHECKS is on. DB_POOL=1 swaps in the pooled backends
+# (myapp.db_backends): each request returns its connection to a per-process pool
+# of DB_POOL_SIZE, so threads share a few warm connections. Keep DB_CONN_MAX_AGE
+# at 0 under ASGI, where every request may run on a different thread.
+# MySQL credentials come from DB_NAME, DB_USER, DB_PASSWORD, DB_HOST and DB_PORT.
+DB_ENGINE = os.environ.get("DB_ENGINE", "mysql")
+DB_POOL = env_bool("DB_POOL", False)
+
+if DB_ENGINE == "sqlite":
+    DATABASES = {
+        'default': {
+            'ENGINE': 'myapp.db_backends.sqlite3' if DB_POOL else 'django.db.backends.sqlite3',
+            'NAME': os.environ.get("SQLITE_PATH", BASE_DIR / 'db.sqlite3'),
+        }
+    }
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'myapp.db_backends.mysql' if DB_POOL else 'django.db.backends.mysql',
+            'NAME': os.environ.get("DB_NAME", "loanapp"),
+            'USER': os.environ.get("DB_USER", "root"),
+            'PASSWORD': os.environ.get("DB_PASSWORD", ""),
+            'HOST': os.environ.get("DB_HOST", "localhost"),
+            'PORT': os.environ.get("DB_PORT", "3306"),
+        }
+    }
+
+DATABASES['default'].update({
+    # Pooled connections go back to the pool after each request instead
+    'CONN_MAX_AGE': 0 if DB_POOL else env_seconds("DB_CONN_MAX_AGE", 60),
+    'CONN_HEALTH_CHECKS': env_bool("DB_CONN_HEALTH_CHECKS", True),
+    'POOL': {
+        'MAX_SIZE': int(os.environ.get("DB_POOL_SIZE", 10)),
+        'TIMEOUT': int(os.environ.get("DB_POOL_TIMEOUT", 10)),
+        'RECYCLE': env_seconds("DB_POOL_RECYCLE", 3600),
+    },
+})
+
+
+# Password validation
+# https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
+
+AUTH_PASSWORD_VALIDATORS = [
+    {
+        'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.MinimumLengthValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.CommonPasswordValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.NumericPasswordValidator',
+    },
+]
+
+
+# Internationalization
+# https://docs.djangoproject.com/en/5.1/topics/i18n/
+
+LANGUAGE_CODE = 'en-us'
+
+TIME_ZONE = 'UTC'
+
+USE_I18N = True
+
+USE_TZ = True
+
+
+# Static files (CSS, JavaScript, Images)
+# https://docs.djangoproject.com/en/5.1/howto/static-files/
+
+STATIC_URL = 'static/'
+STATIC_ROOT = os.environ.get("STATIC_ROOT", BASE_DIR / "staticfiles")  # collectstatic, served by the proxy
+
+# Default primary key field type
+# https://docs.djangoproject.com/en/5.1/ref/settings/#default-auto-field
+
+DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+# Any origin unless CORS_ALLOWED_ORIGINS lists them (comma-separated)
+CORS_ALLOWED_ORIGINS = env_list("CORS_ALLOWED_ORIGINS")
+CORS_ALLOW_ALL_ORIGINS = not CORS_ALLOWED_ORIGINS
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+    },
+    "loggers": {
+        "myapp.profiling": {"handlers": ["console"], "level": "INFO"},
+    },
+}
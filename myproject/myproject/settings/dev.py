@@ -0,0 +1,9 @@
+"""Local development: debug pages and Python-served media, against MySQL or DB_ENGINE=sqlite."""
+from .base import *  # noqa: F401,F403
+
+DEBUG = True
+
+ALLOWED_HOSTS = env_list("DJANGO_ALLOWED_HOSTS", "localhost,127.0.0.1,[::1]")
+
+# Debug is the point of this profile
+SILENCED_SYSTEM_CHECKS = ["myapp.W001"]
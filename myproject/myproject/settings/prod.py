@@ -0,0 +1,62 @@
+"""
+Production: debug off, explicit hosts and secret, cached templates, gzip for
+text responses and a shared cache when REDIS_URL is set.
+"""
+from django.core.exceptions import ImproperlyConfigured
+
+from .base import *  # noqa: F401,F403
+
+DEBUG = False
+
+SECRET_KEY = os.environ.get("DJANGO_SECRET_KEY")
+if not SECRET_KEY:
+    raise ImproperlyConfigured("Set DJANGO_SECRET_KEY for the prod profile.")
+ALLOWED_HOSTS = env_list("DJANGO_ALLOWED_HOSTS")
+if not ALLOWED_HOSTS:
+    raise ImproperlyConfigured("Set DJANGO_ALLOWED_HOSTS (comma-separated) for the prod profile.")
+
+# Compiled templates are kept for the life of the process
+TEMPLATES = [{
+    **TEMPLATES[0],
+    "APP_DIRS": False,
+    "OPTIONS": {
+        "context_processors": [
+            processor for processor in TEMPLATES[0]["OPTIONS"]["context_processors"]
+            if processor != "django.template.context_processors.debug"
+        ],
+        "loaders": [("django.template.loaders.cached.Loader", [
+            "django.template.loaders.filesystem.Loader",
+            "django.template.loaders.app_directories.Loader",
+        ])],
+    },
+}]
+
+# Compress JSON/CSV/HTML before anything below can touch the body
+MIDDLEWARE = list(MIDDLEWARE)
+MIDDLEWARE.insert(MIDDLEWARE.index("django.middleware.security.SecurityMiddleware") + 1,
+                  "myapp.compression.CompressionMiddleware")
+
+# Redis shares auth state and dashboards across hosts; without it the base
+# local caches (per-process default, per-host file-based dashboards) apply.
+REDIS_URL = os.environ.get("REDIS_URL")
+if REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+            "KEY_PREFIX": "myapp",
+        },
+        "dashboard": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+            "KEY_PREFIX": "myapp-dashboard",
+        },
+    }
+
+SESSION_ENGINE = "django.contrib.sessions.backends.cached_db"
+
+# Over-budget warnings only, not a line per request
+LOGGING = {
+    **LOGGING,
+    "loggers": {**LOGGING["loggers"], "myapp.profiling": {"handlers": ["console"], "level": "WARNING"}},
+}
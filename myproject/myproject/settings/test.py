@@ -0,0 +1,29 @@
+"""The test runner: in-memory SQLite unless DB_ENGINE is set, strict query budgets, inline document processing."""
+from .base import *  # noqa: F401,F403
+
+TESTING = True
+
+if "DB_ENGINE" not in os.environ:
+    DATABASES = {"default": {"ENGINE": "django.db.backends.sqlite3", "NAME": ":memory:"}}
+
+# Hashing dominates user fixtures otherwise
+PASSWORD_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
+
+QUERY_BUDGET_STRICT = True
+DOCUMENT_PIPELINE_EAGER = True
+
+CACHES = {
+    **CACHES,
+    "dashboard": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "myapp-dashboard",
+    },
+}
+
+LOGGING = {
+    **LOGGING,
+    "loggers": {**LOGGING["loggers"], "myapp.profiling": {"handlers": ["console"], "level": "WARNING"}},
+}
+
+# No proxy in front of the test client
+SILENCED_SYSTEM_CHECKS = ["myapp.W006", "myapp.W007"]
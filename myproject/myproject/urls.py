@@ -15,9 +15,9 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 from django.contrib import admin
-from django.urls import path , include
+from django.urls import path , include, re_path
 from django.conf import settings
-from django.conf.urls.static import static
+from myapp.views import MediaFileView
 
 
 
@@ -26,6 +26,8 @@ urlpatterns = [
     path('admin/', admin.site.urls),
     path("manage/",include('myapp.urls'))
 ]
-# if settings.DEBUG:
-#     urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
-urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
\ No newline at end of file
+# Media goes through a permission-checked view; set MEDIA_ACCEL so the
+# front proxy (nginx/apache) does the actual byte transfer in production.
+urlpatterns += [
+    re_path(rf"^{settings.MEDIA_URL.lstrip('/')}(?P<path>.+)$", MediaFileView.as_view(), name="media"),
+]